@@ -0,0 +1,399 @@
+"""Throughput and latency benchmark of every resource method
+
+Runs all resource methods against a local mock server, started in
+a separate process so only client-side CPU is measured, in
+sequential, threaded and async modes and writes results as JSON.
+
+Usage::
+    python benchmarks/bench_client.py --output bench.json
+    python benchmarks/bench_client.py --output new.json --compare bench.json
+
+With `--compare` the script exits with code 1 if any endpoint
+got slower than the allowed threshold.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from semaphore.client import Semaphore  # noqa: E402
+from semaphore.mock_server import MockSemaphoreServer  # noqa: E402
+from semaphore.transport import RequestsTransport, Urllib3Transport  # noqa: E402
+
+TOKEN = 'benchmark-token'
+TRANSPORTS = ('requests', 'urllib3')
+MODES = ['sequential', 'threaded', 'async']
+
+
+def make_transport(name: str, workers: int):
+    if name == 'urllib3':
+        return Urllib3Transport(maxsize=workers)
+    return RequestsTransport(pool_maxsize=workers)
+
+
+def _serve(connection, latency: float, seed: dict):
+    server = MockSemaphoreServer(latency=latency, per_page=0, api_token=TOKEN)
+    org = server.seed(**seed)
+    state = server.state
+    connection.send({
+        'url': server.url,
+        'org': org,
+        'projects': list(state.projects),
+        'teams': list(state.teams),
+        'secrets': list(state.secrets),
+        'env_vars': list(state.env_vars),
+        'config_files': list(state.config_files),
+        'users': list(state.users)
+    })
+    server._server.serve_forever(poll_interval=0.1)
+
+
+def start_server(latency: float, seed: dict):
+    """Starts a mock server in a child process
+
+        Returns::
+            A tuple with the process and seeded ids
+    """
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(
+        target=_serve,
+        args=(child, latency, seed),
+        daemon=True
+    )
+    process.start()
+    return process, parent.recv()
+
+
+def _new_team(client, ids):
+    return client.teams.create(
+        ids['org'], name='bench', permission='read', description=None
+    )['id']
+
+
+def _new_secret(client, ids):
+    return client.secrets.create(ids['org'], 'bench')['id']
+
+
+def operations(ids: dict):
+    """Returns benchmarked operations
+
+    Every operation is `(endpoint, setup, call)`, `setup(client)`
+    runs untimed and returns arguments of one call.
+    """
+    org = ids['org']
+    project, team, secret = ids['projects'][0], ids['teams'][0], ids['secrets'][0]
+    env_var, config_file = ids['env_vars'][0], ids['config_files'][0]
+    user = ids['users'][0]
+
+    def fixed(*args):
+        return lambda client: args
+
+    return [
+        ('organization.list', fixed(), lambda c: c.organization.list()),
+        ('organization.by_name', fixed(org), lambda c, o: c.organization.by_name(o)),
+        ('organization.urls', fixed(org), lambda c, o: c.organization.urls(o)),
+        ('organization.secret_urls', fixed(org),
+         lambda c, o: c.organization.secret_urls(o)),
+        ('organization.users', fixed(org), lambda c, o: c.organization.users(o)),
+        ('teams.all', fixed(org), lambda c, o: c.teams.all(o)),
+        ('teams.by_id', fixed(team), lambda c, t: c.teams.by_id(t)),
+        ('teams.by_project', fixed(project), lambda c, p: c.teams.by_project(p)),
+        ('teams.secrets', fixed(secret), lambda c, s: c.teams.secrets(s)),
+        ('teams.create', fixed(org), lambda c, o: c.teams.create(
+            o, name='team', permission='read', description='bench')),
+        ('teams.update', fixed(team), lambda c, t: c.teams.update(t, 'edit')),
+        ('teams.delete', lambda c: (_new_team(c, ids),),
+         lambda c, t: c.teams.delete(t)),
+        ('users.list', fixed(org), lambda c, o: c.users.list(o)),
+        ('users.team_members', fixed(team), lambda c, t: c.users.team_members(t)),
+        ('users.project_members', fixed(project),
+         lambda c, p: c.users.project_members(p)),
+        ('users.add', fixed(team, user), lambda c, t, u: c.users.add(t, u)),
+        ('users.remove', fixed(team, user), lambda c, t, u: c.users.remove(t, u)),
+        ('projects.list', fixed(org), lambda c, o: c.projects.list(o)),
+        ('projects.added_projects', fixed(team),
+         lambda c, t: c.projects.added_projects(t)),
+        ('projects.project_secrets', fixed(secret),
+         lambda c, s: c.projects.project_secrets(s)),
+        ('projects.create', fixed(org), lambda c, o: c.projects.create(
+            o, 'project', 'repo', 'owner', 'github')),
+        ('projects.add_team', fixed(team, project),
+         lambda c, t, p: c.projects.add_team(t, p)),
+        ('projects.delete_team', fixed(team, project),
+         lambda c, t, p: c.projects.delete_team(t, p)),
+        ('secrets.all', fixed(org), lambda c, o: c.secrets.all(o)),
+        ('secrets.team', fixed(team), lambda c, t: c.secrets.team(t)),
+        ('secrets.project', fixed(project), lambda c, p: c.secrets.project(p)),
+        ('secrets.by_id', fixed(secret), lambda c, s: c.secrets.by_id(s)),
+        ('secrets.create', fixed(org), lambda c, o: c.secrets.create(o, 'secret')),
+        ('secrets.update', fixed(secret),
+         lambda c, s: c.secrets.update(s, description='bench')),
+        ('secrets.delete', lambda c: (_new_secret(c, ids),),
+         lambda c, s: c.secrets.delete(s)),
+        ('secrets.attach_to_project', fixed(project, secret),
+         lambda c, p, s: c.secrets.attach_to_project(p, s)),
+        ('secrets.delete_from_team', fixed(team, secret),
+         lambda c, t, s: c.secrets.delete_from_team(t, s)),
+        ('secrets.dettach_from_project', fixed(project, secret),
+         lambda c, p, s: c.secrets.dettach_from_project(p, s)),
+        ('environment.all', fixed(project), lambda c, p: c.environment.all(p)),
+        ('environment.secrets', fixed(secret), lambda c, s: c.environment.secrets(s)),
+        ('environment.by_id', fixed(env_var), lambda c, e: c.environment.by_id(e)),
+        ('environment.create', fixed(secret),
+         lambda c, s: c.environment.create(s, 'NAME', 'value')),
+        ('environment.update', fixed(env_var),
+         lambda c, e: c.environment.update(e, content='value')),
+        ('environment.delete',
+         lambda c: (c.environment.create(secret, 'NAME', 'value')['id'],),
+         lambda c, e: c.environment.delete(e)),
+        ('config_files.all', fixed(project), lambda c, p: c.config_files.all(p)),
+        ('config_files.secrets', fixed(secret),
+         lambda c, s: c.config_files.secrets(s)),
+        ('config_files.by_id', fixed(config_file),
+         lambda c, f: c.config_files.by_id(f)),
+        ('config_files.create', fixed(secret),
+         lambda c, s: c.config_files.create(s, '/path', 'content', False)),
+        ('config_files.update', fixed(config_file),
+         lambda c, f: c.config_files.update(f, content='content')),
+        ('config_files.delete',
+         lambda c: (c.config_files.create(secret, '/path', 'x', False)['id'],),
+         lambda c, f: c.config_files.delete(f)),
+    ]
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(mode: str, endpoint: str, latencies: list, errors: int,
+              wall: float, cpu: float) -> dict:
+    calls = len(latencies)
+    return {
+        'mode': mode,
+        'endpoint': endpoint,
+        'calls': calls,
+        'errors': errors,
+        'throughput': calls / wall if wall else 0,
+        'mean': sum(latencies) / calls,
+        'p50': percentile(latencies, 0.50),
+        'p95': percentile(latencies, 0.95),
+        'p99': percentile(latencies, 0.99),
+        'cpu_per_call': cpu / calls
+    }
+
+
+def _timed(call, client, args):
+    started = time.perf_counter()
+    try:
+        call(client, *args)
+        failed = 0
+    except Exception:
+        failed = 1
+    return time.perf_counter() - started, failed
+
+
+def run_sync(mode: str, client, setup_client, ops, iterations: int, workers: int):
+    results = []
+    for endpoint, setup, call in ops:
+        arguments = [setup(setup_client) for _ in range(iterations)]
+        wall_started, cpu_started = time.perf_counter(), time.process_time()
+        if mode == 'sequential':
+            outcomes = [_timed(call, client, args) for args in arguments]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                outcomes = list(executor.map(
+                    lambda args: _timed(call, client, args),
+                    arguments
+                ))
+        wall = time.perf_counter() - wall_started
+        cpu = time.process_time() - cpu_started
+        results.append(summarize(
+            mode,
+            endpoint,
+            [latency for latency, _ in outcomes],
+            sum(failed for _, failed in outcomes),
+            wall,
+            cpu
+        ))
+    return results
+
+
+async def _run_async(url: str, setup_client, ops, iterations: int, workers: int):
+    from semaphore.aio import AsyncSemaphore
+
+    results = []
+    async with AsyncSemaphore(TOKEN, base_url=url, limit=workers) as client:
+        limit = asyncio.Semaphore(workers)
+
+        async def timed(call, args):
+            async with limit:
+                started = time.perf_counter()
+                try:
+                    await call(client, *args)
+                    failed = 0
+                except Exception:
+                    failed = 1
+                return time.perf_counter() - started, failed
+
+        for endpoint, setup, call in ops:
+            arguments = [setup(setup_client) for _ in range(iterations)]
+            wall_started, cpu_started = time.perf_counter(), time.process_time()
+            outcomes = await asyncio.gather(
+                *(timed(call, args) for args in arguments)
+            )
+            wall = time.perf_counter() - wall_started
+            cpu = time.process_time() - cpu_started
+            results.append(summarize(
+                'async',
+                endpoint,
+                [latency for latency, _ in outcomes],
+                sum(failed for _, failed in outcomes),
+                wall,
+                cpu
+            ))
+    return results
+
+
+def run(arguments) -> dict:
+    seed = {'projects': 50, 'teams': 5, 'users': 20, 'secrets': 5}
+    process, ids = start_server(arguments.latency, seed)
+    try:
+        ops = operations(ids)
+        if arguments.filter:
+            ops = [op for op in ops if arguments.filter in op[0]]
+        setup_client = Semaphore(TOKEN, base_url=ids['url'])
+        results = []
+        for mode in arguments.modes:
+            if mode == 'async':
+                try:
+                    import aiohttp  # noqa: F401
+                except ImportError:
+                    print('aiohttp is not installed, skipping async mode')
+                    continue
+                # asyncio.run needs Python 3.7
+                loop = asyncio.new_event_loop()
+                try:
+                    results += loop.run_until_complete(_run_async(
+                        ids['url'], setup_client, ops, arguments.iterations,
+                        arguments.workers
+                    ))
+                finally:
+                    loop.close()
+                continue
+            # every call has to reach the server, like in the async mode
+            client = Semaphore(
+                TOKEN,
+                base_url=ids['url'],
+                pool_maxsize=arguments.workers,
+                coalesce=False,
+                transport=make_transport(arguments.transport, arguments.workers)
+            )
+            results += run_sync(
+                mode, client, setup_client, ops, arguments.iterations,
+                arguments.workers
+            )
+            client.close()
+    finally:
+        process.terminate()
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'transport': arguments.transport,
+            'iterations': arguments.iterations,
+            'workers': arguments.workers,
+            'latency': arguments.latency
+        },
+        'results': results
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Finds endpoints which got slower than the baseline
+
+        Args::
+            current(dict): Results of this run
+            baseline(dict): Results of a previous run
+            threshold(float): Allowed relative regression, e.g. `0.1`
+
+        Returns::
+            An array with descriptions of regressions
+    """
+    previous = {
+        (result['mode'], result['endpoint']): result
+        for result in baseline['results']
+    }
+    regressions = []
+    for result in current['results']:
+        old = previous.get((result['mode'], result['endpoint']))
+        if old is None:
+            continue
+        for metric in ('p95', 'cpu_per_call'):
+            if old[metric] and result[metric] > old[metric] * (1 + threshold):
+                regressions.append(
+                    f"{result['mode']} {result['endpoint']}: {metric} "
+                    f"{old[metric] * 1000:.3f}ms -> {result[metric] * 1000:.3f}ms"
+                )
+        if result['throughput'] < old['throughput'] * (1 - threshold):
+            regressions.append(
+                f"{result['mode']} {result['endpoint']}: throughput "
+                f"{old['throughput']:.1f}/s -> {result['throughput']:.1f}/s"
+            )
+    return regressions
+
+
+def print_table(report: dict):
+    print(f"{'mode':<11}{'endpoint':<32}{'calls/s':>10}{'p50 ms':>9}"
+          f"{'p95 ms':>9}{'p99 ms':>9}{'cpu ms':>9}{'errors':>8}")
+    for result in report['results']:
+        print(
+            f"{result['mode']:<11}{result['endpoint']:<32}"
+            f"{result['throughput']:>10.1f}{result['p50'] * 1000:>9.3f}"
+            f"{result['p95'] * 1000:>9.3f}{result['p99'] * 1000:>9.3f}"
+            f"{result['cpu_per_call'] * 1000:>9.3f}{result['errors']:>8}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--output', default='bench.json')
+    parser.add_argument('--compare', help='JSON results of a previous run')
+    parser.add_argument('--threshold', type=float, default=0.10)
+    parser.add_argument('--iterations', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Latency of the mock server in seconds')
+    parser.add_argument('--transport', choices=TRANSPORTS,
+                        default='requests')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=MODES)
+    parser.add_argument('--filter', help='Run only endpoints containing the text')
+    arguments = parser.parse_args()
+
+    report = run(arguments)
+    print_table(report)
+    with open(arguments.output, 'w') as output:
+        json.dump(report, output, indent=2)
+
+    if arguments.compare:
+        with open(arguments.compare) as baseline:
+            regressions = compare(report, json.load(baseline), arguments.threshold)
+        for regression in regressions:
+            print('REGRESSION', regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
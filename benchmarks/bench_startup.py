@@ -0,0 +1,158 @@
+"""Cold start benchmark of the client
+
+Every run starts a fresh interpreter and measures how long it takes to
+import `semaphore.client`, create a `Semaphore`, access one resource
+and make the first request to a local mock server, together with
+the number of imported modules after each step.
+
+Usage::
+    python benchmarks/bench_startup.py --output startup.json
+    python benchmarks/bench_startup.py --output new.json --compare startup.json
+
+With `--compare` the script exits with code 1 if the median time
+of any step got slower than the allowed threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from semaphore.mock_server import MockSemaphoreServer  # noqa: E402
+
+STEPS = ('import', 'construct', 'resource', 'first_request')
+
+# Runs in a fresh interpreter, prints timings of every step as JSON
+PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+import semaphore.client
+imported = time.perf_counter()
+modules = {'import': len(sys.modules)}
+semaphore = semaphore.client.Semaphore('token', base_url=sys.argv[1])
+constructed = time.perf_counter()
+modules['construct'] = len(sys.modules)
+teams = semaphore.teams
+resource = time.perf_counter()
+modules['resource'] = len(sys.modules)
+teams.by_id(sys.argv[2])
+requested = time.perf_counter()
+modules['first_request'] = len(sys.modules)
+print(json.dumps({
+    'times': {
+        'import': imported - started,
+        'construct': constructed - imported,
+        'resource': resource - constructed,
+        'first_request': requested - resource
+    },
+    'modules': modules
+}))
+'''
+
+
+def probe(url: str, team_id: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE, url, team_id],
+        cwd=ROOT,
+        check=True,
+        stdout=subprocess.PIPE
+    ).stdout
+    return json.loads(output)
+
+
+def run(arguments) -> dict:
+    with MockSemaphoreServer() as server:
+        server.seed(projects=1, teams=1, users=1, secrets=1)
+        team_id = next(iter(server.state.teams))
+        probes = [probe(server.url, team_id) for _ in range(arguments.runs)]
+
+    results = []
+    for step in STEPS:
+        times = [result['times'][step] for result in probes]
+        results.append({
+            'step': step,
+            'median': statistics.median(times),
+            'min': min(times),
+            'max': max(times),
+            'modules': probes[-1]['modules'][step]
+        })
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'runs': arguments.runs
+        },
+        'results': results
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Finds steps which got slower than the baseline
+
+        Args::
+            current(dict): Results of this run
+            baseline(dict): Results of a previous run
+            threshold(float): Allowed relative regression, e.g. `0.1`
+
+        Returns::
+            An array with descriptions of regressions
+    """
+    previous = {result['step']: result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        old = previous.get(result['step'])
+        if old is None:
+            continue
+        if old['median'] and result['median'] > old['median'] * (1 + threshold):
+            regressions.append(
+                f"{result['step']}: median {old['median'] * 1000:.2f}ms -> "
+                f"{result['median'] * 1000:.2f}ms"
+            )
+        if result['modules'] > old['modules']:
+            regressions.append(
+                f"{result['step']}: modules {old['modules']} -> {result['modules']}"
+            )
+    return regressions
+
+
+def print_table(report: dict):
+    print(f"{'step':<15}{'median ms':>11}{'min ms':>9}{'max ms':>9}{'modules':>9}")
+    for result in report['results']:
+        print(
+            f"{result['step']:<15}{result['median'] * 1000:>11.2f}"
+            f"{result['min'] * 1000:>9.2f}{result['max'] * 1000:>9.2f}"
+            f"{result['modules']:>9}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--output', default='startup.json')
+    parser.add_argument('--compare', help='JSON results of a previous run')
+    parser.add_argument('--threshold', type=float, default=0.20)
+    parser.add_argument('--runs', type=int, default=20)
+    arguments = parser.parse_args()
+
+    report = run(arguments)
+    print_table(report)
+    with open(arguments.output, 'w') as output:
+        json.dump(report, output, indent=2)
+
+    if arguments.compare:
+        with open(arguments.compare) as baseline:
+            regressions = compare(report, json.load(baseline), arguments.threshold)
+        for regression in regressions:
+            print('REGRESSION', regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+import asyncio
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+from .client import (
+    BaseRequest,
+    SemaphoreBaseResource,
+    OrganizationResource,
+    TeamResource,
+    UsersResource,
+    ProjectsResource,
+    SecretsResource,
+    EnvironmentResource,
+    ConfigurationFileResource,
+    LazyResource
+)
+from .streaming import CHUNK_SIZE, ArrayDecoder
+
+
+class AsyncSession:
+    """Lazily created non-blocking connection pool
+
+        The underlying `aiohttp.ClientSession` is created on the first
+        request, so the pool is always bound to the running event loop.
+
+        Args::
+            limit(int): Total number of simultaneous connections
+            limit_per_host(int): Number of simultaneous connections
+            to one host, `0` means no limit
+
+        Methods::
+            request(str, str): Makes an HTTP request, returns
+            an async context manager with a response
+            close: Closes all pooled connections
+    """
+    def __init__(self, limit: int=100, limit_per_host: int=0):
+        if aiohttp is None:
+            raise ImportError(
+                'AsyncSemaphore requires aiohttp, '
+                'install it with "pip install semaphorePY[async]"'
+            )
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self._session = None
+
+    def _client_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    def request(self, method: str, url: str, **kwargs):
+        return self._client_session().request(method, url, **kwargs)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class AsyncRequestMixin:
+    """Replaces blocking HTTP calls of a resource with coroutines
+
+        Every resource method keeps its name and arguments,
+        but returns an awaitable with the same result.
+        List methods called with `iterate=True` or `stream=True`
+        return an async generator.
+    """
+    async def _make_request(self, method, resource: str=None, only_status=False,
+                            fields: tuple=None, **kwargs):
+        url = self._resource_url(resource)
+        async with self._transport.request(
+            method,
+            url,
+            headers=self._default_headers,
+            **kwargs
+        ) as response:
+            if only_status:
+                return response.status
+
+            data = await response.json(content_type=None, loads=self._codec.loads)
+        return self._decode(resource, data, fields)
+
+    async def _fetch_page(self, url: str, fields: tuple=None, **kwargs):
+        async with self._transport.request(
+            'GET',
+            url,
+            headers=self._default_headers,
+            **kwargs
+        ) as response:
+            next_page = response.links.get('next', {}).get('url')
+            page = await response.json(content_type=None, loads=self._codec.loads)
+        page = self._decode(url, page, fields)
+        if not isinstance(page, list):
+            page = [page]
+        return page, next_page and str(next_page)
+
+    async def _paginate(self, resource: str=None, fields: tuple=None, **kwargs):
+        """Asynchronously iterates over all pages of a list resource,
+        the next page is requested while the current one is being consumed
+        """
+        page, next_page = await self._fetch_page(
+            self._resource_url(resource),
+            fields,
+            **kwargs
+        )
+        while next_page is not None:
+            prefetch = asyncio.ensure_future(self._fetch_page(next_page, fields))
+            try:
+                for item in page:
+                    yield item
+            except GeneratorExit:
+                prefetch.cancel()
+                raise
+            page, next_page = await prefetch
+
+        for item in page:
+            yield item
+
+    async def _exists(self, resource: str) -> bool:
+        status_code = await self._make_request('HEAD', resource, only_status=True)
+        if status_code in (405, 501):
+            status_code = await self._make_request('GET', resource, only_status=True)
+        return self._exists_status(status_code, resource)
+
+    async def _stream(self, resource: str=None, fields: tuple=None, **kwargs):
+        """Asynchronously iterates over all pages of a list resource,
+        decoding objects while a page is being downloaded
+        """
+        url = self._resource_url(resource)
+        while url is not None:
+            async with self._transport.request(
+                'GET',
+                url,
+                headers=self._default_headers,
+                **kwargs
+            ) as response:
+                next_page = response.links.get('next', {}).get('url')
+                decoder = ArrayDecoder()
+                async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+                    for item in decoder.feed(chunk):
+                        yield self._decode(url, item, fields)
+                for item in decoder.close():
+                    yield self._decode(url, item, fields)
+            url = next_page and str(next_page)
+            kwargs = {}
+
+
+class AsyncBaseRequest(AsyncRequestMixin, BaseRequest):
+    """Asynchronous version of `BaseRequest`"""
+
+
+class AsyncSemaphoreBaseResource(AsyncRequestMixin, SemaphoreBaseResource):
+    """Asynchronous version of `SemaphoreBaseResource`"""
+
+    async def default_resources(self, as_list: bool=False):
+        response = await self._get()
+        if as_list:
+            return [value for value in response.values()]
+        return response
+
+
+class AsyncOrganizationResource(AsyncRequestMixin, OrganizationResource):
+    """Asynchronous version of `OrganizationResource`"""
+
+
+class AsyncTeamResource(AsyncRequestMixin, TeamResource):
+    """Asynchronous version of `TeamResource`"""
+
+
+class AsyncUsersResource(AsyncRequestMixin, UsersResource):
+    """Asynchronous version of `UsersResource`"""
+
+
+class AsyncProjectsResource(AsyncRequestMixin, ProjectsResource):
+    """Asynchronous version of `ProjectsResource`"""
+
+
+class AsyncSecretsResource(AsyncRequestMixin, SecretsResource):
+    """Asynchronous version of `SecretsResource`"""
+
+
+class AsyncEnvironmentResource(AsyncRequestMixin, EnvironmentResource):
+    """Asynchronous version of `EnvironmentResource`"""
+
+
+class AsyncConfigurationFileResource(AsyncRequestMixin, ConfigurationFileResource):
+    """Asynchronous version of `ConfigurationFileResource`"""
+
+
+class AsyncSemaphore(AsyncSemaphoreBaseResource):
+    """Main asynchronous wrapper class
+
+        All resources share one non-blocking connection pool,
+        so many calls can be in flight on one event loop.
+
+        Usage::
+            async with AsyncSemaphore('token') as semaphore:
+                team = await semaphore.teams.by_id('team id')
+
+        Args::
+            api_token(str): A authentication token from Semaphore service
+            limit(int): Total number of simultaneous connections
+            limit_per_host(int): Number of simultaneous connections to one host
+            base_url(str): Overrides basic Semaphore API url
+
+        Methods::
+            close: Releases all pooled connections
+    """
+    def __init__(self, api_token: str, limit: int=100, limit_per_host: int=0,
+                 base_url: str=None):
+        options = {
+            'transport': AsyncSession(limit=limit, limit_per_host=limit_per_host),
+            'base_url': base_url
+        }
+        super().__init__(api_token, **options)
+        self._options = options
+
+    organization = LazyResource(AsyncOrganizationResource)
+    teams = LazyResource(AsyncTeamResource)
+    users = LazyResource(AsyncUsersResource)
+    projects = LazyResource(AsyncProjectsResource)
+    secrets = LazyResource(AsyncSecretsResource)
+    environment = LazyResource(AsyncEnvironmentResource)
+    config_files = LazyResource(AsyncConfigurationFileResource)
+
+    async def close(self):
+        """Closes the shared connection pool"""
+        await self._transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
@@ -0,0 +1,106 @@
+from .utils import copy_context
+
+
+class BatchResult:
+    """Outcome of a single call of a batch
+
+        Args::
+            index(int): Position of the call in the batch
+            value: A value returned by the call
+            error(Exception): An exception raised by the call
+
+        Properties::
+            ok: `True` if the call didn't raise an exception
+
+        Methods::
+            unwrap: Returns the value or raises the captured exception
+    """
+    __slots__ = ('index', 'value', 'error')
+
+    def __init__(self, index: int, value=None, error: Exception=None):
+        self.index = index
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self):
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+    def __repr__(self):
+        if self.ok:
+            return f'<BatchResult #{self.index} value={self.value!r}>'
+        return f'<BatchResult #{self.index} error={self.error!r}>'
+
+
+def _normalize(call):
+    """Splits a batch item into a function and its arguments
+
+        Args::
+            call: A callable or a tuple `(callable, *args)`
+
+        Returns::
+            A tuple with callable and arguments
+    """
+    if callable(call):
+        return call, ()
+    func, *args = call
+    return func, tuple(args)
+
+
+def _execute(index: int, func, args) -> BatchResult:
+    try:
+        return BatchResult(index, value=func(*args))
+    except Exception as error:
+        return BatchResult(index, error=error)
+
+
+def run_batch(calls, max_workers: int, ordered: bool=True):
+    """Runs calls on a bounded thread pool
+
+    Every call runs in a copy of the caller's context,
+    so e.g. its requests are traced within the caller's span.
+
+        Args::
+            calls: An iterable of callables or `(callable, *args)` tuples
+            max_workers(int): Maximum number of calls running at once
+            ordered(bool): Return results in order of the calls,
+            otherwise yield them as soon as they are completed
+
+        Returns::
+            An array with `BatchResult` objects
+            or a generator of them if `ordered` is `False`
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    calls = [_normalize(call) for call in calls]
+    context = copy_context()
+    if ordered:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(context.copy().run, _execute, index, func, args)
+                for index, (func, args) in enumerate(calls)
+            ]
+            return [future.result() for future in futures]
+    return _run_as_completed(calls, max_workers, context)
+
+
+def _run_as_completed(calls, max_workers: int, context):
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(context.copy().run, _execute, index, func, args)
+            for index, (func, args) in enumerate(calls)
+        ]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        except GeneratorExit:
+            for future in futures:
+                future.cancel()
+            raise
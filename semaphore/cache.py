@@ -0,0 +1,123 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+class CacheEntry:
+    """Cached response body with its validators
+
+        Args::
+            content(bytes): A raw response body
+            etag(str): Value of the `ETag` header
+            last_modified(str): Value of the `Last-Modified` header
+            ttl(float): Seconds during which the body is served
+            without revalidation
+    """
+    __slots__ = ('content', 'etag', 'last_modified', 'ttl', 'stored_at')
+
+    def __init__(self, content: bytes, etag: str=None, last_modified: str=None,
+                 ttl: float=0):
+        self.content = content
+        self.etag = etag
+        self.last_modified = last_modified
+        self.ttl = ttl
+        self.stored_at = time.monotonic()
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() - self.stored_at < self.ttl
+
+    def touch(self):
+        """Marks the entry as fresh again, after a successful revalidation"""
+        self.stored_at = time.monotonic()
+
+    def validators(self) -> dict:
+        """Returns conditional request headers for the entry"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """LRU cache of GET responses, revalidated with ETag and Last-Modified
+
+        Fresh entries are served without any HTTP call, stale entries
+        are revalidated with a conditional request and served
+        from the cache on `304 Not Modified`.
+
+        Args::
+            maxsize(int): Maximum number of cached responses
+            ttl(float): Default seconds during which an entry is served
+            without revalidation, `0` means always revalidate
+            ttls(dict): TTLs for specific resources, e.g. `{'teams': 60}`
+
+        Properties::
+            hits: Number of responses served without a request
+            revalidations: Number of `304` responses
+            misses: Number of fully downloaded responses
+
+        Methods::
+            get(key): Returns an entry or `None`
+            set(key, CacheEntry): Stores an entry
+            record_hit: Counts a response served from the cache
+            record_revalidation(CacheEntry): Counts a `304` and marks
+            the entry as fresh
+            record_miss: Counts a fully downloaded response
+            ttl_for(str): Returns TTL of a resource
+            invalidate(str): Removes all entries of an url
+            clear: Removes all entries
+    """
+    def __init__(self, maxsize: int=256, ttl: float=0, ttls: dict=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.ttls = ttls or {}
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ttl_for(self, resource: str) -> float:
+        return self.ttls.get(resource, self.ttl)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry: CacheEntry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def record_hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def record_revalidation(self, entry: CacheEntry):
+        with self._lock:
+            self.revalidations += 1
+            entry.touch()
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def invalidate(self, url: str):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == url]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
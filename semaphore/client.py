@@ -1,4 +1,17 @@
-import requests as r
+import time
+
+from .batch import run_batch
+from .cache import CacheEntry
+from .codec import get_codec, project
+from .concurrency import AdaptiveLimiter
+from .exceptions import RetryError, StatusError
+from .index import NameIndex
+from .instrumentation import EndpointMetrics, Hooks, RequestEvent
+from .ratelimit import RateLimiter, RetryPolicy
+from .singleflight import SingleFlight
+from .streaming import CHUNK_SIZE, ArrayDecoder
+from .transport import RequestsTransport, release
+from .utils import copy_context
 
 
 class BaseRequest:
@@ -7,6 +20,22 @@ class BaseRequest:
 
         Args::
             api_token(str): A authentication token from Semaphore service
+            transport(Transport): A shared HTTP transport, a new
+            `RequestsTransport` is created if it isn't passed
+            cache(ResponseCache): An optional cache of GET responses
+            singleflight(SingleFlight): Coalesces concurrent identical
+            GET requests, disabled if it isn't passed
+            rate_limiter(RateLimiter): Limits requests per second
+            retry(RetryPolicy): Retries throttled requests
+            limiter(AdaptiveLimiter): Adapts number of requests in flight
+            base_url(str): Overrides basic Semaphore API url,
+            e.g. to use a local mock server
+            hooks(Hooks): Listeners of requests
+            models(bool): Return `__slots__` models instead of dictionaries
+            codec(str or Codec): JSON codec of responses, the fastest
+            installed library by default
+            index(NameIndex): Updated from responses of list calls
+            and changes of projects, teams and secrets
 
         Constants::
             BASE_URL: basic Semaphore API url
@@ -19,12 +48,28 @@ class BaseRequest:
 
         Methods::
             _make_url(str): Makes API url for specific API version
-            _get(requests object): Makes HTTP GET request.
+            _resource_url(str): Makes full url of an API resource
+            _get(str): Makes HTTP GET request.
+            _paginate(str): Iterates over all pages of a list resource
     """
 
-    def __init__(self, api_token):
+    def __init__(self, api_token, transport=None, cache=None, singleflight=None,
+                 rate_limiter=None, retry=None, limiter=None, base_url=None,
+                 hooks=None, models=False, codec=None, index=None):
         self.token = api_token
         self._default_headers = {'Authorization': f'Token {self.token}'}
+        self._transport = transport if transport is not None else RequestsTransport()
+        self._cache = cache
+        self._singleflight = singleflight
+        self._rate_limiter = rate_limiter
+        self._retry = retry
+        self._limiter = limiter
+        self._hooks = hooks
+        self._models = models
+        self._codec = get_codec(codec)
+        self._index = index
+        if base_url is not None:
+            self._BASE_URL = base_url.rstrip('/')
 
     _BASE_URL = 'https://api.semaphoreci.com'
     _API_VERSION = '/v2'
@@ -57,36 +102,402 @@ class BaseRequest:
         assert api_version.startswith('/'), f'URL must be looks like /v{api_version}'
         return self._BASE_URL + api_version
 
-    def _make_request(self, method, resource: str=None, only_status=False, **kwargs):
+    def _resource_url(self, resource: str=None) -> str:
+        """Makes full url of an API resource
+
+            Args::
+                resource(str): An Semaphore's API resource
+
+            Returns::
+                Url of the resource
+        """
+        resource = '/' + resource if resource else ''
+        return self.api_url + '/' + resource
+
+    def _make_request(self, method, resource: str=None, only_status=False,
+                      fields: tuple=None, **kwargs):
         """Factory method for HTTP requests
 
             Args::
-                method(requests object): an HTTP request
+                method(str): An HTTP method name
                 resource(str): An Semaphore's API resource
+                only_status(bool): Return only the status code,
+                the body of the response is never downloaded or decoded
+                fields(tuple): Keep only these keys of returned objects
                 kwargs extra arguments
 
             Returns::
                 An JSON response
         """
-        resource = '/' + resource if resource else ''
-        url = self.api_url + '/' + resource
-
+        url = self._resource_url(resource)
+        if method == 'GET' and not only_status:
+            if self._singleflight is not None:
+                key = (self.token, url, repr(sorted(kwargs.items())))
+                data = self._singleflight.do(key, self._get_json, url, **kwargs)
+            else:
+                data = self._get_json(url, **kwargs)
+            data = self._decode(resource, data, fields)
+            if self._index is not None:
+                self._index.observe(method, resource, data)
+            return data
+
+        if self._cache is not None and method not in ('GET', 'HEAD'):
+            self._cache.invalidate(url)
         if only_status:
-            return method(url, headers=self._default_headers, **kwargs).status_code
+            response = self._send(method, url, stream=True, **kwargs)
+            release(response)
+            if self._index is not None:
+                self._index.observe(method, resource, response.status_code)
+            return response.status_code
+
+        response = self._send(method, url, **kwargs)
+        data = self._decode(resource, self._json(response), fields)
+        if self._index is not None:
+            self._index.observe(method, resource, data)
+        return data
+
+    def _json(self, response):
+        """Decodes a response body with the client's codec
+
+            Args::
+                response: A response object
+
+            Returns::
+                Decoded JSON
+        """
+        content = response.content
+        if not isinstance(content, (bytes, str)):
+            # response objects without a raw body decode themselves
+            return response.json()
+        return self._codec.loads(content)
+
+    def _decode(self, resource: str, data, fields: tuple=None):
+        """Projects decoded JSON to fields and converts it to models,
+        if they are requested
+
+            Args::
+                resource(str): An Semaphore's API resource or url
+                data: Decoded JSON
+                fields(tuple): Keep only these keys of objects
+
+            Returns::
+                Models or `data` itself
+        """
+        if fields:
+            data = project(data, fields)
+        if not self._models:
+            return data
+        from .models import decode
+
+        return decode(resource, data)
+
+    def _get_json(self, url: str, **kwargs):
+        """Makes HTTP(GET) request, through the response cache if it's enabled
+
+            Args::
+                url(str): A full url of the request
+                kwargs extra arguments
+
+            Returns::
+                An JSON response
+        """
+        if self._cache is not None:
+            return self._cached_get(url, **kwargs)
+        return self._json(self._send('GET', url, **kwargs))
+
+    def _cached_get(self, url: str, **kwargs):
+        """Makes HTTP(GET) request through the response cache
+
+        A fresh cached body is returned without a request,
+        a stale one is revalidated with its ETag/Last-Modified.
+
+            Args::
+                url(str): A full url of the request
+                kwargs extra arguments
+
+            Returns::
+                An JSON response
+        """
+        cache = self._cache
+        key = (url, self.token, repr(sorted(kwargs.items())))
+        entry = cache.get(key)
+        if entry is not None and entry.fresh:
+            cache.record_hit()
+            return self._codec.loads(entry.content)
+
+        validators = entry.validators() if entry is not None else None
+        response = self._send('GET', url, headers=validators, **kwargs)
+        if entry is not None and response.status_code == 304:
+            cache.record_revalidation(entry)
+            return self._codec.loads(entry.content)
+
+        cache.record_miss()
+        ttl = cache.ttl_for(self._RESOURCE)
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code == 200 and (etag or last_modified or ttl):
+            cache.set(key, CacheEntry(response.content, etag, last_modified, ttl))
+        return self._json(response)
+
+    def _send(self, method: str, url: str, headers: dict=None, **kwargs):
+        """Sends an HTTP request through the shared transport
+
+        Waits for the rate limiter before every attempt and retries
+        throttled responses according to the retry policy.
+
+            Args::
+                method(str): An HTTP method name
+                url(str): A full url of the request
+                headers(dict): Extra headers of the request
+                kwargs extra arguments
+
+            Returns::
+                A response object
+
+            Raises::
+                RetryError: if a request is still throttled after all retries
+        """
+        if headers:
+            headers = {**self._default_headers, **headers}
+        else:
+            headers = self._default_headers
+
+        hooks = self._hooks
+        if not hooks:
+            return self._send_attempts(method, url, headers, kwargs)
+
+        event = RequestEvent(method, url)
+        hooks.emit('before_request', event)
+        try:
+            response = self._send_attempts(method, url, headers, kwargs, event)
+        except Exception as error:
+            event.finish(error=error)
+            hooks.emit('on_error', event)
+            raise
+        event.finish(response)
+        hooks.emit('after_response', event)
+        return response
+
+    def _send_attempts(self, method: str, url: str, headers: dict, kwargs: dict,
+                       event: RequestEvent=None):
+        """Makes attempts of a request until it isn't throttled
+
+            Args::
+                method(str): An HTTP method name
+                url(str): A full url of the request
+                headers(dict): Headers of the request
+                kwargs(dict): extra arguments
+                event(RequestEvent): An event which counts retries
+
+            Returns::
+                A response object
+        """
+        retry = self._retry
+        attempt = 0
+        while True:
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire()
+            if self._limiter is None:
+                response = self._transport.request(
+                    method,
+                    url,
+                    headers=headers,
+                    **kwargs
+                )
+            else:
+                response = self._limited_request(method, url, headers, **kwargs)
+            if retry is None or not retry.should_retry(response.status_code):
+                return response
+            if attempt >= retry.max_retries:
+                raise RetryError(response)
+            response.close()
+            time.sleep(retry.delay(attempt, response.headers.get('Retry-After')))
+            attempt += 1
+            if event is not None:
+                event.retries = attempt
+
+    def _limited_request(self, method: str, url: str, headers: dict, **kwargs):
+        """Makes a request within the adaptive concurrency limit
+
+            Args::
+                method(str): An HTTP method name
+                url(str): A full url of the request
+                headers(dict): Headers of the request
+                kwargs extra arguments
+
+            Returns::
+                A response object
+        """
+        limiter = self._limiter
+        limiter.acquire()
+        started = time.monotonic()
+        try:
+            response = self._transport.request(
+                method,
+                url,
+                headers=headers,
+                **kwargs
+            )
+        except Exception as error:
+            if self._transport.is_timeout(error):
+                limiter.release(time.monotonic() - started, congested=True)
+            else:
+                limiter.release()
+            raise
+        limiter.release(
+            time.monotonic() - started,
+            congested=response.status_code in (429, 503)
+        )
+        return response
 
-        return method(url, headers=self._default_headers, **kwargs).json()
+    def _fetch_page(self, url: str, fields: tuple=None, **kwargs):
+        """Fetches a single page of a list resource
 
-    def _get(self, resource: str=None, **kwargs):
+            Args::
+                url(str): A full url of the page
+                fields(tuple): Keep only these keys of objects
+                kwargs extra arguments
+
+            Returns::
+                A tuple with an array of objects and url of the next page,
+                url is `None` for the last page
+        """
+        response = self._send('GET', url, **kwargs)
+        next_page = response.links.get('next', {}).get('url')
+        page = self._decode(url, self._json(response), fields)
+        if not isinstance(page, list):
+            page = [page]
+        return page, next_page
+
+    def _paginate(self, resource: str=None, fields: tuple=None, **kwargs):
+        """Lazily iterates over all pages of a list resource
+
+        The next page is downloaded in a background thread
+        while the current one is being consumed.
+
+            Args::
+                resource(str): An Semaphore's API resource
+                fields(tuple): Keep only these keys of objects
+                kwargs extra arguments, sent only with the first page
+
+            Returns::
+                A generator of objects
+        """
+        page, next_page = self._fetch_page(
+            self._resource_url(resource),
+            fields,
+            **kwargs
+        )
+        if self._index is not None:
+            self._index.observe('GET', resource, page)
+        if next_page is None:
+            yield from page
+            return
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            while True:
+                prefetch = executor.submit(
+                    copy_context().run,
+                    self._fetch_page,
+                    next_page,
+                    fields
+                )
+                try:
+                    yield from page
+                except GeneratorExit:
+                    prefetch.cancel()
+                    raise
+                page, next_page = prefetch.result()
+                if self._index is not None:
+                    self._index.observe('GET', resource, page)
+                if next_page is None:
+                    break
+        yield from page
+
+    def _exists(self, resource: str) -> bool:
+        """Checks whether an object exists with a HEAD request,
+        falls back to a GET request whose body isn't downloaded
+
+            Args::
+                resource(str): An Semaphore's API resource
+
+            Returns::
+                `True` if the object exists, `False` on `404`
+
+            Raises::
+                StatusError: on other error statuses, e.g. `401`
+        """
+        status_code = self._make_request('HEAD', resource, only_status=True)
+        if status_code in (405, 501):
+            status_code = self._make_request('GET', resource, only_status=True)
+        return self._exists_status(status_code, resource)
+
+    def _exists_status(self, status_code: int, resource: str) -> bool:
+        if 200 <= status_code < 300:
+            return True
+        if status_code in (404, 410):
+            return False
+        raise StatusError(status_code, self._resource_url(resource))
+
+    def _stream(self, resource: str=None, fields: tuple=None, **kwargs):
+        """Iterates over all pages of a list resource, decoding objects
+        of a page while its body is being downloaded
+
+        Memory is bounded by the largest object plus one chunk of the body,
+        pages are requested one after another.
+
+            Args::
+                resource(str): An Semaphore's API resource
+                fields(tuple): Keep only these keys of objects
+                kwargs extra arguments, sent only with the first page
+
+            Returns::
+                A generator of objects
+        """
+        url = self._resource_url(resource)
+        while url is not None:
+            response = self._send('GET', url, stream=True, **kwargs)
+            kwargs = {}
+            try:
+                url = response.links.get('next', {}).get('url')
+                decoder = ArrayDecoder()
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    for item in decoder.feed(chunk):
+                        yield self._streamed(resource, response.url, item, fields)
+                for item in decoder.close():
+                    yield self._streamed(resource, response.url, item, fields)
+            finally:
+                response.close()
+
+    def _streamed(self, resource: str, url: str, item, fields: tuple=None):
+        item = self._decode(url, item, fields)
+        if self._index is not None:
+            self._index.observe('GET', resource, [item])
+        return item
+
+    def _get(self, resource: str=None, iterate: bool=False, fields: tuple=None,
+             stream: bool=False, **kwargs):
         """Makes HTTP(GET) request for basic Semaphore's API url
 
             Args::
                 resource(str): An Semaphore's API resource
+                iterate(bool): Follow pagination and return a generator
+                which yields objects of all pages one by one
+                fields(tuple): Keep only these keys of returned objects
+                stream(bool): Like `iterate`, but objects are decoded
+                while a page is being downloaded
                 kwargs extra arguments
 
             Returns::
                 An response from Semaphore API
         """
-        return self._make_request(r.get, resource, **kwargs)
+        if stream:
+            return self._stream(resource, fields, **kwargs)
+        if iterate:
+            return self._paginate(resource, fields, **kwargs)
+        return self._make_request('GET', resource, fields=fields, **kwargs)
 
     def _post(self, resource: str=None, only_status=False, **kwargs):
         """Makes HTTP(POST) request
@@ -99,7 +510,7 @@ class BaseRequest:
                 An response from Semaphore API
         """
         return self._make_request(
-            r.post,
+            'POST',
             resource,
             only_status,
             **kwargs
@@ -116,7 +527,7 @@ class BaseRequest:
                 An response from Semaphore API
         """
         return self._make_request(
-            r.delete,
+            'DELETE',
             resource,
             only_status=True,
             **kwargs
@@ -132,7 +543,7 @@ class BaseRequest:
             Returns::
                 An response from Semaphore API
         """
-        return self._make_request(r.patch, resource, **kwargs)
+        return self._make_request('PATCH', resource, **kwargs)
 
 
 class SemaphoreBaseResource(BaseRequest):
@@ -144,8 +555,8 @@ class SemaphoreBaseResource(BaseRequest):
         Methods::
             default_resources(boolean): Returns available Semaphore's API resources
     """
-    def __init__(self, api_token: str):
-        super().__init__(api_token)
+    def __init__(self, api_token: str, **kwargs):
+        super().__init__(api_token, **kwargs)
 
     def default_resources(self, as_list: bool=False):
         """Returns all available Semaphore resources
@@ -174,6 +585,7 @@ class OrganizationResource(SemaphoreBaseResource):
         Methods::
             list: Returns an array with an organization objects
             by_name(str): Retrieve an organization by name
+            exists(str): Checks whether an organization exists
             urls(str): Retrieve urls of an organization
             secrets_url(str): Retrieve a secrets url of an organization
             users(str): Retrieve an users of an organization
@@ -181,12 +593,20 @@ class OrganizationResource(SemaphoreBaseResource):
 
     _RESOURCE = 'orgs'
 
-    def __init__(self, api_token: str):
-        super().__init__(api_token)
+    def __init__(self, api_token: str, **kwargs):
+        super().__init__(api_token, **kwargs)
+
+    def list(self, iterate: bool=False, fields: tuple=None, stream: bool=False):
+        """Returns an array with an organization objects
 
-    def list(self):
-        """Returns an array with an organization objects"""
-        return self._get(resource=self._RESOURCE)
+            Args::
+                iterate: Returns a generator over all pages
+                fields: Keep only these keys of every object
+                stream: Decodes objects while pages are downloaded,
+                returns a generator over all pages
+        """
+        return self._get(resource=self._RESOURCE, iterate=iterate, fields=fields,
+                         stream=stream)
 
     def by_name(self, user_name: str):
         """Searches an organization by username
@@ -201,41 +621,70 @@ class OrganizationResource(SemaphoreBaseResource):
         resource = f'{self._RESOURCE}/{user_name}'
         return self._get(resource=resource)
 
-    def urls(self, username):
+    def exists(self, user_name: str) -> bool:
+        """Checks whether an organization exists, without downloading it
+
+            Args::
+                user_name: A username of an organization
+
+            Returns::
+                `True` if an organization exists, otherwise `False`
+        """
+        return self._exists(f'{self._RESOURCE}/{user_name}')
+
+    def urls(self, username, iterate: bool=False, fields: tuple=None,
+             stream: bool=False):
         """Returns an organization project urls
 
             Args::
                 username: A username of an organization
+                iterate: Returns a generator over all pages
+                fields: Keep only these keys of every object
+                stream: Decodes objects while pages are downloaded,
+                returns a generator over all pages
 
             Returns::
                 An array with urls
         """
         resource = f'{self._RESOURCE}/{username}/projects'
-        return self._get(resource=resource)
+        return self._get(resource=resource, iterate=iterate, fields=fields,
+                         stream=stream)
 
-    def secret_urls(self, username):
+    def secret_urls(self, username, iterate: bool=False, fields: tuple=None,
+                    stream: bool=False):
         """Returns an organization project secret urls
 
             Args::
                 username: A username of an organization
+                iterate: Returns a generator over all pages
+                fields: Keep only these keys of every object
+                stream: Decodes objects while pages are downloaded,
+                returns a generator over all pages
 
             Returns::
                 An array with urls
         """
         resource = f'{self._RESOURCE}/{username}/secrets'
-        return self._get(resource=resource)
+        return self._get(resource=resource, iterate=iterate, fields=fields,
+                         stream=stream)
 
-    def users(self, username: str):
+    def users(self, username: str, iterate: bool=False, fields: tuple=None,
+              stream: bool=False):
         """Returns all users of an organization
 
             Args::
                 username: A username of an organization
+                iterate: Returns a generator over all pages
+                fields: Keep only these keys of every object
+                stream: Decodes objects while pages are downloaded,
+                returns a generator over all pages
 
             Returns::
                 An array with user objects
         """
         resource = f'{self._RESOURCE}/{username}/users'
-        return self._get(resource=resource)
+        return self._get(resource=resource, iterate=iterate, fields=fields,
+                         stream=stream)
 
 
 class TeamResource(SemaphoreBaseResource):
@@ -249,6 +698,7 @@ class TeamResource(SemaphoreBaseResource):
             __check_permission(str): Checks if a permission is allowed
             for Semaphore API, otherwise raise the error.
             by_id(str): Retrieve a team by ID
+            exists(str): Checks whether a team exists
             by_project(str): Retrieve a team by project ID
             secrets(str): Retrieve a team by secrets ID
 
@@ -260,8 +710,8 @@ class TeamResource(SemaphoreBaseResource):
             update(str): Update a team by ID
             delete(str): Delete a team by ID
     """
-    def __init__(self, api_token):
-        super().__init__(api_token)
+    def __init__(self, api_token, **kwargs):
+        super().__init__(api_token, **kwargs)
 
     _RESOURCE = 'teams'
     ALLOWED_PERMISSIONS = ('read', 'edit', 'admin')
@@ -275,17 +725,23 @@ class TeamResource(SemaphoreBaseResource):
         if permission not in self.ALLOWED_PERMISSIONS:
             raise ValueError('Permission argument must be "read", "edit" or "admin"')
 
-    def all(self, username):
+    def all(self, username, iterate: bool=False, fields: tuple=None,
+            stream: bool=False):
         """Returns all teams objects, with related information
 
             Args::
                 username: All related teams to username
+                iterate: Returns a generator over all pages
+                fields: Keep only these keys of every object
+                stream: Decodes objects while pages are downloaded,
+                returns a generator over all pages
 
             Returns::
                 An array with team objects information
         """
         resource = f'orgs/{username}/{self._RESOURCE}'
-        return self._get(resource=resource)
+        return self._get(resource=resource, iterate=iterate, fields=fields,
+                         stream=stream)
 
     def by_id(self, team_id: str):
         """Returns a team by id
@@ -299,29 +755,52 @@ class TeamResource(SemaphoreBaseResource):
         resource = f'{self._RESOURCE}/{team_id}'
         return self._get(resource=resource)
 
-    def by_project(self, project_id: str):
+    def exists(self, team_id: str) -> bool:
+        """Checks whether a team exists, without downloading it
+
+            Args::
+                team_id: ID of a team
+
+            Returns::
+                `True` if a team exists, otherwise `False`
+        """
+        return self._exists(f'{self._RESOURCE}/{team_id}')
+
+    def by_project(self, project_id: str, iterate: bool=False, fields: tuple=None,
+                   stream: bool=False):
         """Returns teams by project ID
 
             Args::
                 project_id: A project ID which need to find
+                iterate: Returns a generator over all pages
+                fields: Keep only these keys of every object
+                stream: Decodes objects while pages are downloaded,
+                returns a generator over all pages
 
             Returns::
                 An array with team objects
         """
         resource = f'projects/{project_id}/{self._RESOURCE}'
-        return self._get(resource=resource)
+        return self._get(resource=resource, iterate=iterate, fields=fields,
+                         stream=stream)
 
-    def secrets(self, secret_id: str):
+    def secrets(self, secret_id: str, iterate: bool=False, fields: tuple=None,
+                stream: bool=False):
         """Returns teams by secrets
 
             Args::
                 secret_id(str): A secret ID which need to find
+                iterate: Returns a generator over all pages
+                fields: Keep only these keys of every object
+                stream: Decodes objects while pages are downloaded,
+                returns a generator over all pages
 
             Returns::
                 An array with team objects
         """
         resource = f'secrets/{secret_id}/{self._RESOURCE}'
-        return self._get(resource=resource)
+        return self._get(resource=resource, iterate=iterate, fields=fields,
+                         stream=stream)
 
     def create(self, organization_username: str, update=False, **kwargs):
         """Creates a team for a organization
@@ -396,46 +875,65 @@ class UsersResource(SemaphoreBaseResource):
            add(str): Add a user into a team
            remove(str): Remove a user from a team
     """
-    def __init__(self, api_token):
-        super().__init__(api_token)
+    def __init__(self, api_token, **kwargs):
+        super().__init__(api_token, **kwargs)
 
     _RESOURCE = 'users'
 
-    def list(self, user_name: str):
+    def list(self, user_name: str, iterate: bool=False, fields: tuple=None,
+             stream: bool=False):
         """Returns all users of an organization
 
             Args::
                 user_name: For which need to find all users
+                iterate: Returns a generator over all pages
+                fields: Keep only these keys of every object
+                stream: Decodes objects while pages are downloaded,
+                returns a generator over all pages
 
             Returns::
                 An array with user objects
         """
         resource = f'orgs/{user_name}/{self._RESOURCE}'
-        return self._get(resource=resource)
+        return self._get(resource=resource, iterate=iterate, fields=fields,
+                         stream=stream)
 
-    def team_members(self, team_id: str):
+    def team_members(self, team_id: str, iterate: bool=False, fields: tuple=None,
+                     stream: bool=False):
         """Returns all members of a team by ID
 
             Args::
                 team_id: Team ID for which need to find an users
+                iterate: Returns a generator over all pages
+                fields: Keep only these keys of every object
+                stream: Decodes objects while pages are downloaded,
+                returns a generator over all pages
 
             Returns::
                 An array with member objects
         """
-        resource = f'orgs/{team_id}/{self._RESOURCE}'
-        return self._get(resource=resource)
+        resource = f'teams/{team_id}/{self._RESOURCE}'
+        return self._get(resource=resource, iterate=iterate, fields=fields,
+                         stream=stream)
 
-    def project_members(self, project_id: str):
+    def project_members(self, project_id: str, iterate: bool=False,
+                        fields: tuple=None,
+                        stream: bool=False):
         """Returns all members of a project
 
             Args::
                 project_id: Project ID for which need to find an users
+                iterate: Returns a generator over all pages
+                fields: Keep only these keys of every object
+                stream: Decodes objects while pages are downloaded,
+                returns a generator over all pages
 
-            Args::
+            Returns::
                 An array with user objects
         """
         resource = f'projects/{project_id}/{self._RESOURCE}'
-        return self._get(resource=resource)
+        return self._get(resource=resource, iterate=iterate, fields=fields,
+                         stream=stream)
 
     def add(self, team_id: str, user_name: str):
         """Add a user into a team
@@ -478,48 +976,67 @@ class ProjectsResource(SemaphoreBaseResource):
             add_team(str, str): Find a project by ID and added a project into a team
             delete_team(str, str): Remove a project from a team
     """
-    def __init__(self, api_token):
-        super().__init__(api_token)
+    def __init__(self, api_token, **kwargs):
+        super().__init__(api_token, **kwargs)
 
     _RESOURCE = 'projects'
 
-    def list(self, user_name: str):
+    def list(self, user_name: str, iterate: bool=False, fields: tuple=None,
+             stream: bool=False):
         """Returns an projects of an organization
 
             Args::
                 user_name: Name of an organization
                 for which need to retrieve an projects
+                iterate: Returns a generator over all pages
+                fields: Keep only these keys of every object
+                stream: Decodes objects while pages are downloaded,
+                returns a generator over all pages
 
             Returns::
                 An array with project objects
         """
         resource = f'orgs/{user_name}/{self._RESOURCE}'
-        return self._get(resource=resource)
+        return self._get(resource=resource, iterate=iterate, fields=fields,
+                         stream=stream)
 
-    def added_projects(self, team_id: str):
+    def added_projects(self, team_id: str, iterate: bool=False, fields: tuple=None,
+                       stream: bool=False):
         """Retrieves an projects added to a team
 
             Args::
                 team_id: A team for which will need to find
                 added projects
+                iterate: Returns a generator over all pages
+                fields: Keep only these keys of every object
+                stream: Decodes objects while pages are downloaded,
+                returns a generator over all pages
 
             Returns::
                 An array with project objects
         """
         resource = f'teams/{team_id}/{self._RESOURCE}'
-        return self._get(resource=resource)
+        return self._get(resource=resource, iterate=iterate, fields=fields,
+                         stream=stream)
 
-    def project_secrets(self, secret_id: str):
+    def project_secrets(self, secret_id: str, iterate: bool=False,
+                        fields: tuple=None,
+                        stream: bool=False):
         """Retrieves an projects by secrets ID
 
             Args::
                 secret_id: ID of a secret resource
+                iterate: Returns a generator over all pages
+                fields: Keep only these keys of every object
+                stream: Decodes objects while pages are downloaded,
+                returns a generator over all pages
 
             Returns::
                 An array with project objects
         """
         resource = f'secrets/{secret_id}/{self._RESOURCE}'
-        return self._get(resource=resource)
+        return self._get(resource=resource, iterate=iterate, fields=fields,
+                         stream=stream)
 
     def create(self, user_name: str, name: str, repo_name: str,
                repo_owner, repo_provider: str):
@@ -583,6 +1100,7 @@ class SecretsResource(SemaphoreBaseResource):
                team(str): Retrieves all secret variables which related to a team
                project(str): Retrieves all secret variables which related to a project
                by_id(str): Returns a secret object by ID
+               exists(str): Checks whether a secret exists
                create(str, str, str): Creates a secret object in an organization
 
                update(str, str, str): Update a secret object by ID
@@ -593,48 +1111,66 @@ class SecretsResource(SemaphoreBaseResource):
                dettach_from_project(str, str): Dettatach a secret from a project
        """
 
-    def __init__(self, api_token):
-        super().__init__(api_token)
+    def __init__(self, api_token, **kwargs):
+        super().__init__(api_token, **kwargs)
 
     _RESOURCE = 'secrets'
 
-    def all(self, org_username: str):
+    def all(self, org_username: str, iterate: bool=False, fields: tuple=None,
+            stream: bool=False):
         """Returns all secret variables of an organization
 
             Args::
                 org_username: Username of an organization, for which need
                 to find secret variables
+                iterate: Returns a generator over all pages
+                fields: Keep only these keys of every object
+                stream: Decodes objects while pages are downloaded,
+                returns a generator over all pages
 
             Returns::
                 An array with secret objects
         """
         resource = f'orgs/{org_username}/{self._RESOURCE}'
-        return self._get(resource=resource)
+        return self._get(resource=resource, iterate=iterate, fields=fields,
+                         stream=stream)
 
-    def team(self, team_id: str):
+    def team(self, team_id: str, iterate: bool=False, fields: tuple=None,
+             stream: bool=False):
         """Returns secrets variables of a team
 
             Args::
                 team_id: A team for which need to return secret variables
+                iterate: Returns a generator over all pages
+                fields: Keep only these keys of every object
+                stream: Decodes objects while pages are downloaded,
+                returns a generator over all pages
 
             Returns::
                 An array with secret objects
         """
         resource = f'teams/{team_id}/{self._RESOURCE}'
-        return self._get(resource=resource)
+        return self._get(resource=resource, iterate=iterate, fields=fields,
+                         stream=stream)
 
-    def project(self, project_id: str):
+    def project(self, project_id: str, iterate: bool=False, fields: tuple=None,
+                stream: bool=False):
         """Returns all attached secrets for a project
 
             Args::
                 project_id: ID of a project, for which need to find a secrets
                 variables and etc
+                iterate: Returns a generator over all pages
+                fields: Keep only these keys of every object
+                stream: Decodes objects while pages are downloaded,
+                returns a generator over all pages
 
             Returns::
                 An array with secret objects
         """
         resource = f'projects/{project_id}/secrets'
-        return self._get(resource=resource)
+        return self._get(resource=resource, iterate=iterate, fields=fields,
+                         stream=stream)
 
     def by_id(self, secret_id: str):
         """Returns a secret by ID
@@ -649,6 +1185,17 @@ class SecretsResource(SemaphoreBaseResource):
         resource = f'{self._RESOURCE}/{secret_id}'
         return self._get(resource=resource)
 
+    def exists(self, secret_id: str) -> bool:
+        """Checks whether a secret exists, without downloading it
+
+            Args::
+                secret_id: ID of a secret
+
+            Returns::
+                `True` if a secret exists, otherwise `False`
+        """
+        return self._exists(f'{self._RESOURCE}/{secret_id}')
+
     def create(self, org_username: str, name: str, description: str=None):
         """Create a secret in an organization
 
@@ -747,6 +1294,7 @@ class EnvironmentResource(SemaphoreBaseResource):
                 all(str): Retrieves all environment variables of a project
                 secrets(str): Retrieves all variables belonging to a secret
                 by_id(str): Retrieves a environment object by ID
+                exists(str): Checks whether an environment variable exists
                 create(str, str, str, bool): Create environment
                 variable within a secret
 
@@ -754,36 +1302,48 @@ class EnvironmentResource(SemaphoreBaseResource):
                 delete(str): Delete a environment variable by ID
        """
 
-    def __init__(self, api_token):
-        super().__init__(api_token)
+    def __init__(self, api_token, **kwargs):
+        super().__init__(api_token, **kwargs)
 
     _RESOURCE = 'env_vars'
 
-    def all(self, project_id: str):
+    def all(self, project_id: str, iterate: bool=False, fields: tuple=None,
+            stream: bool=False):
         """Returns all environment variables which related to a project
 
             Args::
                 project_id: ID of a project for which need to find
                 an environment variables
+                iterate: Returns a generator over all pages
+                fields: Keep only these keys of every object
+                stream: Decodes objects while pages are downloaded,
+                returns a generator over all pages
 
             Returns::
                 An array with environment objects
         """
         resource = f'projects/{project_id}/{self._RESOURCE}'
-        return self._get(resource=resource)
+        return self._get(resource=resource, iterate=iterate, fields=fields,
+                         stream=stream)
 
-    def secrets(self, secret_id: str):
+    def secrets(self, secret_id: str, iterate: bool=False, fields: tuple=None,
+                stream: bool=False):
         """Returns variables belonging to a secret
 
             Args::
                 secret_id: ID of a secret for which need to return
                 variables
+                iterate: Returns a generator over all pages
+                fields: Keep only these keys of every object
+                stream: Decodes objects while pages are downloaded,
+                returns a generator over all pages
 
             Returns::
                 An array with secret objects
         """
         resource = f'secrets/{secret_id}/{self._RESOURCE}'
-        return self._get(resource=resource)
+        return self._get(resource=resource, iterate=iterate, fields=fields,
+                         stream=stream)
 
     def by_id(self, env_var: str):
         """Returns a environment variable by ID
@@ -797,6 +1357,17 @@ class EnvironmentResource(SemaphoreBaseResource):
         resource = f'{self._RESOURCE}/{env_var}'
         return self._get(resource=resource)
 
+    def exists(self, env_var: str) -> bool:
+        """Checks whether an environment variable exists, without downloading it
+
+            Args::
+                env_var: ID of an environment variable
+
+            Returns::
+                `True` if an environment variable exists, otherwise `False`
+        """
+        return self._exists(f'{self._RESOURCE}/{env_var}')
+
     def create(self, secret_id: str, name: str, content: str, encrypted: bool=True):
         """Create a environment variable within a secret
 
@@ -858,6 +1429,7 @@ class ConfigurationFileResource(SemaphoreBaseResource):
                 secrets(str): Retrieves all configuration files
                 which related to a secret
                 by_id(str): Retrieve a configuration file by ID
+                exists(str): Checks whether a configuration file exists
                 create(str, str, str, str): Create a configuration file
                 within a secret
                 update(str, str, str): Update a configuration file
@@ -865,36 +1437,48 @@ class ConfigurationFileResource(SemaphoreBaseResource):
                 delete(str): Delete configuration file by ID
        """
 
-    def __init__(self, api_token):
-        super().__init__(api_token)
+    def __init__(self, api_token, **kwargs):
+        super().__init__(api_token, **kwargs)
 
     _RESOURCE = 'config_files'
 
-    def all(self, project_id: str):
+    def all(self, project_id: str, iterate: bool=False, fields: tuple=None,
+            stream: bool=False):
         """Returns all configuration files related to a project
 
             Args::
                 project_id: ID of a project for which need to return
                 a configuration file
+                iterate: Returns a generator over all pages
+                fields: Keep only these keys of every object
+                stream: Decodes objects while pages are downloaded,
+                returns a generator over all pages
 
             Returns::
                 A object with configuration information
         """
         resource = f'projects/{project_id}/{self._RESOURCE}'
-        return self._get(resource=resource)
+        return self._get(resource=resource, iterate=iterate, fields=fields,
+                         stream=stream)
 
-    def secrets(self, secret_id: str):
+    def secrets(self, secret_id: str, iterate: bool=False, fields: tuple=None,
+                stream: bool=False):
         """Returns a configuration files related to a secret
 
             Args::
                 secret_id: ID of a secret for which need
                 to find a configuration file
+                iterate: Returns a generator over all pages
+                fields: Keep only these keys of every object
+                stream: Decodes objects while pages are downloaded,
+                returns a generator over all pages
 
             Returns::
                 An array with configuration files
         """
         resource = f'secrets/{secret_id}/{self._RESOURCE}'
-        return self._get(resource=resource)
+        return self._get(resource=resource, iterate=iterate, fields=fields,
+                         stream=stream)
 
     def by_id(self, config_file_id: str):
         """Returns a configuration file by ID
@@ -908,6 +1492,17 @@ class ConfigurationFileResource(SemaphoreBaseResource):
         resource = f'{self._RESOURCE}/{config_file_id}'
         return self._get(resource=resource)
 
+    def exists(self, config_file_id: str) -> bool:
+        """Checks whether a configuration file exists, without downloading it
+
+            Args::
+                config_file_id: ID of a configuration file
+
+            Returns::
+                `True` if a configuration file exists, otherwise `False`
+        """
+        return self._exists(f'{self._RESOURCE}/{config_file_id}')
+
     def create(self, secret_id: str, path: str, content: str, encrypted: bool):
         """Create a configuration file within a secret
 
@@ -960,14 +1555,271 @@ class ConfigurationFileResource(SemaphoreBaseResource):
         return self._delete(resource=resource)
 
 
+class LazyResource:
+    """Resource attribute of a client, which is created on first access
+
+    The resource gets the options shared by all resources of the client,
+    afterwards it's stored on the instance and returned directly.
+
+        Args::
+            resource_class: A class of the resource
+    """
+    def __init__(self, resource_class):
+        self.resource_class = resource_class
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        resource = self.resource_class(instance.token, **instance._options)
+        instance.__dict__[self.name] = resource
+        return resource
+
+
 class Semaphore(SemaphoreBaseResource):
-    """Main wrapper class"""
-    def __init__(self, api_token: str):
-        super().__init__(api_token)
-        self.organization = OrganizationResource(api_token)
-        self.teams = TeamResource(api_token)
-        self.users = UsersResource(api_token)
-        self.projects = ProjectsResource(api_token)
-        self.secrets = SecretsResource(api_token)
-        self.environment = EnvironmentResource(api_token)
-        self.config_files = ConfigurationFileResource(api_token)
+    """Main wrapper class
+
+        All resources share one HTTP transport, by default a pooled
+        keep-alive `requests` session, so TCP connections and TLS sessions
+        are reused between calls. Resources are created on first access.
+
+        Args::
+            api_token(str): A authentication token from Semaphore service
+            pool_connections(int): Number of connection pools to cache
+            pool_maxsize(int): Maximum number of connections kept per host,
+            also the default number of workers for batches
+            transport(Transport): An HTTP backend, e.g. `Urllib3Transport`
+            or `InMemoryTransport`, pool arguments are ignored if it's passed
+            base_url(str): Overrides basic Semaphore API url
+            metrics(bool): Collects latency, size, status and retries
+            histograms by endpoint template into `metrics`
+            models(bool): Return compact `__slots__` models
+            (`semaphore.models`) instead of dictionaries
+            codec(str or Codec): JSON library of responses, e.g. `json`,
+            the fastest installed one (`orjson`, `ujson`) by default
+            tracer(Tracer): Records a span of every request
+            recorder(FlightRecorder): Keeps the last requests in a ring buffer
+            cache(ResponseCache): Enables conditional caching of GET responses
+            coalesce(bool): Concurrent identical GET requests share
+            one HTTP call and its decoded result
+            rate_limit(float): Maximum requests per second of all resources,
+            unlimited by default
+            max_retries(int): Retries of a request throttled with 429/503,
+            `0` disables retries
+            adaptive_concurrency(bool): Adapts number of requests in flight
+            (up to `pool_maxsize`) to latency and throttling of the API,
+            starting from 4, disabled by default
+            index_ttl(float): Seconds during which names of projects, teams
+            and secrets of an organization are resolved from `index`
+
+        Properties::
+            concurrency_limit: Current number of allowed requests in flight
+            hooks: Listeners of `before_request`, `after_response`
+            and `on_error` events of all resources
+            metrics: `EndpointMetrics` if they are enabled, otherwise `None`
+            tracer: `Tracer` of requests or `None`
+            recorder: `FlightRecorder` of requests or `None`
+            index: `NameIndex` which resolves names to ids and back
+
+        Methods::
+            batch(list): Runs many resource calls concurrently
+            map(callable, iterable): Calls a resource method for every argument
+            concurrently
+            sync_env_vars(str, dict): Applies desired environment variables
+            of a secret with a minimal set of changes
+            sync_config_files(str, str, str): Uploads changed files
+            of a directory into a secret
+            close: Releases all pooled connections
+    """
+    def __init__(self, api_token: str, pool_connections: int=10,
+                 pool_maxsize: int=10, cache=None, coalesce: bool=True,
+                 rate_limit: float=None, max_retries: int=3,
+                 adaptive_concurrency: bool=False, transport=None,
+                 base_url: str=None, metrics: bool=False, models: bool=False,
+                 codec=None, tracer=None, recorder=None, index_ttl: float=300):
+        if transport is None:
+            transport = RequestsTransport(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize
+            )
+        self.pool_maxsize = pool_maxsize
+        self.hooks = Hooks()
+        self.metrics = EndpointMetrics().attach(self.hooks) if metrics else None
+        self.tracer = tracer.attach(self.hooks) if tracer is not None else None
+        self.recorder = recorder.attach(self.hooks) if recorder is not None else None
+        self.index = NameIndex(self, ttl=index_ttl)
+
+        options = {
+            'transport': transport,
+            'base_url': base_url,
+            'cache': cache,
+            'singleflight': SingleFlight() if coalesce else None,
+            'rate_limiter': RateLimiter(rate_limit) if rate_limit else None,
+            'retry': RetryPolicy(max_retries) if max_retries else None,
+            'limiter': AdaptiveLimiter(
+                initial=min(4, pool_maxsize),
+                max_limit=pool_maxsize
+            ) if adaptive_concurrency else None,
+            'hooks': self.hooks,
+            'models': models,
+            'codec': get_codec(codec),
+            'index': self.index
+        }
+        super().__init__(api_token, **options)
+        self._options = options
+
+    organization = LazyResource(OrganizationResource)
+    teams = LazyResource(TeamResource)
+    users = LazyResource(UsersResource)
+    projects = LazyResource(ProjectsResource)
+    secrets = LazyResource(SecretsResource)
+    environment = LazyResource(EnvironmentResource)
+    config_files = LazyResource(ConfigurationFileResource)
+
+    @property
+    def concurrency_limit(self) -> int:
+        """Shows current limit of requests in flight,
+        `None` if adaptive concurrency is disabled
+        """
+        if self._limiter is None:
+            return None
+        return self._limiter.limit
+
+    def batch(self, calls, max_workers: int=None, ordered: bool=True):
+        """Runs many resource calls on a bounded thread pool
+        which shares the client's connections
+
+        Usage::
+            semaphore.batch([
+                (semaphore.environment.all, project_id),
+                (semaphore.config_files.all, project_id),
+                (semaphore.teams.by_project, project_id)
+            ])
+
+            Args::
+                calls: An iterable of callables or `(callable, *args)` tuples
+                max_workers(int): Maximum number of calls running at once,
+                defaults to the connection pool size. Requests of the calls
+                are additionally bounded by the adaptive concurrency limit
+                ordered(bool): Return results in order of the calls,
+                otherwise yield them as soon as they are completed
+
+            Returns::
+                An array with `BatchResult` objects
+                or a generator of them if `ordered` is `False`.
+                An exception of a call is captured in its result
+                and doesn't abort the batch.
+        """
+        return run_batch(calls, max_workers or self.pool_maxsize, ordered)
+
+    def map(self, func, iterable, max_workers: int=None, ordered: bool=True):
+        """Calls `func` with every item of `iterable` concurrently
+
+        Usage::
+            semaphore.map(semaphore.environment.all, project_ids)
+
+            Args::
+                func: A resource method
+                iterable: Arguments, a tuple is unpacked into positional arguments
+                max_workers(int): Maximum number of calls running at once
+                ordered(bool): Return results in order of the arguments
+
+            Returns::
+                An array with `BatchResult` objects
+                or a generator of them if `ordered` is `False`
+        """
+        calls = (
+            (func, *item) if isinstance(item, tuple) else (func, item)
+            for item in iterable
+        )
+        return self.batch(calls, max_workers, ordered)
+
+    def sync_env_vars(self, secret_id: str, desired: dict, encrypted: bool=True,
+                      delete: bool=True, update_encrypted: bool=True,
+                      max_workers: int=None, manifest=None):
+        """Makes environment variables of a secret equal to `desired`
+
+        Current variables are fetched once, only created, changed and removed
+        variables are sent, concurrently. A sync without changes is one GET.
+        Encrypted variables are compared with hashes of values pushed before,
+        those missing in the manifest (e.g. on another machine) are rewritten
+        once, a PATCH per variable, unless `update_encrypted=False`.
+
+        Usage::
+            report = semaphore.sync_env_vars(secret_id, {'TOKEN': 'abc'})
+            for item in report.failed:
+                print(item.name, item.action, item.error)
+
+            Args::
+                secret_id(str): ID of a secret
+                desired(dict): Contents of variables by name
+                encrypted(bool): Encrypt created variables
+                delete(bool): Delete variables which aren't desired
+                update_encrypted(bool): Rewrite desired encrypted variables
+                which weren't pushed through the manifest, the API doesn't
+                return their content, so they can't be compared
+                max_workers(int): Maximum number of changes sent at once
+                manifest(str or Manifest): Hashes of pushed encrypted
+                variables, `~/.semaphore/env-vars.json` by default,
+                `Manifest(field='name')` keeps them in memory only
+
+            Returns::
+                A `SyncReport` (`semaphore.sync`) with an item per variable
+
+            Raises::
+                SyncError: if variables of the secret can't be fetched
+        """
+        from .sync import sync_env_vars
+
+        return sync_env_vars(self, secret_id, desired, encrypted, delete,
+                             update_encrypted, max_workers, manifest)
+
+    def sync_config_files(self, secret_id: str, directory: str, remote_dir: str,
+                          manifest=None, encrypted: bool=True, delete: bool=False,
+                          refresh: bool=False, max_workers: int=None):
+        """Uploads only added and changed files of a directory into a secret
+
+        Files are hashed while they are read in chunks and compared with
+        a local manifest of uploaded files, so an unchanged directory makes
+        no request. Changed files are read and uploaded concurrently.
+
+        Usage::
+            report = semaphore.sync_config_files(
+                secret_id, 'deploy/config', '/home/runner/config'
+            )
+
+            Args::
+                secret_id(str): ID of a secret
+                directory(str): A local directory, walked recursively
+                remote_dir(str): A directory of the files in jobs
+                manifest(str or Manifest): Hashes of uploaded files,
+                `.semaphore-manifest.json` in the directory by default
+                encrypted(bool): Encrypt created files
+                delete(bool): Delete uploaded files which don't exist locally
+                refresh(bool): List files of the secret instead of trusting
+                the manifest
+                max_workers(int): Maximum number of uploads at once
+
+            Returns::
+                A `SyncReport` (`semaphore.sync`) with an item per file
+
+            Raises::
+                SyncError: if files of the secret can't be fetched
+        """
+        from .sync import sync_config_files
+
+        return sync_config_files(self, secret_id, directory, remote_dir, manifest,
+                                 encrypted, delete, refresh, max_workers)
+
+    def close(self):
+        """Closes the shared HTTP transport and its pooled connections"""
+        self._transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
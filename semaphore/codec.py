@@ -0,0 +1,113 @@
+"""JSON codecs used to decode responses
+
+The fastest installed library is picked by default:
+`orjson`, then `ujson`, then the standard `json` module.
+
+Usage::
+    Semaphore('token', codec='json')  # force the standard library
+    Semaphore('token', codec=Codec('custom', loads, dumps))
+"""
+import json
+
+PREFERRED = ('orjson', 'ujson', 'json')
+
+
+class Codec:
+    """Pair of JSON functions
+
+        Args::
+            name(str): Name of the codec
+            loads(callable): Decodes `bytes` or `str` to Python objects
+            dumps(callable): Encodes Python objects to `bytes`
+    """
+    __slots__ = ('name', 'loads', 'dumps')
+
+    def __init__(self, name: str, loads, dumps):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self):
+        return f'<Codec {self.name}>'
+
+
+def _json_codec() -> Codec:
+    return Codec(
+        'json',
+        json.loads,
+        lambda obj: json.dumps(obj, separators=(',', ':')).encode()
+    )
+
+
+def _orjson_codec() -> Codec:
+    import orjson
+
+    return Codec('orjson', orjson.loads, orjson.dumps)
+
+
+def _ujson_codec() -> Codec:
+    import ujson
+
+    return Codec('ujson', ujson.loads, lambda obj: ujson.dumps(obj).encode())
+
+
+_FACTORIES = {
+    'orjson': _orjson_codec,
+    'ujson': _ujson_codec,
+    'json': _json_codec
+}
+_default = None
+
+
+def get_codec(codec=None) -> Codec:
+    """Returns a codec by name, the fastest available one by default
+
+        Args::
+            codec(str or Codec): A name of a library, e.g. `orjson`,
+            or a codec itself
+
+        Returns::
+            A `Codec`
+
+        Raises::
+            ImportError: if the requested library isn't installed
+            ValueError: if the library isn't supported
+    """
+    global _default
+
+    if isinstance(codec, Codec):
+        return codec
+    if codec is not None:
+        if codec not in _FACTORIES:
+            raise ValueError(f'Unknown codec "{codec}", must be one of {PREFERRED}')
+        return _FACTORIES[codec]()
+
+    if _default is None:
+        for name in PREFERRED:
+            try:
+                _default = _FACTORIES[name]()
+            except ImportError:
+                continue
+            break
+    return _default
+
+
+def project(data, fields):
+    """Keeps only the given keys of decoded objects
+
+        Args::
+            data: A decoded object or an array of them
+            fields(tuple): Names of kept keys
+
+        Returns::
+            Objects with only the given keys, other values are returned as is
+    """
+    if isinstance(data, list):
+        return [
+            {key: item[key] for key in fields if key in item}
+            if isinstance(item, dict) else item
+            for item in data
+        ]
+    if isinstance(data, dict):
+        return {key: data[key] for key in fields if key in data}
+    return data
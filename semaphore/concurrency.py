@@ -0,0 +1,99 @@
+import math
+import time
+from collections import deque
+from threading import Condition
+
+
+class AdaptiveLimiter:
+    """AIMD limiter of requests in flight
+
+        The limit grows additively (by about one per round of requests)
+        while latency is stable and shrinks multiplicatively when a request
+        is throttled, times out or p95 latency rises above its baseline.
+
+        Args::
+            initial(int): Initial limit
+            min_limit(int): Lower bound of the limit
+            max_limit(int): Upper bound of the limit
+            backoff(float): Multiplier applied to the limit on congestion
+            window(int): Number of latencies used to compute p95
+            tolerance(float): How many times p95 may exceed
+            the baseline before the limit is decreased
+
+        Properties::
+            limit: Current number of allowed requests in flight
+            in_flight: Number of requests in flight
+
+        Methods::
+            acquire: Blocks until a request is allowed
+            release(float, bool): Records the outcome of a request
+    """
+    def __init__(self, initial: int=4, min_limit: int=1, max_limit: int=64,
+                 backoff: float=0.5, window: int=50, tolerance: float=2.0):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self._limit = float(max(min_limit, min(initial, max_limit)))
+        self._in_flight = 0
+        self._latencies = deque(maxlen=window)
+        self._baseline = None
+        self._last_decrease = 0.0
+        self._condition = Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self):
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, latency: float=None, congested: bool=False):
+        """Frees a slot and adapts the limit
+
+            Args::
+                latency(float): Duration of the request in seconds,
+                `None` if it failed without a response
+                congested(bool): `True` if the request was throttled
+                or timed out
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if congested:
+                self._decrease(latency)
+            elif latency is not None:
+                self._observe(latency)
+            self._condition.notify_all()
+
+    def _observe(self, latency: float):
+        self._latencies.append(latency)
+        if len(self._latencies) == self._latencies.maxlen:
+            size = len(self._latencies)
+            p95 = sorted(self._latencies)[min(size - 1, math.ceil(size * 0.95) - 1)]
+            if self._baseline is None:
+                self._baseline = p95
+            elif p95 > self._baseline * self.tolerance:
+                self._decrease(latency)
+                return
+            else:
+                self._baseline = 0.9 * self._baseline + 0.1 * p95
+
+        self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+
+    def _decrease(self, latency: float=None):
+        """Decreases the limit at most once per round trip, so a burst
+        of throttled responses counts as one congestion event
+        """
+        now = time.monotonic()
+        if now - self._last_decrease < (latency or 0):
+            return
+        self._last_decrease = now
+        self._limit = max(self.min_limit, self._limit * self.backoff)
+        self._latencies.clear()
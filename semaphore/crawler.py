@@ -0,0 +1,339 @@
+"""Concurrent crawler which builds an inventory graph of an organization
+
+Usage::
+    semaphore = Semaphore('token', pool_maxsize=16)
+    inventory = Crawler(semaphore).crawl('acme')
+    inventory.related('teams', team_id, 'projects')
+    inventory.team_secrets(team_id)
+
+The crawler walks organization -> projects -> teams and secrets of
+every project -> users and secrets of every team -> environment variables
+and configuration files of every secret. Requests run on a bounded
+thread pool and every object is fetched once, however many objects
+refer to it. With an `InventoryStore` (`semaphore.store`) fresh results
+of previous crawls are reused instead of requests.
+"""
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .utils import copy_context
+
+KINDS = ('orgs', 'projects', 'teams', 'users', 'secrets', 'env_vars',
+         'config_files')
+
+# Kind of the object every task belongs to and kind of its results
+TASKS = {
+    'org': (None, 'orgs'),
+    'org_projects': ('orgs', 'projects'),
+    'org_teams': ('orgs', 'teams'),
+    'org_secrets': ('orgs', 'secrets'),
+    'org_users': ('orgs', 'users'),
+    'project_teams': ('projects', 'teams'),
+    'project_secrets': ('projects', 'secrets'),
+    'team_users': ('teams', 'users'),
+    'team_secrets': ('teams', 'secrets'),
+    'secret_env_vars': ('secrets', 'env_vars'),
+    'secret_config_files': ('secrets', 'config_files')
+}
+
+
+def _key(obj) -> str:
+    try:
+        return obj['id']
+    except KeyError:
+        return obj['username']
+
+
+class Inventory:
+    """Graph of objects of an organization
+
+        Objects are decoded JSON (or models) by kind and id, users are
+        identified by username. Relations are undirected, so a project
+        links to its teams and every team links back to its projects.
+
+        Properties::
+            org: Username of the organization
+            nodes: A dictionary `{kind: {id: object}}`
+            errors: An array with `(task, exception)` of failed requests
+            requests: Number of made requests
+            stored: Number of results taken from a store instead of requests
+
+        Methods::
+            get(str, str): Returns an object by kind and id
+            related(str, str, str): Returns objects of a kind related to an object
+            team_projects(str): Projects a team can see
+            team_secrets(str): Secrets a team gets, directly or through projects
+            add(str, obj): Adds an object
+            link(str, str, str, str): Relates two objects
+    """
+    def __init__(self, org: str):
+        self.org = org
+        self.nodes = {kind: {} for kind in KINDS}
+        self.errors = []
+        self.requests = 0
+        self.stored = 0
+        self._edges = defaultdict(set)
+
+    def add(self, kind: str, obj) -> str:
+        key = _key(obj)
+        self.nodes[kind].setdefault(key, obj)
+        return key
+
+    def link(self, kind: str, key: str, other_kind: str, other_key: str):
+        self._edges[(kind, key)].add((other_kind, other_key))
+        self._edges[(other_kind, other_key)].add((kind, key))
+
+    def get(self, kind: str, key: str):
+        return self.nodes[kind].get(key)
+
+    def related(self, kind: str, key: str, related_kind: str) -> list:
+        return [
+            self.nodes[other_kind][other_key]
+            for other_kind, other_key in self._edges.get((kind, key), ())
+            if other_kind == related_kind and other_key in self.nodes[other_kind]
+        ]
+
+    def team_projects(self, team_id: str) -> list:
+        return self.related('teams', team_id, 'projects')
+
+    def team_secrets(self, team_id: str) -> list:
+        """Returns secrets attached to a team or to any of its projects"""
+        secrets = {_key(secret): secret
+                   for secret in self.related('teams', team_id, 'secrets')}
+        for project in self.team_projects(team_id):
+            for secret in self.related('projects', _key(project), 'secrets'):
+                secrets.setdefault(_key(secret), secret)
+        return list(secrets.values())
+
+    def __len__(self):
+        return sum(len(nodes) for nodes in self.nodes.values())
+
+    def __repr__(self):
+        counts = ', '.join(f'{kind}={len(self.nodes[kind])}' for kind in KINDS)
+        return f'<Inventory {self.org} {counts}>'
+
+
+class Crawler:
+    """Crawls an organization concurrently
+
+        Args::
+            semaphore(Semaphore): A client
+            max_workers(int): Maximum number of requests running at once,
+            defaults to the connection pool size of the client
+            users(bool): Fetch users of the organization and its teams
+            secret_contents(bool): Fetch environment variables and
+            configuration files of secrets
+            store(InventoryStore): Reuses its fresh results
+            and keeps new ones
+
+        Methods::
+            crawl(str): Returns an `Inventory` of an organization
+    """
+    def __init__(self, semaphore, max_workers: int=None, users: bool=True,
+                 secret_contents: bool=True, store=None):
+        self.semaphore = semaphore
+        self.max_workers = max_workers or semaphore.pool_maxsize
+        self.users = users
+        self.secret_contents = secret_contents
+        self.store = store
+
+    def crawl(self, org: str) -> Inventory:
+        """Fetches all objects of an organization and their relations
+
+            Args::
+                org(str): Username of an organization
+
+            Returns::
+                An `Inventory`, failed requests are listed in its `errors`
+        """
+        inventory = Inventory(org)
+        store = self.store
+        scheduled = set()
+        pending = {}
+        ready = deque()
+        context = copy_context()
+
+        def merge(task: str, key: str, result: list):
+            add = getattr(self, f'_add_{task}')
+            for child in add(inventory, key, result):
+                schedule(*child)
+
+        def schedule(task: str, key: str):
+            if (task, key) in scheduled:
+                return
+            scheduled.add((task, key))
+            parent = self._parent(inventory, task, key)
+            if store is not None:
+                result = store.get(org, task, key, parent)
+                if result is not None:
+                    inventory.stored += 1
+                    ready.append((task, key, self._decode(task, result)))
+                    return
+            fetch = getattr(self, f'_fetch_{task}')
+            future = executor.submit(context.copy().run, fetch, key)
+            pending[future] = (task, key, parent)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            schedule('org', org)
+            schedule('org_projects', org)
+            schedule('org_teams', org)
+            schedule('org_secrets', org)
+            if self.users:
+                schedule('org_users', org)
+
+            while pending or ready:
+                if not pending:
+                    # stored results are merged when nothing is downloading,
+                    # so newer copies of their objects are already known
+                    merge(*ready.popleft())
+                    continue
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task, key, parent = pending.pop(future)
+                    inventory.requests += 1
+                    try:
+                        result = future.result()
+                    except Exception as error:
+                        inventory.errors.append(((task, key), error))
+                        continue
+                    if store is not None:
+                        store.put(org, task, key, result, parent)
+                        kind = TASKS[task][1]
+                        for obj in result:
+                            inventory.nodes[kind].pop(_key(obj), None)
+                    merge(task, key, result)
+        if store is not None:
+            store.commit()
+        return inventory
+
+    def _parent(self, inventory: Inventory, task: str, key: str):
+        kind = TASKS[task][0]
+        if kind is None or kind == 'orgs':
+            return None
+        return inventory.get(kind, key)
+
+    def _decode(self, task: str, objects: list) -> list:
+        if not self.semaphore._options.get('models'):
+            return objects
+        from .models import MODELS
+
+        return MODELS[TASKS[task][1]].from_json(objects)
+
+    # requests, run on worker threads
+
+    def _list(self, method, key: str) -> list:
+        return [obj for obj in method(key, iterate=True)
+                if 'id' in obj or 'username' in obj]
+
+    def _fetch_org(self, org: str):
+        obj = self.semaphore.organization.by_name(org)
+        return [obj] if 'username' in obj else []
+
+    def _fetch_org_projects(self, org: str):
+        return self._list(self.semaphore.projects.list, org)
+
+    def _fetch_org_teams(self, org: str):
+        return self._list(self.semaphore.teams.all, org)
+
+    def _fetch_org_secrets(self, org: str):
+        return self._list(self.semaphore.secrets.all, org)
+
+    def _fetch_org_users(self, org: str):
+        return self._list(self.semaphore.organization.users, org)
+
+    def _fetch_project_teams(self, project_id: str):
+        return self._list(self.semaphore.teams.by_project, project_id)
+
+    def _fetch_project_secrets(self, project_id: str):
+        return self._list(self.semaphore.secrets.project, project_id)
+
+    def _fetch_team_users(self, team_id: str):
+        return self._list(self.semaphore.users.team_members, team_id)
+
+    def _fetch_team_secrets(self, team_id: str):
+        return self._list(self.semaphore.secrets.team, team_id)
+
+    def _fetch_secret_env_vars(self, secret_id: str):
+        return self._list(self.semaphore.environment.secrets, secret_id)
+
+    def _fetch_secret_config_files(self, secret_id: str):
+        return self._list(self.semaphore.config_files.secrets, secret_id)
+
+    # results, merged into the inventory on the calling thread,
+    # every method returns next tasks
+
+    def _add_org(self, inventory: Inventory, org: str, objects: list):
+        for obj in objects:
+            inventory.nodes['orgs'][org] = obj
+        return ()
+
+    def _add_children(self, inventory: Inventory, kind: str, key: str,
+                      child_kind: str, objects: list) -> list:
+        keys = []
+        for obj in objects:
+            child_key = inventory.add(child_kind, obj)
+            inventory.link(kind, key, child_kind, child_key)
+            keys.append(child_key)
+        return keys
+
+    def _team_tasks(self, team_ids: list) -> list:
+        tasks = [('team_secrets', team_id) for team_id in team_ids]
+        if self.users:
+            tasks += [('team_users', team_id) for team_id in team_ids]
+        return tasks
+
+    def _secret_tasks(self, secret_ids: list) -> list:
+        if not self.secret_contents:
+            return []
+        return [(task, secret_id) for secret_id in secret_ids
+                for task in ('secret_env_vars', 'secret_config_files')]
+
+    def _add_org_projects(self, inventory: Inventory, org: str, projects: list):
+        project_ids = self._add_children(inventory, 'orgs', org, 'projects', projects)
+        return [(task, project_id) for project_id in project_ids
+                for task in ('project_teams', 'project_secrets')]
+
+    def _add_org_teams(self, inventory: Inventory, org: str, teams: list):
+        return self._team_tasks(
+            self._add_children(inventory, 'orgs', org, 'teams', teams)
+        )
+
+    def _add_org_secrets(self, inventory: Inventory, org: str, secrets: list):
+        return self._secret_tasks(
+            self._add_children(inventory, 'orgs', org, 'secrets', secrets)
+        )
+
+    def _add_org_users(self, inventory: Inventory, org: str, users: list):
+        self._add_children(inventory, 'orgs', org, 'users', users)
+        return ()
+
+    def _add_project_teams(self, inventory: Inventory, project_id: str, teams: list):
+        return self._team_tasks(
+            self._add_children(inventory, 'projects', project_id, 'teams', teams)
+        )
+
+    def _add_project_secrets(self, inventory: Inventory, project_id: str,
+                             secrets: list):
+        return self._secret_tasks(
+            self._add_children(inventory, 'projects', project_id, 'secrets', secrets)
+        )
+
+    def _add_team_users(self, inventory: Inventory, team_id: str, users: list):
+        self._add_children(inventory, 'teams', team_id, 'users', users)
+        return ()
+
+    def _add_team_secrets(self, inventory: Inventory, team_id: str, secrets: list):
+        return self._secret_tasks(
+            self._add_children(inventory, 'teams', team_id, 'secrets', secrets)
+        )
+
+    def _add_secret_env_vars(self, inventory: Inventory, secret_id: str,
+                             env_vars: list):
+        self._add_children(inventory, 'secrets', secret_id, 'env_vars', env_vars)
+        return ()
+
+    def _add_secret_config_files(self, inventory: Inventory, secret_id: str,
+                                 config_files: list):
+        self._add_children(inventory, 'secrets', secret_id, 'config_files',
+                           config_files)
+        return ()
@@ -0,0 +1,242 @@
+"""Tools to investigate slow calls and client-side overhead
+
+Usage::
+    recorder = FlightRecorder(size=500, slow_threshold=2.0)
+    semaphore = Semaphore('token', recorder=recorder)
+    ...
+    recorder.dump('requests.jsonl')
+
+    with profile() as report:
+        semaphore.projects.list('acme')
+    print(report.format())
+"""
+import cProfile
+import json
+import os
+import pstats
+import sys
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from threading import Lock
+
+from .utils import open_output
+
+_FIELDS = ('time', 'method', 'endpoint', 'status_code', 'duration',
+           'response_bytes', 'retries', 'error')
+
+
+class FlightRecorder:
+    """Ring buffer with the last requests of a client
+
+        Args::
+            size(int): Number of kept requests
+            slow_threshold(float): Seconds after which a request is slow,
+            a slow request dumps the buffer, disabled by default
+            on_slow(callable): Receives the dump and the slow record,
+            by default the dump is written to stderr as JSON lines
+
+        Properties::
+            slow_calls: Number of requests above the threshold
+
+        Methods::
+            attach(Hooks): Records every request of a client
+            detach(Hooks): Stops recording
+            records: Returns recorded requests, the oldest first
+            dump(file): Writes recorded requests as JSON lines
+            clear: Drops recorded requests
+    """
+    def __init__(self, size: int=256, slow_threshold: float=None, on_slow=None):
+        self.slow_threshold = slow_threshold
+        self.on_slow = on_slow if on_slow is not None else self._write_slow
+        self.slow_calls = 0
+        self._records = deque(maxlen=size)
+        self._lock = Lock()
+
+    def attach(self, hooks):
+        hooks.on('after_response', self._record)
+        hooks.on('on_error', self._record)
+        return self
+
+    def detach(self, hooks):
+        hooks.off('after_response', self._record)
+        hooks.off('on_error', self._record)
+
+    def _record(self, event):
+        record = (
+            time.time(),
+            event.method,
+            event.template,
+            event.status_code,
+            event.duration,
+            event.response_bytes,
+            event.retries,
+            repr(event.error) if event.error is not None else None
+        )
+        slow = (self.slow_threshold is not None
+                and event.duration >= self.slow_threshold)
+        with self._lock:
+            self._records.append(record)
+            if slow:
+                self.slow_calls += 1
+        if slow:
+            self.on_slow(self.records(), dict(zip(_FIELDS, record)))
+
+    def records(self) -> list:
+        """Returns recorded requests as dictionaries, the oldest first"""
+        with self._lock:
+            records = list(self._records)
+        return [dict(zip(_FIELDS, record)) for record in records]
+
+    def dump(self, file=None):
+        """Writes recorded requests as JSON lines
+
+            Args::
+                file: A path or a text file object, stdout by default
+
+            Returns::
+                An array with recorded requests
+        """
+        records = self.records()
+        with open_output(file if file is not None else sys.stdout) as output:
+            for record in records:
+                output.write(json.dumps(record) + '\n')
+        return records
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    @staticmethod
+    def _write_slow(records: list, slow: dict):
+        sys.stderr.write(
+            f'semaphore: slow request {slow["method"]} {slow["endpoint"]} '
+            f'took {slow["duration"]:.3f}s, last {len(records)} requests:\n'
+        )
+        for record in records:
+            sys.stderr.write(json.dumps(record) + '\n')
+
+
+# Categories of client-side work, matched by parts of file names
+# (or names of built-in functions) and by exact function names,
+# the first matching category wins
+CATEGORIES = (
+    ('waiting', ('_thread.', 'time.sleep'), ('wait',)),
+    ('json decode', ('json/', '_json', 'orjson', 'ujson'),
+     ('json', 'loads', 'raw_decode')),
+    ('url building', ('urllib/parse',),
+     ('_resource_url', '_make_url', 'api_url', '_with_params', 'prepare_url',
+      'requote_uri', 'endpoint_template')),
+    ('header handling', ('email/', 'requests/structures', 'urllib3/_collections'),
+     ('parse_headers', '_read_headers', 'putheader', 'prepare_headers',
+      'parse_links', 'links', 'validators')),
+    ('network', ('socket', 'ssl', 'selectors', 'select.'), ()),
+    ('http library', ('requests/', 'urllib3/', 'http/', 'urllib/request',
+                      'aiohttp/'), ()),
+    ('client', ('semaphore/',), ()),
+)
+
+
+def categorize(filename: str, function: str='') -> str:
+    """Maps a function of a profile to a category of client-side work
+
+        Args::
+            filename(str): File of the function, `~` for built-ins
+            function(str): Name of the function
+
+        Returns::
+            Name of the category or `other`
+    """
+    location = function if filename == '~' else filename.replace(os.sep, '/')
+    for category, paths, functions in CATEGORIES:
+        if function in functions or any(path in location for path in paths):
+            return category
+    return 'other'
+
+
+class ProfileReport:
+    """Client-side CPU time and allocated memory by category
+
+        Properties::
+            wall: Seconds the profiled block took
+            cpu: Seconds by category, self time of functions,
+            `waiting` is time blocked on locks and sleeps
+            memory: Bytes allocated and still held by category,
+            empty if memory tracing was disabled
+            stats: `pstats.Stats` of the block
+
+        Methods::
+            format(int): Returns a text report
+    """
+    def __init__(self):
+        self.wall = 0.0
+        self.cpu = {}
+        self.memory = {}
+        self.stats = None
+
+    def format(self, top: int=10) -> str:
+        lines = [f'wall time: {self.wall:.4f}s', '', 'self time by category:']
+        total = sum(self.cpu.values()) or 1
+        for category, seconds in sorted(self.cpu.items(), key=lambda i: -i[1]):
+            lines.append(f'  {category:<16} {seconds:10.4f}s {seconds / total:6.1%}')
+        if self.memory:
+            lines += ['', 'memory by category:']
+            for category, size in sorted(self.memory.items(), key=lambda i: -i[1]):
+                lines.append(f'  {category:<16} {size / 1024:10.1f} KiB')
+        if self.stats is not None and top:
+            lines += ['', f'top {top} functions by self time:']
+            entries = sorted(self.stats.stats.items(), key=lambda i: -i[1][2])
+            for (filename, line, function), entry in entries[:top]:
+                lines.append(
+                    f'  {entry[2]:10.4f}s {entry[1]:8d} calls  '
+                    f'{function} ({os.path.basename(filename)}:{line})'
+                )
+        return '\n'.join(lines)
+
+    def __str__(self):
+        return self.format()
+
+
+@contextmanager
+def profile(memory: bool=True):
+    """Profiles client calls made within the block with cProfile
+    and tracemalloc, profiling only the calling thread
+
+        Args::
+            memory(bool): Also trace memory allocations, which slows
+            the block down noticeably
+
+        Returns::
+            A context manager which yields a `ProfileReport`,
+            the report is filled when the block exits
+    """
+    report = ProfileReport()
+    profiler = cProfile.Profile()
+    tracing_memory = memory and not tracemalloc.is_tracing()
+    if tracing_memory:
+        tracemalloc.start()
+    if memory:
+        before = tracemalloc.take_snapshot()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        yield report
+    finally:
+        profiler.disable()
+        report.wall = time.perf_counter() - started
+        if memory:
+            after = tracemalloc.take_snapshot()
+            if tracing_memory:
+                tracemalloc.stop()
+            for difference in after.compare_to(before, 'filename'):
+                if difference.size_diff > 0:
+                    category = categorize(difference.traceback[0].filename)
+                    report.memory[category] = (
+                        report.memory.get(category, 0) + difference.size_diff
+                    )
+
+        report.stats = pstats.Stats(profiler)
+        for (filename, _, function), entry in report.stats.stats.items():
+            category = categorize(filename, function)
+            report.cpu[category] = report.cpu.get(category, 0.0) + entry[2]
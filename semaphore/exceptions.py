@@ -0,0 +1,43 @@
+class SemaphoreError(Exception):
+    """Base class for errors of the client"""
+
+
+class RetryError(SemaphoreError):
+    """Raised when a request is still throttled or unavailable
+    after all retries
+
+        Args::
+            response: The last response of the request
+    """
+    def __init__(self, response):
+        self.response = response
+        self.status_code = response.status_code
+        super().__init__(
+            f'Request failed with {response.status_code} HTTP status code '
+            f'after all retries'
+        )
+
+
+class StatusError(SemaphoreError):
+    """Raised when a response has a status code which a method can't handle
+
+        Args::
+            status_code(int): An HTTP status code
+            url(str): Url of the request
+    """
+    def __init__(self, status_code: int, url: str):
+        self.status_code = status_code
+        self.url = url
+        super().__init__(f'Unexpected {status_code} HTTP status code of {url}')
+
+
+class SyncError(SemaphoreError):
+    """Raised when the API rejects a change of a synchronization
+
+        Args::
+            message(str): A description of the error
+            response: A decoded body of the response, if there is one
+    """
+    def __init__(self, message: str, response=None):
+        self.response = response
+        super().__init__(message)
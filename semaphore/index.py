@@ -0,0 +1,205 @@
+"""Index of names and ids of projects, teams and secrets
+
+Usage::
+    semaphore = Semaphore('token', index_ttl=300)
+    project_id = semaphore.index.id('acme', 'projects', 'api')
+    secret_id = semaphore.index.id('acme', 'secrets', 'deploy-keys')
+    semaphore.secrets.attach_to_project(project_id, secret_id)
+
+Names of an organization are loaded with one paginated list call on the
+first lookup and answered from dictionaries afterwards. Responses of
+list calls (also with `iterate` or `stream`), `create`, `update` and
+`delete` made through the client keep the index up to date, and a whole
+organization is loaded again once its names are older than `ttl`.
+"""
+import time
+from threading import Lock
+
+# Indexed kinds and names of resources which list them
+KINDS = {
+    'projects': ('projects', 'list'),
+    'teams': ('teams', 'all'),
+    'secrets': ('secrets', 'all')
+}
+
+
+def _is_object(result) -> bool:
+    return (hasattr(result, 'get') and not isinstance(result, (list, str))
+            and result.get('id') is not None and result.get('name') is not None)
+
+
+class _Names:
+    """Names and ids of one kind of objects of an organization"""
+
+    __slots__ = ('ids', 'names', 'updated_at', 'complete')
+
+    def __init__(self, complete: bool=False):
+        self.ids = {}
+        self.names = {}
+        self.updated_at = time.monotonic()
+        self.complete = complete
+
+    def add(self, object_id: str, name: str):
+        previous = self.names.get(object_id)
+        if previous is not None and self.ids.get(previous) == object_id:
+            del self.ids[previous]
+        self.ids[name] = object_id
+        self.names[object_id] = name
+
+    def remove(self, object_id: str):
+        name = self.names.pop(object_id, None)
+        if name is not None and self.ids.get(name) == object_id:
+            del self.ids[name]
+
+
+class NameIndex:
+    """Resolves names of projects, teams and secrets to ids and back
+
+        Args::
+            semaphore(Semaphore): A client used to load names
+            ttl(float): Seconds after which names of an organization
+            are loaded again
+
+        Properties::
+            loads: Number of list calls made by the index
+
+        Methods::
+            id(str, str, str): Returns an id by organization, kind and name
+            name(str, str, str): Returns a name by organization, kind and id
+            refresh(str, str): Loads names of a kind of an organization
+            invalidate(str, str): Forgets names of an organization or all
+            observe(str, str, obj): Updates the index from a response
+    """
+    def __init__(self, semaphore, ttl: float=300):
+        self.semaphore = semaphore
+        self.ttl = ttl
+        self.loads = 0
+        self._entries = {}
+        self._orgs = {}
+        self._lock = Lock()
+
+    def id(self, org: str, kind: str, name: str) -> str:
+        """Returns an id of an object by its name
+
+            Args::
+                org(str): Username of an organization
+                kind(str): `projects`, `teams` or `secrets`
+                name(str): A name of the object
+
+            Returns::
+                An id of the object
+
+            Raises::
+                KeyError: if the organization has no object with the name
+        """
+        entry = self._entry(org, kind)
+        if name not in entry.ids and not entry.complete:
+            entry = self.refresh(org, kind)
+        try:
+            return entry.ids[name]
+        except KeyError:
+            raise KeyError(f'{org} has no {kind} named "{name}"') from None
+
+    def name(self, org: str, kind: str, object_id: str) -> str:
+        """Returns a name of an object by its id, see `id`"""
+        entry = self._entry(org, kind)
+        if object_id not in entry.names and not entry.complete:
+            entry = self.refresh(org, kind)
+        try:
+            return entry.names[object_id]
+        except KeyError:
+            raise KeyError(f'{org} has no {kind} with id "{object_id}"') from None
+
+    def _entry(self, org: str, kind: str) -> _Names:
+        if kind not in KINDS:
+            raise ValueError(f'Unknown kind "{kind}", must be one of {tuple(KINDS)}')
+        entry = self._entries.get((org, kind))
+        if entry is None or time.monotonic() - entry.updated_at >= self.ttl:
+            entry = self.refresh(org, kind)
+        return entry
+
+    def refresh(self, org: str, kind: str) -> _Names:
+        """Loads all names of a kind of an organization with one list call"""
+        resource, method = KINDS[kind]
+        objects = getattr(getattr(self.semaphore, resource), method)(
+            org, iterate=True, fields=('id', 'name')
+        )
+        entry = _Names(complete=True)
+        for obj in objects:
+            if _is_object(obj):
+                entry.add(obj.get('id'), obj.get('name'))
+
+        with self._lock:
+            self.loads += 1
+            previous = self._entries.get((org, kind))
+            if previous is not None:
+                for object_id in previous.names:
+                    self._orgs.pop((kind, object_id), None)
+            for object_id in entry.names:
+                self._orgs[(kind, object_id)] = org
+            self._entries[(org, kind)] = entry
+        return entry
+
+    def invalidate(self, org: str=None, kind: str=None):
+        with self._lock:
+            for owner, entry_kind in list(self._entries):
+                if ((org is None or owner == org)
+                        and (kind is None or entry_kind == kind)):
+                    del self._entries[(owner, entry_kind)]
+            self._orgs = {
+                key: owner for key, owner in self._orgs.items()
+                if (org is not None and owner != org)
+                or (kind is not None and key[0] != kind)
+            }
+
+    def observe(self, method: str, resource: str, result):
+        """Updates the index from a successful response of the client
+
+            Args::
+                method(str): An HTTP method name
+                resource(str): An API resource, e.g. `orgs/acme/projects`
+                result: Decoded JSON or a status code of the response
+        """
+        if not resource:
+            return
+        parts = resource.split('/')
+        if len(parts) == 3 and parts[0] == 'orgs' and parts[2] in KINDS:
+            org, kind = parts[1], parts[2]
+            if method == 'GET' and isinstance(result, list):
+                self._add(org, kind, [obj for obj in result if _is_object(obj)])
+            elif method == 'POST' and _is_object(result):
+                self._add(org, kind, [result])
+        elif len(parts) == 2 and parts[0] in KINDS:
+            kind, object_id = parts
+            if method in ('GET', 'PATCH') and _is_object(result):
+                self._update(kind, object_id, result.get('name'))
+            elif method == 'DELETE' and isinstance(result, int) and result < 300:
+                self._remove(kind, object_id)
+
+    def _add(self, org: str, kind: str, objects: list):
+        if not objects:
+            return
+        with self._lock:
+            entry = self._entries.get((org, kind))
+            if entry is None:
+                entry = self._entries[(org, kind)] = _Names()
+            for obj in objects:
+                entry.add(obj.get('id'), obj.get('name'))
+                self._orgs[(kind, obj.get('id'))] = org
+
+    def _update(self, kind: str, object_id: str, name: str):
+        with self._lock:
+            org = self._orgs.get((kind, object_id))
+            entry = self._entries.get((org, kind))
+            if entry is not None:
+                entry.add(object_id, name)
+
+    def _remove(self, kind: str, object_id: str):
+        with self._lock:
+            org = self._orgs.pop((kind, object_id), None)
+            entry = self._entries.get((org, kind))
+            if entry is not None:
+                entry.remove(object_id)
+
+    def __repr__(self):
+        return f'<NameIndex {len(self._orgs)} names>'
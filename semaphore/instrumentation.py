@@ -0,0 +1,301 @@
+import re
+import time
+from bisect import bisect_left
+from collections import Counter
+from threading import Lock
+from urllib.parse import urlsplit
+
+# Names of path parameters which follow a collection in API urls
+_PARAMETERS = {
+    'orgs': '{username}',
+    'teams': '{team_id}',
+    'users': '{user_name}',
+    'projects': '{project_id}',
+    'secrets': '{secret_id}',
+    'env_vars': '{env_var_id}',
+    'config_files': '{config_file_id}'
+}
+_VERSION = re.compile(r'^v\d+$')
+
+EVENTS = ('before_request', 'after_response', 'on_error')
+
+
+def endpoint_template(url: str) -> str:
+    """Replaces identifiers in an API url with parameter names
+
+    Usage::
+        endpoint_template('https://api.semaphoreci.com/v2/teams/1/users/mike')
+        >>> 'teams/{team_id}/users/{user_name}'
+
+        Args::
+            url(str): A full url or a path of an API resource
+
+        Returns::
+            An endpoint template
+    """
+    segments = [segment for segment in urlsplit(url).path.split('/') if segment]
+    if segments and _VERSION.match(segments[0]):
+        segments = segments[1:]
+
+    template = []
+    collection = None
+    for segment in segments:
+        if collection is not None:
+            template.append(_PARAMETERS[collection])
+            collection = None
+        else:
+            template.append(segment)
+            collection = segment if segment in _PARAMETERS else None
+    return '/'.join(template)
+
+
+class RequestEvent:
+    """Information about a request passed to hooks
+
+        Args::
+            method(str): An HTTP method name
+            url(str): A full url of the request
+
+        Properties::
+            template: Endpoint template of the url, e.g. `teams/{team_id}`
+            started: `time.perf_counter()` when the request started
+            duration: Seconds taken by the request with all retries
+            status_code: An HTTP status code of the final response
+            response_bytes: Size of the response body
+            retries: Number of retries made
+            error: An exception raised by the request
+            context: A dictionary for hooks to keep their own data
+    """
+    __slots__ = ('method', 'url', '_template', 'started', 'duration',
+                 'status_code', 'response_bytes', 'retries', 'error', 'context')
+
+    def __init__(self, method: str, url: str):
+        self.method = method
+        self.url = url
+        self._template = None
+        self.started = time.perf_counter()
+        self.duration = None
+        self.status_code = None
+        self.response_bytes = None
+        self.retries = 0
+        self.error = None
+        self.context = {}
+
+    @property
+    def template(self) -> str:
+        if self._template is None:
+            self._template = endpoint_template(self.url)
+        return self._template
+
+    def finish(self, response=None, error: Exception=None):
+        self.duration = time.perf_counter() - self.started
+        self.error = error
+        if response is not None:
+            self.status_code = response.status_code
+            length = response.headers.get('Content-Length')
+            self.response_bytes = int(length) if length is not None else None
+
+    def __repr__(self):
+        return f'<RequestEvent {self.method} {self.template} {self.status_code}>'
+
+
+class Hooks:
+    """Registry of request listeners shared by all resources of a client
+
+        Events::
+            before_request: A request is about to be sent
+            after_response: A final response is received (after all retries)
+            on_error: A request raised an exception
+
+        Every listener receives a `RequestEvent`. When no listener is
+        attached requests don't create events at all.
+
+        Methods::
+            on(str, callable): Attaches a listener
+            off(str, callable): Detaches a listener
+            emit(str, RequestEvent): Calls listeners of an event
+    """
+    def __init__(self):
+        self._listeners = {event: [] for event in EVENTS}
+        self._active = False
+
+    def __bool__(self):
+        return self._active
+
+    def on(self, event: str, listener):
+        if event not in self._listeners:
+            raise ValueError(f'Unknown event "{event}", must be one of {EVENTS}')
+        self._listeners[event] = self._listeners[event] + [listener]
+        self._active = True
+        return listener
+
+    def off(self, event: str, listener):
+        self._listeners[event] = [
+            attached for attached in self._listeners[event]
+            if attached != listener
+        ]
+        self._active = any(self._listeners.values())
+
+    def emit(self, event: str, request_event: RequestEvent):
+        for listener in self._listeners[event]:
+            listener(request_event)
+
+
+class Histogram:
+    """Cumulative histogram with fixed bucket bounds
+
+        Args::
+            buckets(tuple): Upper bounds of buckets, sorted ascending
+
+        Properties::
+            count: Number of observations
+            sum: Sum of observations
+            counts: Number of observations in every bucket, the last
+            element counts values above the largest bound
+    """
+    LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+    SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+    def __init__(self, buckets: tuple=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def copy(self):
+        histogram = Histogram(self.buckets)
+        histogram.counts = list(self.counts)
+        histogram.count = self.count
+        histogram.sum = self.sum
+        return histogram
+
+    def cumulative(self):
+        """Returns `(upper bound, count)` pairs like Prometheus buckets"""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+    def quantile(self, q: float) -> float:
+        """Estimates a quantile as the upper bound of its bucket"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound
+        return float('inf')
+
+
+class EndpointStats:
+    """Statistics of one endpoint template and method"""
+
+    __slots__ = ('latency', 'response_bytes', 'statuses', 'retries', 'errors')
+
+    def __init__(self):
+        self.latency = Histogram(Histogram.LATENCY_BUCKETS)
+        self.response_bytes = Histogram(Histogram.SIZE_BUCKETS)
+        self.statuses = Counter()
+        self.retries = 0
+        self.errors = 0
+
+    @property
+    def requests(self) -> int:
+        return self.latency.count
+
+    def copy(self):
+        stats = EndpointStats()
+        stats.latency = self.latency.copy()
+        stats.response_bytes = self.response_bytes.copy()
+        stats.statuses = Counter(self.statuses)
+        stats.retries = self.retries
+        stats.errors = self.errors
+        return stats
+
+    def as_dict(self) -> dict:
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'statuses': dict(self.statuses),
+            'latency_sum': self.latency.sum,
+            'latency_p50': self.latency.quantile(0.5),
+            'latency_p95': self.latency.quantile(0.95),
+            'latency_p99': self.latency.quantile(0.99),
+            'response_bytes_sum': self.response_bytes.sum
+        }
+
+
+class EndpointMetrics:
+    """Latency, size, status and retry histograms by endpoint template
+
+    Usage::
+        metrics = EndpointMetrics().attach(semaphore.hooks)
+        metrics.snapshot()['GET teams/{team_id}']['latency_p95']
+
+        Properties::
+            in_flight: Number of requests which are being sent
+
+        Methods::
+            attach(Hooks): Starts collecting metrics of a client
+            detach(Hooks): Stops collecting metrics
+            stats: Returns copies of `EndpointStats` by `(method, template)`,
+            consistent with each other
+            snapshot: Returns metrics as a dictionary
+    """
+    def __init__(self):
+        self.in_flight = 0
+        self._stats = {}
+        self._lock = Lock()
+
+    def attach(self, hooks: Hooks):
+        hooks.on('before_request', self._start)
+        hooks.on('after_response', self._record)
+        hooks.on('on_error', self._record)
+        return self
+
+    def detach(self, hooks: Hooks):
+        hooks.off('before_request', self._start)
+        hooks.off('after_response', self._record)
+        hooks.off('on_error', self._record)
+
+    def _start(self, event: RequestEvent):
+        with self._lock:
+            self.in_flight += 1
+
+    def _record(self, event: RequestEvent):
+        key = (event.method, event.template)
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = EndpointStats()
+            stats.latency.observe(event.duration)
+            stats.retries += event.retries
+            if event.error is not None:
+                stats.errors += 1
+                stats.statuses['error'] += 1
+                return
+            stats.statuses[event.status_code] += 1
+            if event.status_code >= 400:
+                stats.errors += 1
+            if event.response_bytes is not None:
+                stats.response_bytes.observe(event.response_bytes)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {key: stats.copy() for key, stats in self._stats.items()}
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                f'{method} {template}': stats.as_dict()
+                for (method, template), stats in sorted(self._stats.items())
+            }
@@ -0,0 +1,820 @@
+"""Local stateful imitation of Semaphore API v2
+
+Usage::
+    with MockSemaphoreServer(latency=0.005, per_page=50) as server:
+        server.seed(projects=100, teams=10, users=20, secrets=10)
+        semaphore = Semaphore('token', base_url=server.url)
+        semaphore.projects.list(server.org, iterate=True)
+
+The server keeps organizations, teams, users, projects, secrets,
+environment variables and configuration files in memory, paginates
+list endpoints with `Link` headers, answers conditional requests
+with `304` and can inject latency, `429` and `5xx` errors.
+"""
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlsplit
+
+from .utils import ThreadingHTTPServer
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class NotFound(Exception):
+    pass
+
+
+class MockState:
+    """In-memory state of the mock API
+
+        Args::
+            api_url(str): Base url used in `url` fields of objects
+    """
+    def __init__(self, api_url: str=''):
+        self.api_url = api_url
+        self.lock = threading.RLock()
+        self.orgs = {}
+        self.users = {}
+        self.teams = {}
+        self.projects = {}
+        self.secrets = {}
+        self.env_vars = {}
+        self.config_files = {}
+        # relations, id -> set of ids
+        self.org_users = {}
+        self.team_users = {}
+        self.team_projects = {}
+        self.team_secrets = {}
+        self.project_secrets = {}
+        # owners, id -> organization username or secret id
+        self.owner = {}
+
+    @staticmethod
+    def new_id() -> str:
+        return str(uuid.uuid4())
+
+    def get(self, collection: dict, object_id: str) -> dict:
+        try:
+            return collection[object_id]
+        except KeyError:
+            raise NotFound(object_id)
+
+    def org(self, username: str) -> dict:
+        return self.get(self.orgs, username)
+
+    def add_org(self, username: str, name: str=None) -> dict:
+        org = {
+            'id': self.new_id(),
+            'username': username,
+            'name': name or username,
+            'url': f'{self.api_url}/orgs/{username}',
+            'created_at': _now(),
+            'updated_at': _now()
+        }
+        self.orgs[username] = org
+        self.org_users.setdefault(username, set())
+        return org
+
+    def add_user(self, org: str, username: str) -> dict:
+        self.org(org)
+        user = self.users.get(username) or {
+            'username': username,
+            'name': username.title(),
+            'created_at': _now(),
+            'updated_at': _now()
+        }
+        self.users[username] = user
+        self.org_users[org].add(username)
+        return user
+
+    def add_team(self, org: str, name: str, permission: str='read',
+                 description: str=None) -> dict:
+        self.org(org)
+        team_id = self.new_id()
+        team = {
+            'id': team_id,
+            'name': name,
+            'url': f'{self.api_url}/teams/{team_id}',
+            'permission': permission,
+            'description': description,
+            'created_at': _now(),
+            'updated_at': _now()
+        }
+        self.teams[team_id] = team
+        self.owner[team_id] = org
+        for relation in (self.team_users, self.team_projects, self.team_secrets):
+            relation[team_id] = set()
+        return team
+
+    def add_project(self, org: str, name: str) -> dict:
+        self.org(org)
+        project_id = self.new_id()
+        project = {
+            'id': project_id,
+            'name': name,
+            'url': f'{self.api_url}/projects/{project_id}',
+            'html_url': f'https://semaphoreci.com/{org}/{name}',
+            'created_at': _now(),
+            'updated_at': _now()
+        }
+        self.projects[project_id] = project
+        self.owner[project_id] = org
+        self.project_secrets[project_id] = set()
+        return project
+
+    def add_secret(self, org: str, name: str, description: str=None) -> dict:
+        self.org(org)
+        secret_id = self.new_id()
+        secret = {
+            'id': secret_id,
+            'name': name,
+            'url': f'{self.api_url}/secrets/{secret_id}',
+            'description': description,
+            'env_vars_count': 0,
+            'config_files_count': 0,
+            'created_at': _now(),
+            'updated_at': _now()
+        }
+        self.secrets[secret_id] = secret
+        self.owner[secret_id] = org
+        return secret
+
+    def add_env_var(self, secret_id: str, name: str, content: str,
+                    encrypted: bool=False) -> dict:
+        secret = self.get(self.secrets, secret_id)
+        env_var_id = self.new_id()
+        env_var = {
+            'id': env_var_id,
+            'name': name,
+            'url': f'{self.api_url}/env_vars/{env_var_id}',
+            'encrypted': encrypted,
+            'content': None if encrypted else content,
+            'shared': False,
+            'created_at': _now(),
+            'updated_at': _now()
+        }
+        self.env_vars[env_var_id] = env_var
+        self.owner[env_var_id] = secret_id
+        secret['env_vars_count'] += 1
+        return env_var
+
+    def add_config_file(self, secret_id: str, path: str, content: str,
+                        encrypted: bool=False) -> dict:
+        secret = self.get(self.secrets, secret_id)
+        config_file_id = self.new_id()
+        config_file = {
+            'id': config_file_id,
+            'path': path,
+            'url': f'{self.api_url}/config_files/{config_file_id}',
+            'encrypted': encrypted,
+            'content': None if encrypted else content,
+            'shared': False,
+            'created_at': _now(),
+            'updated_at': _now()
+        }
+        self.config_files[config_file_id] = config_file
+        self.owner[config_file_id] = secret_id
+        secret['config_files_count'] += 1
+        return config_file
+
+    def owned_by(self, collection: dict, owner: str) -> list:
+        return [
+            obj for key, obj in collection.items()
+            if self.owner.get(key) == owner
+        ]
+
+    def delete(self, collection: dict, object_id: str):
+        self.get(collection, object_id)
+        del collection[object_id]
+        owner = self.owner.pop(object_id, None)
+        for name in ('env_vars', 'config_files'):
+            if collection is getattr(self, name) and owner in self.secrets:
+                self.secrets[owner][f'{name}_count'] -= 1
+        for relation in (self.team_users, self.team_projects, self.team_secrets,
+                         self.project_secrets):
+            relation.pop(object_id, None)
+            for related in relation.values():
+                related.discard(object_id)
+
+    @staticmethod
+    def update(obj: dict, data: dict, fields: tuple) -> dict:
+        for field in fields:
+            if data.get(field) is not None:
+                obj[field] = data[field]
+        obj['updated_at'] = _now()
+        return obj
+
+
+class _Router:
+    """Maps methods and path templates to handlers"""
+
+    def __init__(self):
+        self.routes = []
+
+    def route(self, method: str, template: str):
+        pattern = re.compile(
+            '^' + re.sub(r'{(\w+)}', r'(?P<\1>[^/]+)', template) + '$'
+        )
+
+        def register(handler):
+            self.routes.append((method, pattern, handler))
+            return handler
+        return register
+
+    def match(self, method: str, path: str):
+        allowed = False
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(path)
+            if match:
+                if route_method == method:
+                    return handler, match.groupdict()
+                allowed = True
+        return None, allowed
+
+
+router = _Router()
+route = router.route
+
+
+@route('GET', '')
+def _root(state, data):
+    return {
+        name: f'{state.api_url}/{name}'
+        for name in ('orgs', 'teams', 'projects', 'secrets', 'env_vars',
+                     'config_files')
+    }
+
+
+@route('GET', '/orgs')
+def _orgs(state, data):
+    return list(state.orgs.values())
+
+
+@route('GET', '/orgs/{org}')
+def _org(state, data, org):
+    return state.org(org)
+
+
+@route('GET', '/orgs/{org}/projects')
+def _org_projects(state, data, org):
+    state.org(org)
+    return state.owned_by(state.projects, org)
+
+
+@route('POST', '/orgs/{org}/projects')
+def _create_project(state, data, org):
+    return 201, state.add_project(org, data['name'])
+
+
+@route('GET', '/orgs/{org}/secrets')
+def _org_secrets(state, data, org):
+    state.org(org)
+    return state.owned_by(state.secrets, org)
+
+
+@route('POST', '/orgs/{org}/secrets')
+def _create_secret(state, data, org):
+    return 201, state.add_secret(org, data['name'], data.get('description'))
+
+
+@route('GET', '/orgs/{org}/users')
+def _org_users(state, data, org):
+    state.org(org)
+    return [state.users[username] for username in sorted(state.org_users[org])]
+
+
+@route('GET', '/orgs/{org}/teams')
+def _org_teams(state, data, org):
+    state.org(org)
+    return state.owned_by(state.teams, org)
+
+
+@route('POST', '/orgs/{org}/teams')
+def _create_team(state, data, org):
+    return 201, state.add_team(
+        org,
+        data['name'],
+        data.get('permission', 'read'),
+        data.get('description')
+    )
+
+
+@route('GET', '/teams/{team_id}')
+def _team(state, data, team_id):
+    return state.get(state.teams, team_id)
+
+
+@route('PATCH', '/teams/{team_id}')
+def _update_team(state, data, team_id):
+    team = state.get(state.teams, team_id)
+    return state.update(team, data, ('name', 'permission', 'description'))
+
+
+@route('DELETE', '/teams/{team_id}')
+def _delete_team(state, data, team_id):
+    state.delete(state.teams, team_id)
+    return 204, None
+
+
+@route('GET', '/teams/{team_id}/users')
+def _team_users(state, data, team_id):
+    state.get(state.teams, team_id)
+    return [state.users[name] for name in sorted(state.team_users[team_id])]
+
+
+@route('POST', '/teams/{team_id}/users/{username}')
+def _add_team_user(state, data, team_id, username):
+    state.get(state.teams, team_id)
+    state.add_user(state.owner[team_id], username)
+    state.team_users[team_id].add(username)
+    return 204, None
+
+
+@route('DELETE', '/teams/{team_id}/users/{username}')
+def _remove_team_user(state, data, team_id, username):
+    state.get(state.teams, team_id)
+    state.team_users[team_id].discard(username)
+    return 204, None
+
+
+@route('GET', '/teams/{team_id}/projects')
+def _team_projects(state, data, team_id):
+    state.get(state.teams, team_id)
+    return [state.projects[key] for key in sorted(state.team_projects[team_id])]
+
+
+@route('POST', '/teams/{team_id}/projects/{project_id}')
+def _add_team_project(state, data, team_id, project_id):
+    state.get(state.teams, team_id)
+    state.get(state.projects, project_id)
+    state.team_projects[team_id].add(project_id)
+    return 204, None
+
+
+@route('DELETE', '/teams/{team_id}/projects/{project_id}')
+def _remove_team_project(state, data, team_id, project_id):
+    state.get(state.teams, team_id)
+    state.team_projects[team_id].discard(project_id)
+    return 204, None
+
+
+@route('GET', '/teams/{team_id}/secrets')
+def _team_secrets(state, data, team_id):
+    state.get(state.teams, team_id)
+    return [state.secrets[key] for key in sorted(state.team_secrets[team_id])]
+
+
+@route('DELETE', '/teams/{team_id}/secrets/{secret_id}')
+def _remove_team_secret(state, data, team_id, secret_id):
+    state.get(state.teams, team_id)
+    state.team_secrets[team_id].discard(secret_id)
+    return 204, None
+
+
+@route('GET', '/projects/{project_id}/teams')
+def _project_teams(state, data, project_id):
+    state.get(state.projects, project_id)
+    return [
+        team for team_id, team in state.teams.items()
+        if project_id in state.team_projects[team_id]
+    ]
+
+
+@route('GET', '/projects/{project_id}/users')
+def _project_users(state, data, project_id):
+    state.get(state.projects, project_id)
+    usernames = set()
+    for team_id, projects in state.team_projects.items():
+        if project_id in projects:
+            usernames |= state.team_users[team_id]
+    return [state.users[username] for username in sorted(usernames)]
+
+
+@route('GET', '/projects/{project_id}/secrets')
+def _project_secrets(state, data, project_id):
+    state.get(state.projects, project_id)
+    return [
+        state.secrets[key] for key in sorted(state.project_secrets[project_id])
+    ]
+
+
+@route('POST', '/projects/{project_id}/secrets/{secret_id}')
+def _attach_secret(state, data, project_id, secret_id):
+    state.get(state.projects, project_id)
+    secret = state.get(state.secrets, secret_id)
+    state.project_secrets[project_id].add(secret_id)
+    return secret
+
+
+@route('DELETE', '/projects/{project_id}/secrets/{secret_id}')
+def _detach_secret(state, data, project_id, secret_id):
+    state.get(state.projects, project_id)
+    state.project_secrets[project_id].discard(secret_id)
+    return 204, None
+
+
+def _project_secret_objects(state, collection, project_id):
+    state.get(state.projects, project_id)
+    secrets = state.project_secrets[project_id]
+    return [obj for key, obj in collection.items() if state.owner[key] in secrets]
+
+
+@route('GET', '/projects/{project_id}/env_vars')
+def _project_env_vars(state, data, project_id):
+    return _project_secret_objects(state, state.env_vars, project_id)
+
+
+@route('GET', '/projects/{project_id}/config_files')
+def _project_config_files(state, data, project_id):
+    return _project_secret_objects(state, state.config_files, project_id)
+
+
+@route('GET', '/secrets/{secret_id}')
+def _secret(state, data, secret_id):
+    return state.get(state.secrets, secret_id)
+
+
+@route('PATCH', '/secrets/{secret_id}')
+def _update_secret(state, data, secret_id):
+    secret = state.get(state.secrets, secret_id)
+    return state.update(secret, data, ('name', 'description'))
+
+
+@route('DELETE', '/secrets/{secret_id}')
+def _delete_secret(state, data, secret_id):
+    state.delete(state.secrets, secret_id)
+    for collection in (state.env_vars, state.config_files):
+        for key in [key for key in collection if state.owner[key] == secret_id]:
+            state.delete(collection, key)
+    return 204, None
+
+
+@route('GET', '/secrets/{secret_id}/teams')
+def _secret_teams(state, data, secret_id):
+    state.get(state.secrets, secret_id)
+    return [
+        team for team_id, team in state.teams.items()
+        if secret_id in state.team_secrets[team_id]
+    ]
+
+
+@route('GET', '/secrets/{secret_id}/projects')
+def _secret_projects(state, data, secret_id):
+    state.get(state.secrets, secret_id)
+    return [
+        project for project_id, project in state.projects.items()
+        if secret_id in state.project_secrets[project_id]
+    ]
+
+
+@route('GET', '/secrets/{secret_id}/env_vars')
+def _secret_env_vars(state, data, secret_id):
+    state.get(state.secrets, secret_id)
+    return state.owned_by(state.env_vars, secret_id)
+
+
+@route('POST', '/secrets/{secret_id}/env_vars')
+def _create_env_var(state, data, secret_id):
+    return 201, state.add_env_var(
+        secret_id,
+        data['name'],
+        data.get('content'),
+        bool(data.get('encrypted'))
+    )
+
+
+@route('GET', '/secrets/{secret_id}/config_files')
+def _secret_config_files(state, data, secret_id):
+    state.get(state.secrets, secret_id)
+    return state.owned_by(state.config_files, secret_id)
+
+
+@route('POST', '/secrets/{secret_id}/config_files')
+def _create_config_file(state, data, secret_id):
+    return 201, state.add_config_file(
+        secret_id,
+        data['path'],
+        data.get('content'),
+        bool(data.get('encrypted'))
+    )
+
+
+def _item_routes(name: str, fields: tuple):
+    collection_name = name
+
+    @route('GET', f'/{name}/{{object_id}}')
+    def _get(state, data, object_id):
+        return state.get(getattr(state, collection_name), object_id)
+
+    @route('PATCH', f'/{name}/{{object_id}}')
+    def _update(state, data, object_id):
+        obj = state.get(getattr(state, collection_name), object_id)
+        state.update(obj, data, fields)
+        if obj.get('encrypted'):
+            obj['content'] = None
+        return obj
+
+    @route('DELETE', f'/{name}/{{object_id}}')
+    def _delete(state, data, object_id):
+        state.delete(getattr(state, collection_name), object_id)
+        return 204, None
+
+
+_item_routes('env_vars', ('name', 'content'))
+_item_routes('config_files', ('path', 'content'))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'MockSemaphore/2'
+    # headers and body go out in one packet, without delayed ACK stalls
+    wbufsize = -1
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle()
+
+    def do_HEAD(self):
+        self._handle(send_body=False)
+
+    def do_POST(self):
+        self._handle()
+
+    def do_PATCH(self):
+        self._handle()
+
+    def do_DELETE(self):
+        self._handle()
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length)) or {}
+        except ValueError:
+            return {}
+
+    def _send(self, status: int, body=None, headers: dict=None,
+              send_body: bool=True):
+        content = b'' if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if send_body and content:
+            self.wfile.write(content)
+
+    def _handle(self, send_body: bool=True):
+        mock = self.server.mock
+        mock.count_request()
+        data = self._read_json()
+        parts = urlsplit(self.path)
+        path = re.sub('/{2,}', '/', parts.path).rstrip('/')
+        if path.startswith('/v2'):
+            path = path[len('/v2'):]
+        method = 'GET' if self.command == 'HEAD' else self.command
+
+        if mock.latency:
+            time.sleep(mock.delay())
+
+        if mock.api_token and (
+            self.headers.get('Authorization') != f'Token {mock.api_token}'
+        ):
+            return self._send(401, {'message': 'Unauthorized'}, send_body=send_body)
+
+        error = mock.next_error()
+        if error is not None:
+            status, retry_after = error
+            headers = {}
+            if retry_after is not None:
+                headers['Retry-After'] = str(retry_after)
+            return self._send(status, {'message': 'Injected error'}, headers,
+                              send_body)
+
+        handler, params = router.match(method, path)
+        if handler is None:
+            status = 405 if params else 404
+            message = 'Method Not Allowed' if params else 'Not Found'
+            return self._send(status, {'message': message}, send_body=send_body)
+
+        try:
+            with mock.state.lock:
+                result = handler(mock.state, data, **params)
+        except NotFound:
+            return self._send(404, {'message': 'Not Found'}, send_body=send_body)
+        except KeyError as key:
+            return self._send(422, {'message': f'Missing field {key}'},
+                              send_body=send_body)
+
+        status, body = result if isinstance(result, tuple) else (200, result)
+        headers = {}
+        if method == 'GET' and isinstance(body, list):
+            body, headers = self._paginate(body, parts.query)
+        if method == 'GET' and status == 200:
+            etag = '"' + hashlib.md5(json.dumps(body).encode()).hexdigest() + '"'
+            headers['ETag'] = etag
+            if self.headers.get('If-None-Match') == etag:
+                return self._send(304, headers=headers, send_body=False)
+        self._send(status, body, headers, send_body)
+
+    def _paginate(self, items: list, query: str):
+        per_page = self.server.mock.per_page
+        if not per_page or len(items) <= per_page:
+            return items, {}
+        page = max(1, int(parse_qs(query).get('page', ['1'])[0]))
+        pages = (len(items) + per_page - 1) // per_page
+        headers = {'Total': str(len(items)), 'Per-Page': str(per_page)}
+        if page < pages:
+            path = urlsplit(self.path).path
+            headers['Link'] = (
+                f'<{self.server.mock.url}{path}?page={page + 1}>; rel="next"'
+            )
+        start = (page - 1) * per_page
+        return items[start:start + per_page], headers
+
+
+class MockSemaphoreServer:
+    """Local HTTP server which imitates Semaphore API v2
+
+        Args::
+            host(str): Interface to listen on
+            port(int): Port to listen on, `0` picks a free one
+            latency(float or tuple): Delay of every response in seconds,
+            or `(min, max)` range of a random delay
+            per_page(int): Page size of list endpoints, `0` disables pagination
+            error_rate(float): Share of requests answered with an error
+            error_statuses(tuple): Statuses of random errors
+            api_token(str): If passed, requests with another token get 401
+
+        Properties::
+            url: Base url, pass it to a client as `base_url`
+            state: `MockState` with all objects
+            requests: Number of handled requests
+
+        Methods::
+            start: Starts serving in a background thread
+            stop: Stops the server
+            seed: Fills the state with a generated organization
+            fail_next(int, int, int): Answers next requests with an error
+            count_request: Counts a handled request, thread-safe
+    """
+    def __init__(self, host: str='127.0.0.1', port: int=0, latency=0,
+                 per_page: int=30, error_rate: float=0,
+                 error_statuses: tuple=(429, 503), api_token: str=None):
+        self.latency = latency
+        self.per_page = per_page
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.api_token = api_token
+        self.requests = 0
+        self.org = None
+        self._errors = deque()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.mock = self
+        self._thread = None
+        self.state = MockState(self.url + '/v2')
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def delay(self) -> float:
+        if isinstance(self.latency, (tuple, list)):
+            return random.uniform(*self.latency)
+        return self.latency
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def fail_next(self, status: int=503, count: int=1, retry_after: int=None):
+        """Answers next `count` requests with an error
+
+            Args::
+                status(int): An HTTP status code of the error
+                count(int): Number of failed requests
+                retry_after(int): Value of the `Retry-After` header
+        """
+        with self._lock:
+            self._errors.extend([(status, retry_after)] * count)
+
+    def next_error(self):
+        with self._lock:
+            if self._errors:
+                return self._errors.popleft()
+        if self.error_rate and random.random() < self.error_rate:
+            return random.choice(self.error_statuses), 0
+        return None
+
+    def seed(self, org: str='acme', projects: int=10, teams: int=3,
+             users: int=5, secrets: int=3, env_vars: int=2,
+             config_files: int=1) -> str:
+        """Generates an organization with related objects
+
+        Every team gets all users, a share of projects and a secret,
+        every project gets one of the secrets attached.
+
+            Args::
+                org(str): Username of the organization
+                projects(int): Number of projects
+                teams(int): Number of teams
+                users(int): Number of users
+                secrets(int): Number of secrets
+                env_vars(int): Environment variables in every secret
+                config_files(int): Configuration files in every secret
+
+            Returns::
+                Username of the organization
+        """
+        state = self.state
+        with state.lock:
+            state.add_org(org)
+            usernames = [state.add_user(org, f'user-{i}')['username']
+                         for i in range(users)]
+            secret_ids = []
+            for i in range(secrets):
+                secret_id = state.add_secret(org, f'secret-{i}')['id']
+                secret_ids.append(secret_id)
+                for j in range(env_vars):
+                    state.add_env_var(secret_id, f'VAR_{j}', f'value-{j}')
+                for j in range(config_files):
+                    state.add_config_file(secret_id, f'/home/runner/file-{j}',
+                                          f'content-{j}')
+            project_ids = []
+            for i in range(projects):
+                project_id = state.add_project(org, f'project-{i}')['id']
+                project_ids.append(project_id)
+                if secret_ids:
+                    state.project_secrets[project_id].add(
+                        secret_ids[i % len(secret_ids)]
+                    )
+            for i in range(teams):
+                team_id = state.add_team(org, f'team-{i}')['id']
+                state.team_users[team_id].update(usernames)
+                state.team_projects[team_id].update(project_ids[i::teams])
+                if secret_ids:
+                    state.team_secrets[team_id].add(secret_ids[i % len(secret_ids)])
+        self.org = org
+        return org
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={'poll_interval': 0.05},
+            name='mock-semaphore-server',
+            daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+if __name__ == '__main__':  # pragma: no cover
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Mock Semaphore API server')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0)
+    parser.add_argument('--per-page', type=int, default=30)
+    parser.add_argument('--error-rate', type=float, default=0)
+    parser.add_argument('--projects', type=int, default=100)
+    arguments = parser.parse_args()
+
+    server = MockSemaphoreServer(
+        port=arguments.port,
+        latency=arguments.latency,
+        per_page=arguments.per_page,
+        error_rate=arguments.error_rate
+    )
+    server.seed(projects=arguments.projects)
+    print(f'Serving mock Semaphore API on {server.url}')
+    server._server.serve_forever()
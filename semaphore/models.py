@@ -0,0 +1,266 @@
+"""Compact typed models of Semaphore API objects
+
+Usage::
+    semaphore = Semaphore('token', models=True)
+    project = semaphore.projects.list('acme')[0]
+    project.name, project['id'], project.as_dict()
+
+Models keep fields in `__slots__` instead of a dictionary per object,
+`id`, `url` and other frequently repeated strings are interned, so
+the same id referenced by many objects is stored once. Nested objects
+are kept as decoded JSON until their attribute is read.
+"""
+import sys
+
+from .instrumentation import endpoint_template
+
+_MISSING = object()
+
+
+class Record:
+    """Read-only attribute view of a nested JSON object,
+    created on first access of a nested field
+
+        Args::
+            data(dict): A decoded JSON object
+    """
+    __slots__ = ('_data',)
+
+    def __init__(self, data: dict):
+        self._data = data
+
+    def __getattr__(self, name):
+        try:
+            return _wrap(self._data[name])
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def as_dict(self) -> dict:
+        return self._data
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return self._data == other._data
+        return self._data == other
+
+    def __repr__(self):
+        return f'<Record {self._data!r}>'
+
+
+def _wrap(value):
+    if isinstance(value, dict):
+        return Record(value)
+    if isinstance(value, list) and value and isinstance(value[0], dict):
+        return [Record(item) for item in value]
+    return value
+
+
+class Model:
+    """Base class of API objects
+
+    Known fields are stored in slots, unknown ones in a dictionary,
+    which isn't created if an object has no unknown fields.
+    Models can be read like dictionaries, so code written for
+    decoded JSON keeps working. Slots of fields missing in the JSON
+    stay empty: they aren't `in` the model and `get` returns
+    the default, but their attributes read as `None`.
+
+        Constants::
+            FIELDS: Names of known fields
+            INTERNED: Fields whose string values are interned
+
+        Methods::
+            from_json(dict or list): Makes a model or an array of models
+            as_dict: Returns the object as a dictionary
+            get(str): Returns a field or a default value
+    """
+    __slots__ = ('_extra',)
+
+    FIELDS = ()
+    INTERNED = ('id', 'url')
+
+    def __init__(self, data: dict):
+        setattr_ = object.__setattr__
+        interned = self.INTERNED
+        present = 0
+        for field in self.FIELDS:
+            value = data.get(field, _MISSING)
+            if value is _MISSING:
+                continue
+            if value.__class__ is str and field in interned:
+                value = sys.intern(value)
+            setattr_(self, field, value)
+            present += 1
+        if len(data) > present:
+            extra = {key: value for key, value in data.items()
+                     if key not in self.FIELDS}
+        else:
+            extra = None
+        setattr_(self, '_extra', extra)
+
+    @classmethod
+    def from_json(cls, data):
+        if isinstance(data, list):
+            return [cls(item) if isinstance(item, dict) else item for item in data]
+        if isinstance(data, dict):
+            return cls(data)
+        return data
+
+    def __getattr__(self, name):
+        # called only for unknown fields and empty slots
+        if name in self.FIELDS:
+            return None
+        extra = object.__getattribute__(self, '_extra')
+        if extra is not None and name in extra:
+            return _wrap(extra[name])
+        raise AttributeError(f'{self.__class__.__name__} has no field "{name}"')
+
+    def _field(self, key):
+        """Returns a field like a dictionary item, `_MISSING` if it isn't set"""
+        if key in self.FIELDS:
+            try:
+                return object.__getattribute__(self, key)
+            except AttributeError:
+                return _MISSING
+        if self._extra is not None:
+            return self._extra.get(key, _MISSING)
+        return _MISSING
+
+    def __getitem__(self, key):
+        value = self._field(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self._field(key) is not _MISSING
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self.as_dict().keys()
+
+    def as_dict(self) -> dict:
+        data = {}
+        for field in self.FIELDS:
+            value = self._field(field)
+            if value is not _MISSING:
+                data[field] = value
+        if self._extra is not None:
+            data.update(self._extra)
+        return data
+
+    def __eq__(self, other):
+        if isinstance(other, Model):
+            return self.as_dict() == other.as_dict()
+        if isinstance(other, dict):
+            return self.as_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return self.as_dict()
+
+    def __setstate__(self, state):
+        self.__init__(state)
+
+    def __repr__(self):
+        key = self.get('id') or self.get('username') or self.get('name')
+        return f'<{self.__class__.__name__} {key}>'
+
+
+class Organization(Model):
+    __slots__ = ('id', 'username', 'name', 'url', 'created_at', 'updated_at')
+    FIELDS = __slots__
+    INTERNED = ('id', 'username', 'url')
+
+
+class Team(Model):
+    __slots__ = ('id', 'name', 'url', 'permission', 'description',
+                 'created_at', 'updated_at')
+    FIELDS = __slots__
+    INTERNED = ('id', 'url', 'permission')
+
+
+class User(Model):
+    __slots__ = ('username', 'name', 'created_at', 'updated_at')
+    FIELDS = __slots__
+    INTERNED = ('username',)
+
+
+class Project(Model):
+    __slots__ = ('id', 'name', 'url', 'html_url', 'created_at', 'updated_at')
+    FIELDS = __slots__
+
+
+class Secret(Model):
+    __slots__ = ('id', 'name', 'url', 'description', 'env_vars_count',
+                 'config_files_count', 'created_at', 'updated_at')
+    FIELDS = __slots__
+
+
+class EnvVar(Model):
+    __slots__ = ('id', 'name', 'url', 'encrypted', 'content', 'shared',
+                 'created_at', 'updated_at')
+    FIELDS = __slots__
+
+
+class ConfigFile(Model):
+    __slots__ = ('id', 'path', 'url', 'encrypted', 'content', 'shared',
+                 'created_at', 'updated_at')
+    FIELDS = __slots__
+
+
+# Model of objects returned by an endpoint, by its last collection
+MODELS = {
+    'orgs': Organization,
+    'teams': Team,
+    'users': User,
+    'projects': Project,
+    'secrets': Secret,
+    'env_vars': EnvVar,
+    'config_files': ConfigFile
+}
+
+
+def model_for(resource: str):
+    """Finds a model of objects returned by an API resource
+
+        Args::
+            resource(str): A resource or a full url, e.g. `orgs/acme/projects`
+
+        Returns::
+            A model class or `None` for unknown resources
+    """
+    for segment in reversed(endpoint_template(resource or '').split('/')):
+        if segment in MODELS:
+            return MODELS[segment]
+    return None
+
+
+def decode(resource: str, data):
+    """Converts decoded JSON of a resource to models
+
+        Args::
+            resource(str): A resource or a full url
+            data: Decoded JSON
+
+        Returns::
+            A model, an array of models or `data` itself
+            if the resource has no model
+    """
+    model = model_for(resource)
+    if model is None:
+        return data
+    return model.from_json(data)
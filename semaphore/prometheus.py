@@ -0,0 +1,215 @@
+"""Prometheus text exposition of client metrics
+
+Usage::
+    semaphore = Semaphore('token', metrics=True, cache=ResponseCache())
+    print(render(semaphore))
+    # or serve them for a scraper on http://127.0.0.1:9464/metrics
+    server = start_http_server(semaphore, port=9464)
+
+Metrics of requests come from `Semaphore(metrics=True)`, cache metrics
+from a `ResponseCache` and concurrency gauges from the adaptive limiter,
+metrics of disabled features are omitted.
+"""
+import threading
+from http.server import BaseHTTPRequestHandler
+
+from .utils import ThreadingHTTPServer
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+PREFIX = 'semaphore_client'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(**labels) -> str:
+    if not labels:
+        return ''
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return '{' + pairs + '}'
+
+
+def _number(value) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Family:
+    """Lines of one metric with its HELP and TYPE comments"""
+
+    def __init__(self, name: str, kind: str, help_text: str):
+        self.name = f'{PREFIX}_{name}'
+        self.lines = [
+            f'# HELP {self.name} {help_text}',
+            f'# TYPE {self.name} {kind}'
+        ]
+
+    def add(self, value, suffix: str='', **labels):
+        self.lines.append(f'{self.name}{suffix}{_labels(**labels)} {_number(value)}')
+
+    def histogram(self, histogram, **labels):
+        for bound, count in histogram.cumulative():
+            self.add(count, '_bucket', **labels, le=_number(bound))
+        self.add(histogram.sum, '_sum', **labels)
+        self.add(histogram.count, '_count', **labels)
+
+
+def _request_families(metrics) -> list:
+    requests = _Family('requests_total', 'counter',
+                       'Requests by method, endpoint template and status')
+    errors = _Family('errors_total', 'counter',
+                     'Requests which failed or returned 4xx/5xx')
+    retries = _Family('retries_total', 'counter',
+                      'Retries of throttled requests')
+    latency = _Family('request_duration_seconds', 'histogram',
+                      'Duration of requests with all retries')
+    sizes = _Family('response_size_bytes', 'histogram',
+                    'Size of response bodies')
+    in_flight = _Family('requests_in_flight', 'gauge',
+                        'Requests which are being sent')
+
+    # copies taken under the lock of the metrics, so histograms
+    # of concurrent requests aren't rendered half-updated
+    for (method, template), stats in sorted(metrics.stats().items()):
+        labels = {'method': method, 'endpoint': template}
+        for status, count in sorted(stats.statuses.items(), key=str):
+            requests.add(count, **labels, status=status)
+        errors.add(stats.errors, **labels)
+        retries.add(stats.retries, **labels)
+        latency.histogram(stats.latency, **labels)
+        if stats.response_bytes.count:
+            sizes.histogram(stats.response_bytes, **labels)
+    in_flight.add(metrics.in_flight)
+    return [requests, errors, retries, latency, sizes, in_flight]
+
+
+def _cache_families(cache) -> list:
+    hits = _Family('cache_hits_total', 'counter',
+                   'Responses served from the cache without a request')
+    revalidations = _Family('cache_revalidations_total', 'counter',
+                            'Cached responses revalidated with 304')
+    misses = _Family('cache_misses_total', 'counter',
+                     'Responses downloaded in full')
+    ratio = _Family('cache_hit_ratio', 'gauge',
+                    'Share of GET requests answered without a new body')
+    size = _Family('cache_entries', 'gauge', 'Number of cached responses')
+
+    hits.add(cache.hits)
+    revalidations.add(cache.revalidations)
+    misses.add(cache.misses)
+    total = cache.hits + cache.revalidations + cache.misses
+    ratio.add((cache.hits + cache.revalidations) / total if total else 0.0)
+    size.add(len(cache))
+    return [hits, revalidations, misses, ratio, size]
+
+
+def _limiter_families(limiter) -> list:
+    limit = _Family('concurrency_limit', 'gauge',
+                    'Allowed requests in flight of the adaptive limiter')
+    in_flight = _Family('limiter_in_flight', 'gauge',
+                        'Requests holding a slot of the adaptive limiter')
+    limit.add(limiter.limit)
+    in_flight.add(limiter.in_flight)
+    return [limit, in_flight]
+
+
+def render(semaphore) -> str:
+    """Renders metrics of a client in Prometheus text format
+
+        Args::
+            semaphore(Semaphore): A client
+
+        Returns::
+            Text of the metrics
+    """
+    families = []
+    if semaphore.metrics is not None:
+        families.extend(_request_families(semaphore.metrics))
+    if semaphore._cache is not None:
+        families.extend(_cache_families(semaphore._cache))
+    if semaphore._limiter is not None:
+        families.extend(_limiter_families(semaphore._limiter))
+    return ''.join(line + '\n' for family in families for line in family.lines)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split('?')[0] not in ('/', '/metrics'):
+            self.send_error(404)
+            return
+        body = render(self.server.semaphore).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MetricsServer:
+    """HTTP endpoint which serves client metrics to a Prometheus scraper
+
+        Args::
+            semaphore(Semaphore): A client
+            host(str): Interface to listen on
+            port(int): Port to listen on, `0` picks a free one
+
+        Properties::
+            url: Url of the metrics endpoint
+
+        Methods::
+            start: Starts serving in a background thread
+            stop: Stops the server
+    """
+    def __init__(self, semaphore, host: str='127.0.0.1', port: int=9464):
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.semaphore = semaphore
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/metrics'
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={'poll_interval': 0.05},
+            name='semaphore-metrics-server',
+            daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+def start_http_server(semaphore, port: int=9464, host: str='127.0.0.1'):
+    """Serves metrics of a client on `http://host:port/metrics`
+    from a daemon thread
+
+        Args::
+            semaphore(Semaphore): A client
+            port(int): Port to listen on
+            host(str): Interface to listen on
+
+        Returns::
+            A started `MetricsServer`
+    """
+    return MetricsServer(semaphore, host, port).start()
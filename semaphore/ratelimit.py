@@ -0,0 +1,101 @@
+import random
+import time
+from threading import Lock
+
+
+class RateLimiter:
+    """Token bucket rate limiter shared by all resources of a client
+
+        Args::
+            rate(float): Allowed requests per second
+            burst(int): Maximum number of requests made at once
+            after an idle period, defaults to `rate`
+
+        Methods::
+            acquire: Blocks until a request is allowed
+    """
+    def __init__(self, rate: float, burst: int=None):
+        if rate <= 0:
+            raise ValueError('rate must be a positive number')
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = Lock()
+
+    def _reserve(self) -> float:
+        """Takes a token and returns how long to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst,
+                self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+
+class RetryPolicy:
+    """Retries throttled requests with jittered exponential backoff
+
+        A `Retry-After` header of a response takes precedence over backoff.
+
+        Args::
+            max_retries(int): Maximum number of retries of a request
+            backoff_factor(float): Base delay in seconds, doubled every retry
+            max_backoff(float): Upper bound of a delay
+            statuses(tuple): HTTP status codes which are retried
+
+        Methods::
+            should_retry(int): Checks if a status code is retried
+            delay(int, str): Returns seconds to wait before a retry
+    """
+    def __init__(self, max_retries: int=3, backoff_factor: float=0.5,
+                 max_backoff: float=30, statuses: tuple=(429, 503)):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.statuses = statuses
+
+    def should_retry(self, status_code: int) -> bool:
+        return status_code in self.statuses
+
+    def delay(self, attempt: int, retry_after: str=None) -> float:
+        """Returns delay before a retry
+
+            Args::
+                attempt(int): Number of already made retries
+                retry_after(str): Value of the `Retry-After` header
+
+            Returns::
+                Seconds to wait
+        """
+        if retry_after:
+            seconds = self._parse_retry_after(retry_after)
+            if seconds is not None:
+                return min(seconds, self.max_backoff)
+
+        backoff = min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+        return random.uniform(0, backoff)
+
+    @staticmethod
+    def _parse_retry_after(value: str):
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        from email.utils import parsedate_to_datetime
+
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, date.timestamp() - time.time())
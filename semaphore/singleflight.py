@@ -0,0 +1,80 @@
+from copy import deepcopy
+from threading import Event, Lock
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent identical calls into one
+
+        While a call with some key is in flight, every other caller
+        with the same key waits for it and receives the same result
+        (or the same exception) instead of making its own call.
+        When a result is shared, every caller gets its own copy,
+        so changing it doesn't affect the other callers.
+
+        Args::
+            copy(callable): Copies a shared result, `None` returns
+            the same object to all callers
+
+        Methods::
+            do(key, callable): Runs the callable once for all concurrent
+            callers with the same key
+            in_flight: Number of calls in flight
+    """
+    def __init__(self, copy=deepcopy):
+        self._copy = copy
+        self._calls = {}
+        self._lock = Lock()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def do(self, key, func, *args, **kwargs):
+        """Runs `func(*args, **kwargs)` or joins an identical call in flight
+
+            Args::
+                key: A hashable identity of the call
+                func: A callable
+
+            Returns::
+                A result of the call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return self._shared(call.result)
+
+        try:
+            call.result = func(*args, **kwargs)
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                shared = call.waiters > 0
+            call.done.set()
+        # the original result is only read once it's shared
+        return self._shared(call.result) if shared else call.result
+
+    def _shared(self, result):
+        return result if self._copy is None else self._copy(result)
@@ -0,0 +1,283 @@
+"""SQLite store of crawled organizations
+
+Usage::
+    store = InventoryStore('inventory.db', max_age=3600)
+    inventory = Crawler(semaphore, store=store).crawl('acme')
+    # later, without any request
+    inventory = store.inventory('acme')
+
+Every result of a crawler request (e.g. teams of a project) is kept
+with its fetch time and a fingerprint of the object it belongs to.
+A later crawl reuses results which are younger than `max_age` and whose
+object hasn't changed, so only stale or changed parts of an organization
+are downloaded again. Contents of environment variables and configuration
+files are never written to disk, only their metadata.
+"""
+import hashlib
+import sqlite3
+import time
+from threading import Lock
+
+from .codec import get_codec
+from .crawler import TASKS, Inventory
+from .models import MODELS
+
+# Kinds whose `content` isn't stored
+METADATA_ONLY = ('env_vars', 'config_files')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    org TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (org, kind, key)
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    org TEXT NOT NULL,
+    task TEXT NOT NULL,
+    key TEXT NOT NULL,
+    version TEXT,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (org, task, key)
+);
+CREATE TABLE IF NOT EXISTS members (
+    org TEXT NOT NULL,
+    task TEXT NOT NULL,
+    key TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    member TEXT NOT NULL,
+    PRIMARY KEY (org, task, key, position)
+);
+"""
+
+
+def _as_dict(obj) -> dict:
+    return obj.as_dict() if hasattr(obj, 'as_dict') else obj
+
+
+def _object_key(kind: str, obj) -> str:
+    return obj['username'] if kind in ('orgs', 'users') else obj['id']
+
+
+def fingerprint(obj) -> str:
+    """Returns a digest of an object which changes with any of its fields"""
+    data = _as_dict(obj)
+    text = ''.join(f'{key}={data[key]!r};' for key in sorted(data))
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+class InventoryStore:
+    """Inventories of organizations persisted in a SQLite database
+
+        Args::
+            path(str): A database file, `:memory:` keeps it in memory
+            max_age(float): Seconds during which stored results
+            are used without a request
+            codec(str or Codec): JSON codec of stored objects
+
+        Methods::
+            get(str, str, str, obj): Returns fresh objects of a crawler task
+            put(str, str, str, list, obj): Stores objects of a crawler task,
+            objects it no longer lists are removed with their results
+            commit: Writes stored results to disk
+            inventory(str): Builds an `Inventory` from stored results only
+            fetched_at(str): Returns when the oldest result of an org was fetched
+            orgs: Returns stored organizations
+            clear(str): Removes an organization, or everything
+            close: Closes the database
+    """
+    def __init__(self, path: str, max_age: float=3600, codec=None):
+        self.path = path
+        self.max_age = max_age
+        self._codec = get_codec(codec)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+        self._lock = Lock()
+
+    def get(self, org: str, task: str, key: str, parent=None):
+        """Returns stored objects of a crawler task
+
+            Args::
+                org(str): Username of an organization
+                task(str): A crawler task, e.g. `project_teams`
+                key(str): Id of the object the task belongs to
+                parent: That object, `None` for tasks of an organization
+
+            Returns::
+                An array of objects or `None` if the result is missing,
+                older than `max_age` or the object has changed since
+        """
+        version = None if parent is None else fingerprint(parent)
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT version, fetched_at FROM tasks '
+                'WHERE org = ? AND task = ? AND key = ?',
+                (org, task, key)
+            ).fetchone()
+            if row is None or row[0] != version:
+                return None
+            if time.time() - row[1] >= self.max_age:
+                return None
+            return self._members(org, task, key)
+
+    def put(self, org: str, task: str, key: str, objects: list, parent=None):
+        """Replaces stored objects of a crawler task, see `get`"""
+        version = None if parent is None else fingerprint(parent)
+        kind = TASKS[task][1]
+        dumps = self._codec.dumps
+        rows = []
+        members = []
+        for position, obj in enumerate(objects):
+            data = _as_dict(obj)
+            if kind in METADATA_ONLY:
+                data = {name: value for name, value in data.items()
+                        if name != 'content'}
+            member = _object_key(kind, data)
+            rows.append((org, kind, member, dumps(data)))
+            members.append((org, task, key, position, member))
+
+        with self._lock:
+            connection = self._connection
+            previous = self._member_keys(org, task, key)
+            connection.executemany(
+                'INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?)', rows
+            )
+            connection.execute(
+                'DELETE FROM members WHERE org = ? AND task = ? AND key = ?',
+                (org, task, key)
+            )
+            connection.executemany(
+                'INSERT INTO members VALUES (?, ?, ?, ?, ?)', members
+            )
+            connection.execute(
+                'INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?)',
+                (org, task, key, version, time.time())
+            )
+            self._prune(org, kind, previous.difference(
+                member for *_, member in members
+            ))
+
+    def _member_keys(self, org: str, task: str, key: str) -> set:
+        rows = self._connection.execute(
+            'SELECT member FROM members WHERE org = ? AND task = ? AND key = ?',
+            (org, task, key)
+        )
+        return {member for member, in rows}
+
+    def _prune(self, org: str, kind: str, keys: set):
+        """Removes objects which are no longer listed by any stored result
+        together with results of their tasks, e.g. environment variables
+        of a deleted secret"""
+        if not keys:
+            return
+        connection = self._connection
+        lists = tuple(task for task, (_, child) in TASKS.items() if child == kind)
+        children = [task for task, (parent, _) in TASKS.items() if parent == kind]
+        placeholders = ', '.join('?' * len(lists))
+        for key in keys:
+            listed = connection.execute(
+                f'SELECT 1 FROM members WHERE org = ? AND member = ? '
+                f'AND task IN ({placeholders}) LIMIT 1',
+                (org, key) + lists
+            ).fetchone()
+            if listed is not None:
+                continue
+            connection.execute(
+                'DELETE FROM objects WHERE org = ? AND kind = ? AND key = ?',
+                (org, kind, key)
+            )
+            for task in children:
+                orphans = self._member_keys(org, task, key)
+                for table in ('members', 'tasks'):
+                    connection.execute(
+                        f'DELETE FROM {table} WHERE org = ? AND task = ? AND key = ?',
+                        (org, task, key)
+                    )
+                self._prune(org, TASKS[task][1], orphans)
+
+    def commit(self):
+        with self._lock:
+            self._connection.commit()
+
+    def _members(self, org: str, task: str, key: str) -> list:
+        kind = TASKS[task][1]
+        loads = self._codec.loads
+        rows = self._connection.execute(
+            'SELECT objects.data FROM members JOIN objects '
+            'ON objects.org = members.org AND objects.kind = ? '
+            'AND objects.key = members.member '
+            'WHERE members.org = ? AND members.task = ? AND members.key = ? '
+            'ORDER BY members.position',
+            (kind, org, task, key)
+        )
+        return [loads(data) for data, in rows]
+
+    def inventory(self, org: str, models: bool=False) -> Inventory:
+        """Builds an inventory of an organization without any request,
+        however old stored results are
+
+            Args::
+                org(str): Username of an organization
+                models(bool): Return `semaphore.models` instead of dictionaries
+
+            Returns::
+                An `Inventory`, empty if the organization isn't stored
+        """
+        inventory = Inventory(org)
+        with self._lock:
+            tasks = self._connection.execute(
+                'SELECT task, key FROM tasks WHERE org = ?', (org,)
+            ).fetchall()
+            results = [(task, key, self._members(org, task, key))
+                       for task, key in tasks]
+
+        for task, key, objects in results:
+            parent_kind, kind = TASKS[task]
+            if models:
+                objects = MODELS[kind].from_json(objects)
+            for obj in objects:
+                member = _object_key(kind, obj)
+                inventory.nodes[kind].setdefault(member, obj)
+                if parent_kind is not None:
+                    inventory.link(parent_kind, key, kind, member)
+        return inventory
+
+    def fetched_at(self, org: str) -> float:
+        """Returns `time.time()` of the oldest stored result of an org,
+        `None` if nothing is stored"""
+        with self._lock:
+            return self._connection.execute(
+                'SELECT MIN(fetched_at) FROM tasks WHERE org = ?', (org,)
+            ).fetchone()[0]
+
+    def orgs(self) -> list:
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT DISTINCT org FROM tasks ORDER BY org'
+            )
+            return [org for org, in rows]
+
+    def clear(self, org: str=None):
+        with self._lock, self._connection:
+            for table in ('objects', 'tasks', 'members'):
+                if org is None:
+                    self._connection.execute(f'DELETE FROM {table}')
+                else:
+                    self._connection.execute(
+                        f'DELETE FROM {table} WHERE org = ?', (org,)
+                    )
+
+    def close(self):
+        with self._lock:
+            self._connection.commit()
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __repr__(self):
+        return f'<InventoryStore {self.path}>'
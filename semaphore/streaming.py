@@ -0,0 +1,121 @@
+"""Incremental decoding of JSON arrays
+
+Elements of an array are decoded as soon as their text is received,
+so a huge list response is processed with memory bounded by the largest
+element plus one chunk, instead of several times the whole body.
+
+Usage::
+    decoder = ArrayDecoder()
+    for chunk in response.iter_content(65536):
+        for item in decoder.feed(chunk):
+            process(item)
+    for item in decoder.close():
+        process(item)
+"""
+import codecs
+import json
+
+CHUNK_SIZE = 65536
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',]'
+
+# states of the decoder
+_START, _VALUE_OR_END, _VALUE, _COMMA_OR_END, _DONE, _WHOLE = range(6)
+
+
+class ArrayDecoder:
+    """Push decoder which yields elements of a top level JSON array
+
+        A body which isn't an array is decoded as a whole on `close`
+        and returned as a single element, like pages with one object.
+        Elements are parsed with the standard `json` module, which is
+        the only one able to decode a prefix of a document.
+
+        Methods::
+            feed(bytes): Adds a chunk, returns completely received elements
+            close: Finishes decoding, returns the remaining elements
+
+        Raises::
+            ValueError: if the body isn't valid JSON
+    """
+    def __init__(self):
+        self._text = ''
+        self._state = _START
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._scan = json.JSONDecoder().raw_decode
+
+    def feed(self, chunk: bytes) -> list:
+        self._text += self._utf8.decode(chunk)
+        return self._parse(final=False)
+
+    def close(self) -> list:
+        self._text += self._utf8.decode(b'', final=True)
+        items = self._parse(final=True)
+        if self._state == _WHOLE:
+            self._state = _DONE
+            return [json.loads(self._text)]
+        if self._state != _DONE:
+            raise ValueError('Incomplete JSON array')
+        return items
+
+    def _parse(self, final: bool) -> list:
+        text = self._text
+        length = len(text)
+        pos = 0
+        items = []
+        state = self._state
+        while state not in (_DONE, _WHOLE):
+            while pos < length and text[pos] in _WHITESPACE:
+                pos += 1
+            if pos == length:
+                break
+            char = text[pos]
+            if state == _START:
+                if char == '[':
+                    state = _VALUE_OR_END
+                    pos += 1
+                else:
+                    state = _WHOLE
+                continue
+            if state == _COMMA_OR_END or (state == _VALUE_OR_END and char == ']'):
+                if char == ']':
+                    state = _DONE
+                elif char == ',':
+                    state = _VALUE
+                else:
+                    raise ValueError(f'Expecting "," or "]" at {pos}: {char!r}')
+                pos += 1
+                continue
+            try:
+                item, end = self._scan(text, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                break
+            if (not final and not isinstance(item, (dict, list, str))
+                    and (end == length or text[end] not in _DELIMITERS)):
+                # a number may continue in the next chunk, e.g. `2.` of `2.5`
+                break
+            items.append(item)
+            pos = end
+            state = _COMMA_OR_END
+
+        self._state = state
+        if state != _WHOLE:
+            self._text = text[pos:]
+        return items
+
+
+def iter_array(chunks):
+    """Yields elements of a JSON array from an iterable of `bytes` chunks
+
+        Args::
+            chunks: An iterable of `bytes`, e.g. `response.iter_content()`
+
+        Returns::
+            A generator of decoded elements
+    """
+    decoder = ArrayDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.close()
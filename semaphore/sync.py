@@ -0,0 +1,511 @@
+"""Declarative synchronization of secrets
+
+Usage::
+    report = semaphore.sync_env_vars(secret_id, {'TOKEN': 'abc', 'DEBUG': '1'})
+    report.changed  # created, updated and deleted variables
+    report.failed   # changes rejected by the API
+
+    report = semaphore.sync_config_files(secret_id, 'config/', '/home/runner')
+
+Current state is fetched once, compared with the desired state and only
+the difference is sent, concurrently. A sync which changes nothing costs
+a single GET. Configuration files, and encrypted variables whose content
+the API doesn't return, are compared by SHA-256 of their content with
+a local manifest of uploaded values, so an unchanged directory costs
+no request at all.
+"""
+import hashlib
+import json
+import os
+import posixpath
+import tempfile
+
+from .batch import run_batch
+from .exceptions import SyncError
+from .streaming import CHUNK_SIZE
+
+CREATE, UPDATE, DELETE, UNCHANGED = 'create', 'update', 'delete', 'unchanged'
+
+# Hashes of pushed encrypted variables of all secrets, readable only by the user
+ENV_VARS_MANIFEST = os.path.join('~', '.semaphore', 'env-vars.json')
+
+
+class SyncItem:
+    """Planned or applied change of one object
+
+        Args::
+            name(str): A name of the object
+            action(str): `create`, `update`, `delete` or `unchanged`
+            id(str): An id of the existing object
+
+        Properties::
+            content: A desired content of created and updated objects
+            source: A local file of created and updated objects
+            result: A response of the applied change
+            error(Exception): Why the change failed
+            ok: `True` unless the change failed
+    """
+    __slots__ = ('name', 'action', 'id', 'content', 'source', 'result', 'error')
+
+    def __init__(self, name: str, action: str, id: str=None, content: str=None,
+                 source: str=None):
+        self.name = name
+        self.action = action
+        self.id = id
+        self.content = content
+        self.source = source
+        self.result = None
+        self.error = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        status = 'ok' if self.ok else f'error={self.error!r}'
+        return f'<SyncItem {self.action} {self.name} {status}>'
+
+
+class SyncReport:
+    """Outcome of a synchronization, one item per object
+
+        Properties::
+            items: An array of `SyncItem`
+            changed: Items which were created, updated or deleted
+            failed: Items whose change failed
+            ok: `True` if no change failed
+
+        Methods::
+            counts: Returns number of items by action
+    """
+    def __init__(self, items: list):
+        self.items = items
+
+    @property
+    def changed(self) -> list:
+        return [item for item in self.items if item.action != UNCHANGED]
+
+    @property
+    def failed(self) -> list:
+        return [item for item in self.items if not item.ok]
+
+    @property
+    def ok(self) -> bool:
+        return all(item.ok for item in self.items)
+
+    def counts(self) -> dict:
+        counts = dict.fromkeys((CREATE, UPDATE, DELETE, UNCHANGED), 0)
+        for item in self.items:
+            counts[item.action] += 1
+        return counts
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __repr__(self):
+        counts = ', '.join(f'{action}={count}'
+                           for action, count in self.counts().items())
+        return f'<SyncReport {counts} failed={len(self.failed)}>'
+
+
+def _content(value) -> str:
+    return value if isinstance(value, str) else str(value)
+
+
+def plan_env_vars(current: list, desired: dict, delete: bool=True,
+                  update_encrypted: bool=True, pushed: dict=None) -> list:
+    """Computes the smallest set of changes from current to desired variables
+
+        Args::
+            current: Environment variables of a secret returned by the API
+            desired(dict): Contents of variables by name
+            delete(bool): Delete variables which aren't desired
+            update_encrypted(bool): Update desired encrypted variables
+            missing in `pushed`, the API doesn't return their content,
+            so they can't be compared
+            pushed(dict): Names and hashes of encrypted variables pushed
+            before, see `Manifest.files`
+
+        Returns::
+            An array of `SyncItem`, sorted by name
+    """
+    pushed = pushed or {}
+    existing = {}
+    items = []
+    for env_var in current:
+        name = env_var.get('name')
+        if name in existing:
+            # a duplicate name can't be desired twice
+            if delete:
+                items.append(SyncItem(name, DELETE, env_var.get('id')))
+            continue
+        existing[name] = env_var
+
+    for name, value in desired.items():
+        content = _content(value)
+        env_var = existing.get(name)
+        if env_var is None:
+            items.append(SyncItem(name, CREATE, content=content))
+        elif env_var.get('encrypted') and env_var.get('content') is None:
+            entry = pushed.get(env_var.get('id'))
+            if entry is not None:
+                changed = entry != {'name': name, 'sha256': _hash_content(content)}
+            else:
+                changed = update_encrypted
+            action = UPDATE if changed else UNCHANGED
+            items.append(SyncItem(name, action, env_var.get('id'), content))
+        elif env_var.get('content') != content:
+            items.append(SyncItem(name, UPDATE, env_var.get('id'), content))
+        else:
+            items.append(SyncItem(name, UNCHANGED, env_var.get('id')))
+
+    if delete:
+        items.extend(SyncItem(name, DELETE, env_var.get('id'))
+                     for name, env_var in existing.items() if name not in desired)
+    items.sort(key=lambda item: (item.name, item.action))
+    return items
+
+
+def _check(item: SyncItem, result):
+    """Stores a response of a change or an error if the API rejected it"""
+    item.result = result
+    if item.action == DELETE:
+        if not isinstance(result, int) or result >= 300:
+            item.error = SyncError(
+                f'Deleting "{item.name}" failed with {result} HTTP status code'
+            )
+        return
+    if not hasattr(result, 'get') or result.get('id') is None:
+        message = result.get('message') if hasattr(result, 'get') else None
+        item.error = SyncError(
+            f'Can not {item.action} "{item.name}": {message or result!r}', result
+        )
+    elif item.action == CREATE:
+        item.id = result.get('id')
+
+
+def apply(items: list, calls: list, max_workers: int):
+    """Runs changes concurrently and records their outcome in the items"""
+    for item, outcome in zip(items, run_batch(calls, max_workers)):
+        if outcome.ok:
+            _check(item, outcome.value)
+        else:
+            item.error = outcome.error
+
+
+def sync_env_vars(semaphore, secret_id: str, desired: dict, encrypted: bool=True,
+                  delete: bool=True, update_encrypted: bool=True,
+                  max_workers: int=None, manifest=None) -> SyncReport:
+    """Makes environment variables of a secret equal to `desired`
+
+        Args::
+            semaphore(Semaphore): A client
+            secret_id(str): ID of a secret
+            desired(dict): Contents of variables by name, values
+            which aren't strings are converted with `str`
+            encrypted(bool): Encrypt created variables
+            delete(bool): Delete variables which aren't desired
+            update_encrypted(bool): Rewrite desired encrypted variables
+            whose content can't be compared, because they aren't
+            in the manifest, this costs a PATCH per variable on the first
+            sync with a new manifest
+            max_workers(int): Maximum number of changes sent at once,
+            defaults to the connection pool size
+            manifest(str or Manifest): Names and hashes of pushed encrypted
+            variables, which are compared with them instead of being
+            rewritten, `~/.semaphore/env-vars.json` by default
+
+        Returns::
+            A `SyncReport`
+
+        Raises::
+            SyncError: if variables of the secret can't be fetched
+    """
+    environment = semaphore.environment
+    current = list(environment.secrets(secret_id, iterate=True))
+    if any(not hasattr(env_var, 'get') or env_var.get('id') is None
+           for env_var in current):
+        raise SyncError(f'Can not fetch variables of secret "{secret_id}"', current)
+
+    if manifest is None:
+        manifest = os.path.expanduser(ENV_VARS_MANIFEST)
+    if not isinstance(manifest, Manifest):
+        manifest = Manifest(manifest, field='name')
+    # forget variables which were removed, or are no longer encrypted
+    pushed = manifest.files(secret_id)
+    manifest.reset(secret_id, {
+        env_var.get('id'): pushed[env_var.get('id')] for env_var in current
+        if env_var.get('encrypted') and env_var.get('id') in pushed
+    })
+
+    items = plan_env_vars(current, desired, delete, update_encrypted,
+                          manifest.files(secret_id))
+    calls = []
+    for item in items:
+        if item.action == CREATE:
+            calls.append((environment.create, secret_id, item.name, item.content,
+                          encrypted))
+        elif item.action == UPDATE:
+            calls.append((environment.update, item.id, item.name, item.content))
+        elif item.action == DELETE:
+            calls.append((environment.delete, item.id))
+
+    changed = [item for item in items if item.action != UNCHANGED]
+    if changed:
+        apply(changed, calls, max_workers or semaphore.pool_maxsize)
+
+    encrypted_ids = {env_var.get('id') for env_var in current
+                     if env_var.get('encrypted')}
+    for item in changed:
+        if not item.ok or item.action == DELETE:
+            manifest.remove(secret_id, item.id)
+        elif item.id in encrypted_ids or (item.action == CREATE and encrypted):
+            manifest.set(secret_id, item.id, item.name, _hash_content(item.content))
+    manifest.save()
+    return SyncReport(items)
+
+
+MANIFEST = '.semaphore-manifest.json'
+
+
+def hash_file(path: str, chunk_size: int=CHUNK_SIZE) -> str:
+    """Returns SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _hash_content(content) -> str:
+    if content is None:
+        return None
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class Manifest:
+    """Paths and hashes of uploaded configuration files, kept in a JSON file
+
+        Args::
+            path(str): A manifest file, created on first `save`,
+            `None` keeps the manifest in memory
+            field(str): A key of names of objects, `name` for manifests
+            of environment variables
+
+        Methods::
+            files(str): Returns `{config_file_id: {'path', 'sha256'}}` of a secret
+            set(str, str, str, str): Records an uploaded file
+            remove(str, str): Forgets a file
+            reset(str, dict): Replaces all files of a secret
+            forget(str): Forgets all files of a secret
+            save: Writes the manifest atomically
+    """
+    def __init__(self, path: str=None, field: str='path'):
+        self.path = path
+        self.field = field
+        self._secrets = {}
+        if path is not None:
+            try:
+                with open(path) as file:
+                    self._secrets = json.load(file)
+            except FileNotFoundError:
+                pass
+
+    def __contains__(self, secret_id: str) -> bool:
+        return secret_id in self._secrets
+
+    def files(self, secret_id: str) -> dict:
+        return self._secrets.get(secret_id, {})
+
+    def set(self, secret_id: str, config_file_id: str, path: str, sha256: str):
+        self._secrets.setdefault(secret_id, {})[config_file_id] = {
+            self.field: path,
+            'sha256': sha256
+        }
+
+    def remove(self, secret_id: str, config_file_id: str):
+        self._secrets.get(secret_id, {}).pop(config_file_id, None)
+
+    def reset(self, secret_id: str, files: dict):
+        self._secrets[secret_id] = dict(files)
+
+    def forget(self, secret_id: str):
+        self._secrets.pop(secret_id, None)
+
+    def save(self):
+        if self.path is None:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w') as file:
+                json.dump(self._secrets, file, indent=2, sort_keys=True)
+            os.replace(temporary, self.path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def __repr__(self):
+        return f'<Manifest {self.path}>'
+
+
+def local_files(directory: str, remote_dir: str, exclude: tuple=()) -> dict:
+    """Maps remote paths of configuration files to files of a directory
+
+        Args::
+            directory(str): A local directory, walked recursively
+            remote_dir(str): A directory of the files in jobs
+            exclude(tuple): Absolute paths of skipped files
+
+        Returns::
+            A dictionary `{remote path: local path}`
+    """
+    excluded = {os.path.abspath(path) for path in exclude}
+    files = {}
+    for root, directories, names in os.walk(directory):
+        directories.sort()
+        for name in sorted(names):
+            local = os.path.join(root, name)
+            if os.path.abspath(local) in excluded:
+                continue
+            relative = os.path.relpath(local, directory).replace(os.sep, '/')
+            files[posixpath.join(remote_dir, relative)] = local
+    return files
+
+
+def plan_config_files(local: dict, hashes: dict, uploaded: dict,
+                      delete: bool=False) -> list:
+    """Computes changes which make uploaded files equal to local ones
+
+        Args::
+            local(dict): Local files by remote path, see `local_files`
+            hashes(dict): SHA-256 of local files by remote path
+            uploaded(dict): Uploaded files, see `Manifest.files`
+            delete(bool): Delete uploaded files which don't exist locally
+
+        Returns::
+            An array of `SyncItem`, sorted by remote path
+    """
+    by_path = {entry['path']: (config_file_id, entry['sha256'])
+               for config_file_id, entry in uploaded.items()}
+    items = []
+    for path, source in local.items():
+        config_file_id, sha256 = by_path.get(path, (None, None))
+        if config_file_id is None:
+            items.append(SyncItem(path, CREATE, source=source))
+        elif sha256 != hashes[path]:
+            items.append(SyncItem(path, UPDATE, config_file_id, source=source))
+        else:
+            items.append(SyncItem(path, UNCHANGED, config_file_id, source=source))
+
+    if delete:
+        items.extend(SyncItem(path, DELETE, config_file_id)
+                     for path, (config_file_id, _) in by_path.items()
+                     if path not in local)
+    items.sort(key=lambda item: (item.name, item.action))
+    return items
+
+
+def _upload(config_files, secret_id: str, item: SyncItem, encrypted: bool):
+    """Reads a file and uploads it, returns the response and SHA-256
+    of the uploaded content, which may differ from the planned one
+    if the file changed meanwhile"""
+    with open(item.source, 'rb') as file:
+        data = file.read()
+    content = data.decode()
+    if item.action == CREATE:
+        result = config_files.create(secret_id, item.name, content, encrypted)
+    else:
+        result = config_files.update(item.id, item.name, content)
+    return result, hashlib.sha256(data).hexdigest()
+
+
+def _uploaded_files(config_files, secret_id: str) -> dict:
+    """Lists files of a secret like manifest entries, hashes of encrypted
+    files are unknown"""
+    current = list(config_files.secrets(secret_id, iterate=True))
+    if any(not hasattr(config_file, 'get') or config_file.get('id') is None
+           for config_file in current):
+        raise SyncError(f'Can not fetch files of secret "{secret_id}"', current)
+    return {
+        config_file.get('id'): {
+            'path': config_file.get('path'),
+            'sha256': _hash_content(config_file.get('content'))
+        }
+        for config_file in current
+    }
+
+
+def sync_config_files(semaphore, secret_id: str, directory: str, remote_dir: str,
+                      manifest=None, encrypted: bool=True, delete: bool=False,
+                      refresh: bool=False, max_workers: int=None) -> SyncReport:
+    """Uploads added and changed files of a directory into a secret
+
+        Args::
+            semaphore(Semaphore): A client
+            secret_id(str): ID of a secret
+            directory(str): A local directory, walked recursively
+            remote_dir(str): A directory of the files in jobs,
+            e.g. `/home/runner/config`
+            manifest(str or Manifest): Hashes of uploaded files,
+            `.semaphore-manifest.json` in the directory by default
+            encrypted(bool): Encrypt created files
+            delete(bool): Delete uploaded files which don't exist locally
+            refresh(bool): List files of the secret instead of trusting
+            the manifest, done anyway for a secret missing in it
+            max_workers(int): Maximum number of uploads at once,
+            defaults to the connection pool size
+
+        Returns::
+            A `SyncReport` with an item per file
+
+        Raises::
+            SyncError: if files of the secret can't be fetched
+    """
+    if manifest is None:
+        manifest = os.path.join(directory, MANIFEST)
+    if not isinstance(manifest, Manifest):
+        manifest = Manifest(manifest)
+    config_files = semaphore.config_files
+
+    local = local_files(directory, remote_dir, exclude=(manifest.path,))
+    hashes = {path: hash_file(source) for path, source in local.items()}
+    if refresh or secret_id not in manifest:
+        manifest.reset(secret_id, _uploaded_files(config_files, secret_id))
+
+    items = plan_config_files(local, hashes, manifest.files(secret_id), delete)
+    changed = [item for item in items if item.action != UNCHANGED]
+    calls = [
+        (config_files.delete, item.id) if item.action == DELETE
+        else (_upload, config_files, secret_id, item, encrypted)
+        for item in changed
+    ]
+    outcomes = []
+    if calls:
+        outcomes = run_batch(calls, max_workers or semaphore.pool_maxsize)
+
+    stale = False
+    for item, outcome in zip(changed, outcomes):
+        if not outcome.ok:
+            item.error = outcome.error
+        elif item.action == DELETE:
+            _check(item, outcome.value)
+        else:
+            result, sha256 = outcome.value
+            _check(item, result)
+        if not item.ok:
+            # the manifest may be out of date, list the secret next time
+            stale = stale or item.action != CREATE
+        elif item.action == DELETE:
+            manifest.remove(secret_id, item.id)
+        else:
+            manifest.set(secret_id, item.id, item.name, sha256)
+
+    if stale:
+        manifest.forget(secret_id)
+    manifest.save()
+    return SyncReport(items)
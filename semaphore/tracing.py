@@ -0,0 +1,221 @@
+"""Lightweight tracing of client calls without external dependencies
+
+Usage::
+    tracer = Tracer()
+    semaphore = Semaphore('token', tracer=tracer)
+    with tracer.span('sync org', org='acme'):
+        for project in semaphore.projects.list('acme'):
+            semaphore.secrets.project(project['id'])
+    tracer.export_chrome_trace('trace.json')  # open in chrome://tracing
+
+Every request becomes a child span of the enclosing span of its thread,
+requests of batches and prefetched pages keep the parent of their caller.
+"""
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from threading import Lock
+
+from .utils import ContextVar, open_output
+
+_current = ContextVar('semaphore_span', default=None)
+
+
+def current_span():
+    """Returns the innermost open span of the current context or `None`"""
+    return _current.get()
+
+
+def _new_id(bits: int=64) -> str:
+    return format(random.getrandbits(bits), f'0{bits // 4}x')
+
+
+class Span:
+    """A timed operation with attributes
+
+        Properties::
+            name: Name of the operation
+            trace_id: Id shared by all spans of one trace
+            span_id: Id of the span
+            parent_id: Id of the parent span, `None` for a root span
+            start: Unix time when the span started
+            duration: Seconds the span took, `None` while it's open
+            attributes: A dictionary with details of the operation
+            error: Representation of an exception raised within the span
+    """
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'start', 'duration',
+                 'attributes', 'error', 'thread_id', '_started')
+
+    def __init__(self, name: str, parent: 'Span'=None, attributes: dict=None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else _new_id(128)
+        self.span_id = _new_id()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = dict(attributes or {})
+        self.error = None
+        self.duration = None
+        self.thread_id = threading.get_ident()
+        self.start = time.time()
+        self._started = time.perf_counter()
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def end(self, error: Exception=None):
+        self.duration = time.perf_counter() - self._started
+        if error is not None:
+            self.error = repr(error)
+
+    def as_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start': self.start,
+            'duration': self.duration,
+            'attributes': self.attributes,
+            'error': self.error
+        }
+
+    def __repr__(self):
+        return f'<Span {self.name} {self.span_id}>'
+
+
+class Tracer:
+    """Collects spans of user operations and API requests
+
+        Args::
+            max_spans(int): Number of finished spans kept, the oldest
+            ones are dropped first
+
+        Properties::
+            spans: An array with finished spans
+
+        Methods::
+            span(str): A context manager of a span, which becomes
+            the parent of spans started within it
+            attach(Hooks): Traces every request of a client
+            detach(Hooks): Stops tracing requests
+            export_json_lines(file): Writes one JSON object per span
+            chrome_trace: Returns spans in Chrome trace event format
+            export_chrome_trace(file): Writes a Chrome trace file
+            clear: Drops finished spans
+    """
+    def __init__(self, max_spans: int=100000):
+        self._spans = deque(maxlen=max_spans)
+        self._lock = Lock()
+
+    @property
+    def spans(self) -> list:
+        with self._lock:
+            return list(self._spans)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Opens a span within the current context
+
+            Args::
+                name(str): Name of the operation
+                attributes: Details of the operation
+
+            Returns::
+                A context manager which yields the `Span`
+        """
+        span = Span(name, _current.get(), attributes)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as error:
+            span.end(error)
+            raise
+        else:
+            span.end()
+        finally:
+            _current.reset(token)
+            self._record(span)
+
+    def _record(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+
+    def attach(self, hooks):
+        hooks.on('before_request', self._start_request)
+        hooks.on('after_response', self._end_request)
+        hooks.on('on_error', self._end_request)
+        return self
+
+    def detach(self, hooks):
+        hooks.off('before_request', self._start_request)
+        hooks.off('after_response', self._end_request)
+        hooks.off('on_error', self._end_request)
+
+    def _start_request(self, event):
+        event.context['span'] = Span(
+            f'{event.method} {event.template}',
+            _current.get(),
+            {'http.method': event.method, 'http.url': event.url,
+             'endpoint': event.template}
+        )
+
+    def _end_request(self, event):
+        span = event.context.pop('span', None)
+        if span is None:
+            return
+        span.set(**{
+            'http.status_code': event.status_code,
+            'retries': event.retries,
+            'response_bytes': event.response_bytes
+        })
+        span.end(event.error)
+        self._record(span)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+    def export_json_lines(self, file):
+        """Writes every span as a JSON object on its own line
+
+            Args::
+                file: A path or a text file object
+        """
+        with open_output(file) as output:
+            for span in self.spans:
+                output.write(json.dumps(span.as_dict(), default=str) + '\n')
+
+    def chrome_trace(self) -> dict:
+        """Returns spans as complete events of the Chrome trace event format,
+        which can be opened in chrome://tracing or Perfetto
+        """
+        pid = os.getpid()
+        events = []
+        for span in self.spans:
+            args = dict(span.attributes)
+            args.update(span_id=span.span_id, parent_id=span.parent_id)
+            if span.error is not None:
+                args['error'] = span.error
+            events.append({
+                'name': span.name,
+                'cat': 'http' if 'http.method' in span.attributes else 'user',
+                'ph': 'X',
+                'ts': span.start * 1e6,
+                'dur': (span.duration or 0) * 1e6,
+                'pid': pid,
+                'tid': span.thread_id,
+                'args': args
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, file):
+        """Writes a Chrome trace file
+
+            Args::
+                file: A path or a text file object
+        """
+        with open_output(file) as output:
+            json.dump(self.chrome_trace(), output, default=str)
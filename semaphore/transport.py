@@ -0,0 +1,361 @@
+import json
+import re
+from collections import defaultdict, deque
+from threading import Lock
+from urllib.parse import urlencode, urlsplit
+
+
+class Transport:
+    """Interface of an HTTP backend used by the client
+
+        A transport returns response objects which provide `status_code`,
+        `headers`, `content`, `links`, `json()`, `iter_content()`
+        and `close()`, like `requests.Response` does. With `stream=True`
+        the body isn't read until `content` or `iter_content` is used.
+
+        Methods::
+            request(str, str, dict): Makes an HTTP request
+            is_timeout(Exception): Checks if an error is a timeout
+            close: Releases all resources of the transport
+    """
+    def request(self, method: str, url: str, headers: dict=None, **kwargs):
+        raise NotImplementedError
+
+    def is_timeout(self, error: Exception) -> bool:
+        import socket
+
+        return isinstance(error, (TimeoutError, socket.timeout))
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class Headers(dict):
+    """Dictionary of response headers with case-insensitive `get`"""
+
+    def __init__(self, headers=()):
+        super().__init__((key.lower(), value) for key, value in dict(headers).items())
+
+    def __getitem__(self, key):
+        return super().__getitem__(key.lower())
+
+    def __contains__(self, key):
+        return super().__contains__(key.lower())
+
+    def get(self, key, default=None):
+        return super().get(key.lower(), default)
+
+
+_LINK = re.compile(r'<([^>]*)>\s*((?:;\s*[^;,]+)*)')
+
+
+def parse_links(header: str) -> dict:
+    """Parses a `Link` header, the same way `requests` does
+
+        Args::
+            header(str): Value of the `Link` header
+
+        Returns::
+            A dictionary like `{'next': {'url': ..., 'rel': 'next'}}`
+    """
+    links = {}
+    for url, params in _LINK.findall(header or ''):
+        link = {'url': url}
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key:
+                link[key.strip()] = value.strip(' \'"')
+        links[link.get('rel') or url] = link
+    return links
+
+
+class Response:
+    """Response of transports which are not based on `requests`
+
+        Args::
+            status_code(int): An HTTP status code
+            headers(dict): Response headers
+            content(bytes): A response body
+            url(str): Url of the request
+            raw: An unread `urllib3` response of a streamed body,
+            used instead of `content`
+    """
+    def __init__(self, status_code: int, headers=None, content: bytes=b'',
+                 url: str=None, raw=None):
+        self.status_code = status_code
+        self.headers = Headers(headers or {})
+        self.url = url
+        self.raw = raw
+        self._content = content
+
+    @property
+    def content(self) -> bytes:
+        if self._content is None:
+            self._content = self.raw.read()
+            self.close()
+        return self._content
+
+    @property
+    def links(self) -> dict:
+        return parse_links(self.headers.get('Link'))
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size: int=65536):
+        """Yields the body in chunks, reading a streamed body from the socket"""
+        if self._content is not None:
+            for start in range(0, len(self._content), chunk_size):
+                yield self._content[start:start + chunk_size]
+            return
+        yield from self.raw.stream(chunk_size, decode_content=True)
+
+    def close(self):
+        """Returns the connection of a streamed body to the pool,
+        its socket is closed first unless the body was read to the end,
+        otherwise the unread rest would be taken for the next response"""
+        raw = self.raw
+        if raw is None:
+            return
+        if not raw.isclosed():
+            raw.close()
+        raw.release_conn()
+
+    def __repr__(self):
+        return f'<Response [{self.status_code}]>'
+
+
+def release(response, max_drain: int=65536):
+    """Releases a streamed response without decoding its body
+
+    An empty or short remaining body is discarded, so the connection
+    goes back to the pool, a longer or unknown one is closed instead
+    of being downloaded.
+
+        Args::
+            response: A response requested with `stream=True`
+            max_drain(int): Maximum number of bytes discarded
+    """
+    raw = getattr(response, 'raw', None)
+    remaining = getattr(raw, 'length_remaining', None)
+    if isinstance(remaining, int) and remaining <= max_drain:
+        if hasattr(raw, 'drain_conn'):
+            raw.drain_conn()
+        else:
+            # urllib3 before 1.24
+            raw.read()
+        raw.release_conn()
+    else:
+        if raw is not None:
+            # the unread body mustn't go back to the pool with the socket
+            raw.close()
+        response.close()
+
+
+def _encode_body(headers: dict, json_data=None, data=None):
+    """Encodes a request body the way `requests` does for json/data kwargs"""
+    headers = dict(headers or {})
+    if json_data is not None:
+        headers.setdefault('Content-Type', 'application/json')
+        return headers, json.dumps(json_data).encode()
+    if isinstance(data, dict):
+        headers.setdefault('Content-Type', 'application/x-www-form-urlencoded')
+        return headers, urlencode(data).encode()
+    if isinstance(data, str):
+        data = data.encode()
+    return headers, data
+
+
+def _with_params(url: str, params=None) -> str:
+    if not params:
+        return url
+    return url + ('&' if '?' in url else '?') + urlencode(params)
+
+
+class RequestsTransport(Transport):
+    """Transport based on a pooled keep-alive `requests.Session`
+
+    `requests` is imported and the session is created on the first
+    request, so creating a client stays cheap.
+
+        Args::
+            pool_connections(int): Number of connection pools to cache
+            pool_maxsize(int): Maximum number of connections kept per host
+            session(requests.Session): An existing session to use
+
+        Properties::
+            session: The `requests.Session`, created on first access
+    """
+    def __init__(self, pool_connections: int=10, pool_maxsize: int=10,
+                 session=None):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self._session = session
+        self._lock = Lock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def request(self, method: str, url: str, headers: dict=None, **kwargs):
+        return self.session.request(method, url, headers=headers, **kwargs)
+
+    def is_timeout(self, error: Exception) -> bool:
+        from requests.exceptions import Timeout
+
+        return isinstance(error, Timeout)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+
+class Urllib3Transport(Transport):
+    """Transport based directly on a `urllib3.PoolManager`,
+    with a lower per-call overhead than `requests`
+
+        Args::
+            maxsize(int): Maximum number of connections kept per host
+            num_pools(int): Number of connection pools to cache
+            timeout(float): Default timeout of a request in seconds
+    """
+    def __init__(self, maxsize: int=10, num_pools: int=10, timeout: float=None):
+        import urllib3
+
+        self._urllib3 = urllib3
+        self.timeout = timeout
+        self.pool = urllib3.PoolManager(num_pools=num_pools, maxsize=maxsize)
+
+    def request(self, method: str, url: str, headers: dict=None, params=None,
+                json=None, data=None, timeout: float=None, stream: bool=False,
+                **kwargs):
+        headers, body = _encode_body(headers, json, data)
+        timeout = timeout if timeout is not None else self.timeout
+        response = self.pool.request(
+            method,
+            _with_params(url, params),
+            headers=headers,
+            body=body,
+            timeout=timeout,
+            retries=False,
+            preload_content=not stream,
+            **kwargs
+        )
+        if stream:
+            return Response(response.status, response.headers, None, url, response)
+        return Response(response.status, response.headers, response.data, url)
+
+    def is_timeout(self, error: Exception) -> bool:
+        return (
+            isinstance(error, self._urllib3.exceptions.TimeoutError)
+            or super().is_timeout(error)
+        )
+
+    def close(self):
+        self.pool.clear()
+
+
+class InMemoryTransport(Transport):
+    """Transport which serves canned responses without any network
+
+        Routes are matched by method and path (with a query string
+        if the route has one), scheme and host are ignored.
+        Several responses added for one route are served in order,
+        the last one is repeated. Unknown routes return 404.
+        HEAD requests of routes added only for GET are answered with
+        the status and headers of the next GET response, without a body.
+
+        Usage::
+            transport = InMemoryTransport()
+            transport.add('GET', '/v2/teams/id', json={'id': 'id'})
+            semaphore = Semaphore('token', transport=transport)
+
+        Properties::
+            calls: An array with `(method, url, kwargs)` of all requests
+
+        Methods::
+            add(str, str): Adds a canned response of a route
+            request(str, str, dict): Serves a canned response
+    """
+    def __init__(self):
+        self.calls = []
+        self._routes = defaultdict(deque)
+        self._lock = Lock()
+
+    @staticmethod
+    def _route(method: str, url: str, with_query: bool=True):
+        parts = urlsplit(url)
+        path = re.sub('/{2,}', '/', parts.path).rstrip('/') or '/'
+        if with_query and parts.query:
+            path += '?' + parts.query
+        return method.upper(), path
+
+    def _responses(self, method: str, url: str):
+        return (
+            self._routes.get(self._route(method, url))
+            or self._routes.get(self._route(method, url, with_query=False))
+        )
+
+    def add(self, method: str, path: str, json=None, status: int=200,
+            headers: dict=None, content: bytes=None):
+        """Adds a canned response
+
+            Args::
+                method(str): An HTTP method name
+                path(str): Path or full url of the route
+                json: An object which is served as a JSON body
+                status(int): An HTTP status code
+                headers(dict): Response headers
+                content(bytes): A raw body, used if `json` isn't passed
+        """
+        if json is not None:
+            content = _dumps(json)
+        with self._lock:
+            self._routes[self._route(method, path)].append(
+                (status, headers or {}, content or b'')
+            )
+
+    def request(self, method: str, url: str, headers: dict=None, params=None,
+                **kwargs):
+        url = _with_params(url, params)
+        with self._lock:
+            self.calls.append((method, url, kwargs))
+            responses = self._responses(method, url)
+            if not responses and method.upper() == 'HEAD':
+                responses = self._responses('GET', url)
+                if responses:
+                    status, response_headers, _ = responses[0]
+                    return Response(status, response_headers, b'', url)
+            if not responses:
+                return Response(404, {}, b'{"message": "Not Found"}', url)
+            status, response_headers, content = (
+                responses.popleft() if len(responses) > 1 else responses[0]
+            )
+        return Response(status, response_headers, content, url)
+
+
+def _dumps(obj) -> bytes:
+    return json.dumps(obj).encode()
@@ -0,0 +1,86 @@
+"""Helpers shared by modules of the package"""
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from http.server import HTTPServer
+from socketserver import ThreadingMixIn
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """HTTP server which handles every connection in a daemon thread,
+    `http.server.ThreadingHTTPServer` of Python 3.7+"""
+
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # a client which closes a connection early isn't an error
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+@contextmanager
+def open_output(file):
+    """Opens a path for writing, a file object is used as it is"""
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, 'w') as output:
+            yield output
+    else:
+        yield file
+
+
+class ThreadContextVar:
+    """Thread-local stand-in of `contextvars.ContextVar` for Python 3.6,
+    values are passed to other threads by `ThreadContext.run`"""
+
+    _variables = []
+
+    def __init__(self, name: str, default=None):
+        self.name = name
+        self._default = default
+        self._local = threading.local()
+        self._variables.append(self)
+
+    def get(self):
+        return getattr(self._local, 'value', self._default)
+
+    def set(self, value):
+        """Sets a value, returns the previous one as a token of `reset`"""
+        token = self.get()
+        self._local.value = value
+        return token
+
+    def reset(self, token):
+        self._local.value = token
+
+
+class ThreadContext:
+    """Values of `ThreadContextVar`, see `contextvars.Context`"""
+
+    def __init__(self, values: dict):
+        self._values = values
+
+    def copy(self):
+        return ThreadContext(dict(self._values))
+
+    def run(self, func, *args, **kwargs):
+        """Calls a function with the values of the context,
+        values of the calling thread are restored afterwards"""
+        previous = {variable: variable.set(value)
+                    for variable, value in self._values.items()}
+        try:
+            return func(*args, **kwargs)
+        finally:
+            for variable, value in previous.items():
+                variable.reset(value)
+
+
+def thread_copy_context() -> ThreadContext:
+    return ThreadContext({variable: variable.get()
+                          for variable in ThreadContextVar._variables})
+
+
+try:
+    from contextvars import ContextVar, copy_context
+except ImportError:  # Python 3.6
+    ContextVar, copy_context = ThreadContextVar, thread_copy_context
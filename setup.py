@@ -22,5 +22,9 @@ setup_parameters = {
 requirements = ['requests>=2.19.1']
 
 setup_parameters['install_requires'] = requirements
+setup_parameters['extras_require'] = {
+    'async': ['aiohttp>=3.5'],
+    'fast': ['orjson']
+}
 
 setup(**setup_parameters)
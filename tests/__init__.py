@@ -1,6 +1,32 @@
 from unittest import TestLoader, TextTestRunner, TestSuite
 
-from .test_request import TestBaseRequest
+from .test_aio import (
+    TestAsyncSemaphore,
+    TestAsyncSessionWithoutAiohttp,
+    TestAsyncSessionRequest
+)
+from .test_batch import TestBatch, TestSemaphoreBatch
+from .test_cache import TestResponseCache, TestCachedRequests
+from .test_codec import TestCodec, TestClientCodec
+from .test_concurrency import TestAdaptiveLimiter, TestAdaptiveRequests
+from .test_crawler import TestInventory, TestCrawler
+from .test_diagnostics import TestFlightRecorder, TestProfile
+from .test_instrumentation import (
+    TestEndpointTemplate,
+    TestHistogram,
+    TestHooks,
+    TestEndpointMetrics
+)
+from .test_index import TestNameIndex
+from .test_mock_server import TestMockServer
+from .test_models import TestModels, TestClientModels
+from .test_prometheus import TestPrometheus
+from .test_ratelimit import (
+    TestRateLimiter,
+    TestRetryPolicy,
+    TestThrottledRequests
+)
+from .test_request import TestBaseRequest, TestSharedSession, TestPagination
 from .test_semaphore import (
     TestBaseSemaphore,
     TestOrganizationResource,
@@ -11,12 +37,40 @@ from .test_semaphore import (
     TestEnvironmentResource,
     TestConfigFileResource
 )
+from .test_status_only import (
+    TestRelease,
+    TestStatusOnly,
+    TestStatusOnlyUrllib3
+)
+from .test_store import TestInventoryStore, TestStoredCrawl
+from .test_streaming import (
+    TestArrayDecoder,
+    TestStreamedResponses,
+    TestStreamedUrllib3Responses
+)
+from .test_sync import (
+    TestPlanEnvVars,
+    TestSyncEnvVars,
+    TestPlanConfigFiles,
+    TestSyncConfigFiles
+)
+from .test_tracing import TestTracer
+from .test_transport import (
+    TestResponse,
+    TestInMemoryTransport,
+    TestRequestsTransport,
+    TestUrllib3Transport
+)
+from .test_utils import TestThreadContext
+from .test_singleflight import TestSingleFlight, TestCoalescedRequests
 
 
 if __name__ == "__main__":
     loader = TestLoader()
     test_classes = (
         TestBaseRequest,
+        TestSharedSession,
+        TestPagination,
         TestBaseSemaphore,
         TestOrganizationResource,
         TestTeamResource,
@@ -24,7 +78,54 @@ if __name__ == "__main__":
         TestProjectsResource,
         TestSecretsResource,
         TestEnvironmentResource,
-        TestConfigFileResource
+        TestConfigFileResource,
+        TestAsyncSemaphore,
+        TestAsyncSessionWithoutAiohttp,
+        TestAsyncSessionRequest,
+        TestBatch,
+        TestSemaphoreBatch,
+        TestResponseCache,
+        TestCachedRequests,
+        TestSingleFlight,
+        TestCoalescedRequests,
+        TestRateLimiter,
+        TestRetryPolicy,
+        TestThrottledRequests,
+        TestAdaptiveLimiter,
+        TestAdaptiveRequests,
+        TestResponse,
+        TestInMemoryTransport,
+        TestRequestsTransport,
+        TestUrllib3Transport,
+        TestMockServer,
+        TestEndpointTemplate,
+        TestHistogram,
+        TestHooks,
+        TestEndpointMetrics,
+        TestPrometheus,
+        TestTracer,
+        TestFlightRecorder,
+        TestProfile,
+        TestModels,
+        TestClientModels,
+        TestCodec,
+        TestClientCodec,
+        TestArrayDecoder,
+        TestStreamedResponses,
+        TestStreamedUrllib3Responses,
+        TestRelease,
+        TestStatusOnly,
+        TestStatusOnlyUrllib3,
+        TestInventory,
+        TestCrawler,
+        TestInventoryStore,
+        TestStoredCrawl,
+        TestNameIndex,
+        TestPlanEnvVars,
+        TestSyncEnvVars,
+        TestPlanConfigFiles,
+        TestSyncConfigFiles,
+        TestThreadContext
     )
 
     tests = [
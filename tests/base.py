@@ -21,5 +21,5 @@ class BaseTestCase(unittest.TestCase):
         pass
 
     def return_assert(self, request, func):
-        request.get.return_value = self.mock_data
+        request.return_value = self.mock_data
         return self.assertTrue(self.json_data, func)
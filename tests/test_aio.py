@@ -0,0 +1,132 @@
+import asyncio
+import unittest
+
+from mock import MagicMock, patch
+
+from semaphore.aio import AsyncSemaphore, AsyncSession, aiohttp
+
+
+class FakeResponse:
+    def __init__(self, status=200, data=None, links=None):
+        self.status = status
+        self.data = data
+        self.links = links or {}
+
+    async def json(self, content_type=None, loads=None):
+        return self.data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class TestAsyncSemaphore(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.semaphore = AsyncSemaphore('Api-Token')
+        self.data = [{'id': '31312312312', 'name': 'Mike'}]
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.semaphore.close())
+        self.loop.close()
+
+    def run_request(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def test_resources_share_session(self):
+        for resource in (self.semaphore.teams, self.semaphore.config_files):
+            self.assertIs(resource._transport, self.semaphore._transport)
+
+    @patch.object(AsyncSession, 'request')
+    def test_get(self, request):
+        request.return_value = FakeResponse(data=self.data)
+        self.assertEqual(
+            self.run_request(self.semaphore.teams.by_id('id')),
+            self.data
+        )
+        request.assert_called_once_with(
+            'GET',
+            'https://api.semaphoreci.com/v2//teams/id',
+            headers={'Authorization': 'Token Api-Token'}
+        )
+
+    @patch.object(AsyncSession, 'request')
+    def test_only_status(self, request):
+        request.return_value = FakeResponse(status=204)
+        self.assertEqual(
+            self.run_request(self.semaphore.secrets.delete('secret id')),
+            204
+        )
+
+    @patch.object(AsyncSession, 'request')
+    def test_default_resources_as_list(self, request):
+        request.return_value = FakeResponse(data={'orgs': 'url'})
+        self.assertEqual(
+            self.run_request(self.semaphore.default_resources(as_list=True)),
+            ['url']
+        )
+
+    @patch.object(AsyncSession, 'request')
+    def test_concurrent_calls(self, request):
+        request.return_value = FakeResponse(data=self.data)
+
+        async def fan_out():
+            calls = [self.semaphore.secrets.all('mikezz') for _ in range(10)]
+            return await asyncio.gather(*calls)
+
+        results = self.run_request(fan_out())
+        self.assertEqual(results, [self.data] * 10)
+
+    @patch.object(AsyncSession, 'request')
+    def test_iterate(self, request):
+        request.side_effect = [
+            FakeResponse(data=[1, 2], links={'next': {'url': 'http://next'}}),
+            FakeResponse(data=[3])
+        ]
+
+        async def consume():
+            return [user async for user in self.semaphore.users.list(
+                'mikezz',
+                iterate=True
+            )]
+
+        self.assertEqual(self.run_request(consume()), [1, 2, 3])
+        self.assertEqual(request.call_args_list[1][0], ('GET', 'http://next'))
+
+    def test_validation_is_kept(self):
+        self.assertRaises(
+            ValueError,
+            self.semaphore.teams.update,
+            'id',
+            'wrong permission'
+        )
+
+    def test_session_is_created_lazily(self):
+        self.assertIsNone(self.semaphore._transport._session)
+
+        async def create():
+            return self.semaphore._transport._client_session()
+
+        session = self.run_request(create())
+        self.assertIsInstance(session, aiohttp.ClientSession)
+        self.assertIsInstance(session.connector, aiohttp.TCPConnector)
+        self.assertEqual(session.connector.limit, 100)
+
+
+class TestAsyncSessionWithoutAiohttp(unittest.TestCase):
+    @patch('semaphore.aio.aiohttp', None)
+    def test_requires_aiohttp(self):
+        self.assertRaises(ImportError, AsyncSession)
+
+
+class TestAsyncSessionRequest(unittest.TestCase):
+    @unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+    def test_request_uses_client_session(self):
+        session = AsyncSession()
+        client_session = MagicMock()
+        with patch.object(session, '_client_session', return_value=client_session):
+            session.request('GET', 'http://url')
+        client_session.request.assert_called_once_with('GET', 'http://url')
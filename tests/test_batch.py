@@ -0,0 +1,92 @@
+import threading
+import time
+
+from mock import patch
+
+from semaphore.batch import BatchResult, run_batch
+
+from .base import BaseTestCase
+
+
+class TestBatch(BaseTestCase):
+    def test_results_are_ordered(self):
+        def slow(value):
+            time.sleep(0.01 * (5 - value))
+            return value * 2
+
+        results = run_batch([(slow, value) for value in range(5)], 5)
+        self.assertEqual([result.value for result in results], [0, 2, 4, 6, 8])
+        self.assertEqual([result.index for result in results], list(range(5)))
+
+    def test_errors_are_captured(self):
+        def fail():
+            raise ValueError('boom')
+
+        results = run_batch([fail, lambda: 'ok'], 2)
+        self.assertFalse(results[0].ok)
+        self.assertIsInstance(results[0].error, ValueError)
+        self.assertRaises(ValueError, results[0].unwrap)
+        self.assertEqual(results[1].unwrap(), 'ok')
+
+    def test_as_completed(self):
+        release = threading.Event()
+
+        def blocked():
+            release.wait(1)
+            return 'slow'
+
+        def fast():
+            return 'fast'
+
+        results = run_batch([blocked, fast], 2, ordered=False)
+        first = next(results)
+        release.set()
+        self.assertEqual(first.value, 'fast')
+        self.assertEqual([result.value for result in results], ['slow'])
+
+    def test_max_workers_is_bounded(self):
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def call():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.pop()
+
+        run_batch([call] * 12, 3)
+        self.assertLessEqual(max(peak), 3)
+
+    def test_repr(self):
+        self.assertIn('value=1', repr(BatchResult(0, value=1)))
+
+
+class TestSemaphoreBatch(BaseTestCase):
+    @patch('requests.Session.request')
+    def test_batch(self, request):
+        request.return_value = self.mock_data
+        project_id = 'project id'
+        results = self.semaphore.batch([
+            (self.semaphore.environment.all, project_id),
+            (self.semaphore.config_files.all, project_id),
+            (self.semaphore.teams.by_project, project_id)
+        ])
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(request.call_count, 3)
+
+    @patch('requests.Session.request')
+    def test_map(self, request):
+        request.return_value = self.mock_data
+        results = self.semaphore.map(
+            self.semaphore.users.add,
+            [('team', 'mike'), ('team', 'john')]
+        )
+        self.assertEqual(len(results), 2)
+        urls = sorted(call[0][1] for call in request.call_args_list)
+        self.assertEqual(urls, [
+            'https://api.semaphoreci.com/v2//teams/team/users/john',
+            'https://api.semaphoreci.com/v2//teams/team/users/mike'
+        ])
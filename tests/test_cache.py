@@ -0,0 +1,149 @@
+import json
+import time
+
+from mock import MagicMock, patch
+
+from semaphore.cache import CacheEntry, ResponseCache
+from semaphore.client import Semaphore
+
+from .base import BaseTestCase
+
+
+def response(status_code=200, body=None, headers=None):
+    content = json.dumps(body).encode()
+    return MagicMock(
+        status_code=status_code,
+        content=content,
+        headers=headers or {},
+        **{'json.return_value': json.loads(content) if body is not None else None}
+    )
+
+
+class TestResponseCache(BaseTestCase):
+    def test_lru_bound(self):
+        cache = ResponseCache(maxsize=2)
+        for key in ('a', 'b', 'c'):
+            cache.set((key, ''), CacheEntry(b'[]'))
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(('a', '')))
+
+    def test_recently_used_is_kept(self):
+        cache = ResponseCache(maxsize=2)
+        cache.set(('a', ''), CacheEntry(b'[]'))
+        cache.set(('b', ''), CacheEntry(b'[]'))
+        cache.get(('a', ''))
+        cache.set(('c', ''), CacheEntry(b'[]'))
+        self.assertIsNotNone(cache.get(('a', '')))
+        self.assertIsNone(cache.get(('b', '')))
+
+    def test_ttls(self):
+        cache = ResponseCache(ttl=5, ttls={'teams': 60})
+        self.assertEqual(cache.ttl_for('teams'), 60)
+        self.assertEqual(cache.ttl_for('projects'), 5)
+
+    def test_entry_freshness(self):
+        entry = CacheEntry(b'[]', ttl=0.01)
+        self.assertTrue(entry.fresh)
+        time.sleep(0.02)
+        self.assertFalse(entry.fresh)
+        entry.touch()
+        self.assertTrue(entry.fresh)
+
+    def test_counters_are_thread_safe(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        cache = ResponseCache()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for _ in range(8):
+                executor.submit(lambda: [cache.record_hit() for _ in range(10000)])
+        self.assertEqual(cache.hits, 80000)
+
+    def test_validators(self):
+        entry = CacheEntry(b'[]', etag='"abc"', last_modified='yesterday')
+        self.assertEqual(entry.validators(), {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'yesterday'
+        })
+
+
+class TestCachedRequests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = ResponseCache()
+        self.semaphore = Semaphore('Api-Token', cache=self.cache)
+        self.team = {'id': 'id', 'name': 'team'}
+
+    @patch('requests.Session.request')
+    def test_revalidates_with_etag(self, request):
+        request.side_effect = [
+            response(body=self.team, headers={'ETag': '"v1"'}),
+            response(status_code=304)
+        ]
+        self.assertEqual(self.semaphore.teams.by_id('id'), self.team)
+        self.assertEqual(self.semaphore.teams.by_id('id'), self.team)
+
+        headers = request.call_args_list[1][1]['headers']
+        self.assertEqual(headers['If-None-Match'], '"v1"')
+        self.assertEqual(headers['Authorization'], 'Token Api-Token')
+        self.assertEqual(self.cache.revalidations, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+    @patch('requests.Session.request')
+    def test_changed_response_replaces_entry(self, request):
+        changed = {'id': 'id', 'name': 'renamed'}
+        request.side_effect = [
+            response(body=self.team, headers={'Last-Modified': 'monday'}),
+            response(body=changed, headers={'Last-Modified': 'tuesday'})
+        ]
+        self.semaphore.teams.by_id('id')
+        self.assertEqual(self.semaphore.teams.by_id('id'), changed)
+        headers = request.call_args_list[1][1]['headers']
+        self.assertEqual(headers['If-Modified-Since'], 'monday')
+
+    @patch('requests.Session.request')
+    def test_fresh_entry_is_served_without_request(self, request):
+        self.cache.ttls['teams'] = 60
+        request.return_value = response(body=self.team)
+        self.semaphore.teams.by_id('id')
+        self.assertEqual(self.semaphore.teams.by_id('id'), self.team)
+        self.assertEqual(request.call_count, 1)
+        self.assertEqual(self.cache.hits, 1)
+
+    @patch('requests.Session.request')
+    def test_cached_body_is_not_shared(self, request):
+        self.cache.ttl = 60
+        request.return_value = response(body=self.team)
+        self.semaphore.teams.by_id('id')
+        self.semaphore.teams.by_id('id')['name'] = 'changed'
+        self.assertEqual(self.semaphore.teams.by_id('id'), self.team)
+
+    @patch('requests.Session.request')
+    def test_write_invalidates_entry(self, request):
+        self.cache.ttl = 60
+        request.return_value = response(body=self.team)
+        self.semaphore.teams.by_id('id')
+        self.semaphore.teams.update('id', 'read', name='renamed')
+        self.semaphore.teams.by_id('id')
+        self.assertEqual(request.call_count, 3)
+
+    @patch('requests.Session.request')
+    def test_entries_are_kept_per_token(self, request):
+        self.cache.ttl = 60
+        other = Semaphore('Other-Token', cache=self.cache)
+        request.side_effect = [
+            response(body=self.team),
+            response(status_code=404, body={'message': 'Not found'})
+        ]
+        self.semaphore.teams.by_id('id')
+        self.assertEqual(other.teams.by_id('id'), {'message': 'Not found'})
+        self.assertEqual(request.call_count, 2)
+
+    @patch('requests.Session.request')
+    def test_errors_are_not_cached(self, request):
+        request.return_value = response(
+            status_code=404,
+            body={'message': 'Not found'},
+            headers={'ETag': '"v1"'}
+        )
+        self.semaphore.teams.by_id('id')
+        self.assertEqual(len(self.cache), 0)
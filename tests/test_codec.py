@@ -0,0 +1,85 @@
+import json
+
+from mock import patch
+
+from semaphore.client import Semaphore
+from semaphore.codec import Codec, get_codec, project
+from semaphore.transport import InMemoryTransport
+
+from .base import BaseTestCase
+
+TEAMS = [
+    {'id': '1', 'name': 'dev', 'permission': 'edit', 'description': 'Developers'},
+    {'id': '2', 'name': 'ops', 'permission': 'admin', 'description': None}
+]
+
+
+class TestCodec(BaseTestCase):
+    def test_standard_library(self):
+        codec = get_codec('json')
+        self.assertEqual(codec.name, 'json')
+        self.assertEqual(codec.loads(b'{"a": [1]}'), {'a': [1]})
+        self.assertEqual(codec.dumps({'a': 1}), b'{"a":1}')
+
+    def test_default_is_cached(self):
+        self.assertIs(get_codec(), get_codec())
+        self.assertIn(get_codec().name, ('orjson', 'ujson', 'json'))
+
+    @patch.dict('sys.modules', {'orjson': None, 'ujson': None})
+    @patch('semaphore.codec._default', None)
+    def test_falls_back_to_standard_library(self):
+        self.assertEqual(get_codec().name, 'json')
+
+    def test_codec_instance(self):
+        codec = Codec('custom', json.loads, json.dumps)
+        self.assertIs(get_codec(codec), codec)
+
+    def test_unknown_codec(self):
+        self.assertRaises(ValueError, get_codec, 'yaml')
+
+    def test_project(self):
+        self.assertEqual(
+            project(TEAMS, ('id', 'name')),
+            [{'id': '1', 'name': 'dev'}, {'id': '2', 'name': 'ops'}]
+        )
+        self.assertEqual(project(TEAMS[0], ('id', 'missing')), {'id': '1'})
+        self.assertEqual(project('text', ('id',)), 'text')
+
+
+class TestClientCodec(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.transport = InMemoryTransport()
+        self.transport.add(
+            'GET', '/v2/orgs/acme/teams', json=TEAMS[:1],
+            headers={'Link': '</v2/orgs/acme/teams?page=2>; rel="next"'}
+        )
+        self.transport.add('GET', '/v2/orgs/acme/teams?page=2', json=TEAMS[1:])
+
+    def test_responses_are_decoded_with_codec(self):
+        loads = []
+        codec = Codec('spy', lambda content: loads.append(content) or TEAMS,
+                      json.dumps)
+        semaphore = Semaphore('Api-Token', transport=self.transport, codec=codec)
+        self.assertEqual(semaphore.teams.all('acme'), TEAMS)
+        self.assertEqual(loads, [json.dumps(TEAMS[:1]).encode()])
+
+    def test_fields(self):
+        semaphore = Semaphore('Api-Token', transport=self.transport)
+        self.assertEqual(
+            semaphore.teams.all('acme', fields=('id', 'name')),
+            [{'id': '1', 'name': 'dev'}]
+        )
+
+    def test_fields_with_pagination(self):
+        semaphore = Semaphore('Api-Token', transport=self.transport)
+        self.assertEqual(
+            list(semaphore.teams.all('acme', iterate=True, fields=('id',))),
+            [{'id': '1'}, {'id': '2'}]
+        )
+
+    def test_fields_with_models(self):
+        semaphore = Semaphore('Api-Token', transport=self.transport, models=True)
+        team = semaphore.teams.all('acme', fields=('id',))[0]
+        self.assertEqual(team.id, '1')
+        self.assertIsNone(team.name)
@@ -0,0 +1,123 @@
+import threading
+import time
+
+from mock import MagicMock, patch
+from requests.exceptions import Timeout
+
+from semaphore.client import Semaphore
+from semaphore.concurrency import AdaptiveLimiter
+
+from .base import BaseTestCase
+
+
+class TestAdaptiveLimiter(BaseTestCase):
+    def complete(self, limiter, count, latency=0.01):
+        for _ in range(count):
+            limiter.acquire()
+            limiter.release(latency)
+
+    def test_additive_increase(self):
+        limiter = AdaptiveLimiter(initial=2, max_limit=10)
+        self.complete(limiter, 10)
+        self.assertGreater(limiter.limit, 2)
+        self.complete(limiter, 500)
+        self.assertEqual(limiter.limit, 10)
+
+    def test_multiplicative_decrease_on_congestion(self):
+        limiter = AdaptiveLimiter(initial=8)
+        limiter.acquire()
+        limiter.release(0.01, congested=True)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_burst_of_throttling_is_one_event(self):
+        limiter = AdaptiveLimiter(initial=8)
+        for _ in range(3):
+            limiter.acquire()
+        for _ in range(3):
+            limiter.release(1, congested=True)
+        self.assertEqual(limiter.limit, 4)
+
+    def test_min_limit(self):
+        limiter = AdaptiveLimiter(initial=2, min_limit=1)
+        for _ in range(5):
+            limiter.acquire()
+            limiter.release(congested=True)
+        self.assertEqual(limiter.limit, 1)
+
+    def test_rising_latency_decreases_limit(self):
+        limiter = AdaptiveLimiter(initial=4, window=10, max_limit=4)
+        self.complete(limiter, 10, latency=0.01)
+        self.complete(limiter, 2, latency=0.1)
+        self.assertEqual(limiter.limit, 2)
+
+    def test_p95_is_nearest_rank(self):
+        limiter = AdaptiveLimiter(window=30)
+        for latency in range(1, 31):
+            self.complete(limiter, 1, latency=latency)
+        self.assertEqual(limiter._baseline, 29)
+
+    def test_acquire_blocks_at_limit(self):
+        limiter = AdaptiveLimiter(initial=1)
+        limiter.acquire()
+        acquired = threading.Event()
+
+        def wait():
+            limiter.acquire()
+            acquired.set()
+
+        thread = threading.Thread(target=wait)
+        thread.start()
+        self.assertFalse(acquired.wait(0.05))
+        limiter.release(0.01)
+        self.assertTrue(acquired.wait(1))
+        thread.join()
+        self.assertEqual(limiter.in_flight, 1)
+
+
+class TestAdaptiveRequests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.semaphore = Semaphore('Api-Token', adaptive_concurrency=True)
+
+    def test_limit_is_queryable(self):
+        self.assertEqual(self.semaphore.concurrency_limit, 4)
+        self.assertIs(self.semaphore.teams._limiter, self.semaphore._limiter)
+        self.assertIsNone(Semaphore('Api-Token').concurrency_limit)
+
+    @patch('requests.Session.request')
+    def test_throttling_decreases_limit(self, request):
+        request.side_effect = [
+            MagicMock(status_code=429, headers={'Retry-After': '0'}),
+            self.mock_data
+        ]
+        self.semaphore.teams.by_id('id')
+        self.assertEqual(self.semaphore.concurrency_limit, 2)
+        self.assertEqual(self.semaphore._limiter.in_flight, 0)
+
+    @patch('requests.Session.request')
+    def test_timeout_decreases_limit(self, request):
+        request.side_effect = Timeout()
+        self.assertRaises(Timeout, self.semaphore.teams.by_id, 'id')
+        self.assertEqual(self.semaphore.concurrency_limit, 2)
+        self.assertEqual(self.semaphore._limiter.in_flight, 0)
+
+    @patch('requests.Session.request')
+    def test_batch_is_bounded_by_limit(self, request):
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def slow_response(*args, **kwargs):
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.pop()
+            return self.mock_data
+
+        request.side_effect = slow_response
+        semaphore = Semaphore('Api-Token', pool_maxsize=8, coalesce=False,
+                              adaptive_concurrency=True)
+        semaphore.map(semaphore.teams.by_id, ['id'] * 8)
+        self.assertLessEqual(max(peak), 4)
@@ -0,0 +1,104 @@
+import unittest
+
+from semaphore.crawler import Crawler, Inventory
+
+from .test_mock_server import MockServerTestCase
+
+
+class TestInventory(unittest.TestCase):
+    def setUp(self):
+        self.inventory = Inventory('acme')
+        self.inventory.add('teams', {'id': 't1', 'name': 'backend'})
+        self.inventory.add('projects', {'id': 'p1', 'name': 'api'})
+        self.inventory.add('secrets', {'id': 's1', 'name': 'deploy'})
+        self.inventory.add('secrets', {'id': 's2', 'name': 'keys'})
+        self.inventory.link('teams', 't1', 'projects', 'p1')
+        self.inventory.link('projects', 'p1', 'secrets', 's1')
+        self.inventory.link('teams', 't1', 'secrets', 's1')
+        self.inventory.link('teams', 't1', 'secrets', 's2')
+
+    def test_add_keeps_first_object(self):
+        self.inventory.add('teams', {'id': 't1', 'name': 'other'})
+        self.assertEqual(self.inventory.get('teams', 't1')['name'], 'backend')
+        self.assertEqual(len(self.inventory), 4)
+
+    def test_users_by_username(self):
+        self.assertEqual(self.inventory.add('users', {'username': 'mike'}), 'mike')
+        self.assertEqual(self.inventory.get('users', 'mike'), {'username': 'mike'})
+
+    def test_relations_are_undirected(self):
+        self.assertEqual(self.inventory.related('projects', 'p1', 'teams'),
+                         [{'id': 't1', 'name': 'backend'}])
+        self.assertEqual(self.inventory.team_projects('t1'),
+                         [{'id': 'p1', 'name': 'api'}])
+
+    def test_team_secrets_are_unique(self):
+        names = sorted(secret['name'] for secret in self.inventory.team_secrets('t1'))
+        self.assertEqual(names, ['deploy', 'keys'])
+
+    def test_unknown_object(self):
+        self.assertIsNone(self.inventory.get('teams', 'missing'))
+        self.assertEqual(self.inventory.related('teams', 'missing', 'projects'), [])
+
+
+class TestCrawler(MockServerTestCase):
+    def test_crawl(self):
+        inventory = Crawler(self.semaphore, max_workers=4).crawl(self.org)
+
+        self.assertEqual(inventory.errors, [])
+        self.assertEqual(inventory.get('orgs', 'acme')['username'], 'acme')
+        self.assertEqual(len(inventory.nodes['projects']), 10)
+        self.assertEqual(len(inventory.nodes['teams']), 2)
+        self.assertEqual(len(inventory.nodes['users']), 3)
+        self.assertEqual(len(inventory.nodes['secrets']), 2)
+        self.assertEqual(len(inventory.nodes['env_vars']), 4)
+        self.assertEqual(len(inventory.nodes['config_files']), 2)
+
+    def test_relations(self):
+        inventory = Crawler(self.semaphore).crawl(self.org)
+        state = self.server.state
+
+        for team_id, project_ids in state.team_projects.items():
+            projects = {project['id'] for project in inventory.team_projects(team_id)}
+            self.assertEqual(projects, project_ids)
+            users = inventory.related('teams', team_id, 'users')
+            self.assertEqual({user['username'] for user in users},
+                             state.team_users[team_id])
+            secrets = {secret['id'] for secret in inventory.team_secrets(team_id)}
+            self.assertTrue(state.team_secrets[team_id] <= secrets)
+
+    def test_objects_are_fetched_once(self):
+        inventory = Crawler(self.semaphore).crawl(self.org)
+
+        # org, its 4 lists, 2 per project, 2 per team and 2 per secret
+        self.assertEqual(inventory.requests, 1 + 4 + 2 * 10 + 2 * 2 + 2 * 2)
+
+    def test_skip_users_and_contents(self):
+        crawler = Crawler(self.semaphore, users=False, secret_contents=False)
+        inventory = crawler.crawl(self.org)
+
+        self.assertEqual(inventory.nodes['users'], {})
+        self.assertEqual(inventory.nodes['env_vars'], {})
+        self.assertEqual(inventory.requests, 1 + 3 + 2 * 10 + 2)
+
+    def test_missing_organization(self):
+        inventory = Crawler(self.semaphore).crawl('missing')
+
+        self.assertEqual(len(inventory), 0)
+        self.assertEqual(inventory.errors, [])
+
+    def test_errors_are_collected(self):
+        error = ConnectionError('Connection refused')
+
+        def fail(*args, **kwargs):
+            raise error
+
+        self.semaphore.teams.all = fail
+        inventory = Crawler(self.semaphore).crawl(self.org)
+
+        self.assertEqual(inventory.errors, [(('org_teams', 'acme'), error)])
+        self.assertEqual(len(inventory.nodes['projects']), 10)
+
+    def test_default_workers(self):
+        self.assertEqual(Crawler(self.semaphore).max_workers,
+                         self.semaphore.pool_maxsize)
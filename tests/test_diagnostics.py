@@ -0,0 +1,124 @@
+import io
+import json
+
+from mock import MagicMock, patch
+
+from semaphore.client import Semaphore
+from semaphore.diagnostics import (
+    FlightRecorder,
+    ProfileReport,
+    categorize,
+    profile
+)
+from semaphore.transport import InMemoryTransport
+
+from .base import BaseTestCase
+
+
+class TestFlightRecorder(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.transport = InMemoryTransport()
+        self.transport.add('GET', '/v2/teams/1', json={'id': '1'},
+                           headers={'Content-Length': '11'})
+
+    def test_ring_buffer(self):
+        recorder = FlightRecorder(size=2)
+        semaphore = Semaphore('Api-Token', transport=self.transport,
+                              recorder=recorder)
+        semaphore.teams.by_id('1')
+        semaphore.teams.by_id('2')
+        semaphore.teams.by_id('1')
+
+        records = recorder.records()
+        self.assertEqual([record['status_code'] for record in records], [404, 200])
+        self.assertEqual(records[1]['endpoint'], 'teams/{team_id}')
+        self.assertEqual(records[1]['method'], 'GET')
+        self.assertEqual(records[1]['response_bytes'], 11)
+        self.assertEqual(records[1]['retries'], 0)
+        self.assertIsNone(records[1]['error'])
+
+    def test_dump(self):
+        recorder = FlightRecorder()
+        semaphore = Semaphore('Api-Token', transport=self.transport,
+                              recorder=recorder)
+        semaphore.teams.by_id('1')
+        output = io.StringIO()
+        recorder.dump(output)
+
+        self.assertEqual(json.loads(output.getvalue())['endpoint'], 'teams/{team_id}')
+        recorder.clear()
+        self.assertEqual(recorder.records(), [])
+
+    def test_slow_calls_are_counted_concurrently(self):
+        recorder = FlightRecorder(size=10, slow_threshold=0, on_slow=MagicMock())
+        semaphore = Semaphore('Api-Token', transport=self.transport,
+                              recorder=recorder, coalesce=False, pool_maxsize=8)
+        semaphore.map(semaphore.teams.by_id, ['1'] * 400)
+        self.assertEqual(recorder.slow_calls, 400)
+
+    def test_slow_call_dumps_buffer(self):
+        on_slow = MagicMock()
+        recorder = FlightRecorder(slow_threshold=0, on_slow=on_slow)
+        semaphore = Semaphore('Api-Token', transport=self.transport,
+                              recorder=recorder)
+        semaphore.teams.by_id('1')
+
+        records, slow = on_slow.call_args[0]
+        self.assertEqual(records, [slow])
+        self.assertEqual(recorder.slow_calls, 1)
+
+    @patch('sys.stderr', new_callable=io.StringIO)
+    def test_slow_call_default_output(self, stderr):
+        recorder = FlightRecorder(slow_threshold=0)
+        semaphore = Semaphore('Api-Token', transport=self.transport,
+                              recorder=recorder)
+        semaphore.teams.by_id('1')
+        self.assertIn('slow request GET teams/{team_id}', stderr.getvalue())
+
+    def test_fast_calls_are_not_dumped(self):
+        on_slow = MagicMock()
+        recorder = FlightRecorder(slow_threshold=60, on_slow=on_slow)
+        semaphore = Semaphore('Api-Token', transport=self.transport,
+                              recorder=recorder)
+        semaphore.teams.by_id('1')
+        on_slow.assert_not_called()
+
+
+class TestProfile(BaseTestCase):
+    def test_categorize(self):
+        cases = [
+            (('/usr/lib/python3/json/decoder.py', 'raw_decode'), 'json decode'),
+            (('~', "<built-in method _json.scanstring>"), 'json decode'),
+            (('/usr/lib/python3/urllib/parse.py', 'urlsplit'), 'url building'),
+            (('/pkg/semaphore/client.py', '_resource_url'), 'url building'),
+            (('/usr/lib/python3/http/client.py', 'parse_headers'),
+             'header handling'),
+            (('~', "<method 'recv_into' of '_socket.socket' objects>"), 'network'),
+            (('~', "<method 'acquire' of '_thread.lock' objects>"), 'waiting'),
+            (('/pkg/requests/sessions.py', 'request'), 'http library'),
+            (('/pkg/semaphore/client.py', '_send'), 'client'),
+            (('/pkg/app.py', 'main'), 'other')
+        ]
+        for (filename, function), category in cases:
+            self.assertEqual(categorize(filename, function), category)
+
+    def test_profile(self):
+        transport = InMemoryTransport()
+        transport.add('GET', '/v2/teams/1', json={'id': '1'})
+        semaphore = Semaphore('Api-Token', transport=transport)
+        with profile() as report:
+            for _ in range(10):
+                semaphore.teams.by_id('1')
+
+        self.assertIsInstance(report, ProfileReport)
+        self.assertGreater(report.wall, 0)
+        self.assertIn('client', report.cpu)
+        self.assertIn('json decode', report.cpu)
+        self.assertIn('self time by category', report.format())
+
+    def test_profile_without_memory(self):
+        with profile(memory=False) as report:
+            sum(range(100))
+        self.assertEqual(report.memory, {})
+        self.assertNotIn('memory by category', report.format())
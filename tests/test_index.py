@@ -0,0 +1,106 @@
+from semaphore.index import NameIndex
+
+from .test_mock_server import MockServerTestCase
+
+
+class TestNameIndex(MockServerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.index = self.semaphore.index
+        self.state = self.server.state
+        self.project_ids = {project['name']: project_id
+                            for project_id, project in self.state.projects.items()}
+
+    def count_request(self, event):
+        self.requests += 1
+
+    def test_id_and_name(self):
+        project_id = self.index.id('acme', 'projects', 'project-3')
+        self.assertEqual(project_id, self.project_ids['project-3'])
+        self.assertEqual(self.index.name('acme', 'projects', project_id), 'project-3')
+        for name, project_id in self.project_ids.items():
+            self.assertEqual(self.index.id('acme', 'projects', name), project_id)
+        self.assertEqual(self.index.loads, 1)
+
+    def test_unknown_name(self):
+        with self.assertRaises(KeyError):
+            self.index.id('acme', 'teams', 'missing')
+        with self.assertRaises(KeyError):
+            self.index.name('acme', 'teams', 'missing')
+        self.assertEqual(self.index.loads, 1)
+
+    def test_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            self.index.id('acme', 'users', 'user-0')
+
+    def test_filled_from_list_calls(self):
+        teams = self.semaphore.teams.all('acme')
+        self.assertEqual(self.index.id('acme', 'teams', teams[0]['name']),
+                         teams[0]['id'])
+        self.assertEqual(self.index.loads, 0)
+
+    def test_filled_from_iterated_lists(self):
+        projects = list(self.semaphore.projects.list('acme', iterate=True))
+        self.assertEqual(len(projects), len(self.project_ids))
+        self.requests = 0
+        self.semaphore.hooks.on('after_response', self.count_request)
+        for name, project_id in self.project_ids.items():
+            self.assertEqual(self.index.id('acme', 'projects', name), project_id)
+        self.assertEqual((self.index.loads, self.requests), (0, 0))
+
+    def test_filled_from_streamed_lists(self):
+        teams = list(self.semaphore.teams.all('acme', stream=True))
+        self.assertEqual(self.index.name('acme', 'teams', teams[-1]['id']),
+                         teams[-1]['name'])
+        self.assertEqual(self.index.loads, 0)
+
+    def test_create(self):
+        self.index.id('acme', 'secrets', 'secret-0')
+        secret = self.semaphore.secrets.create('acme', 'deploy', 'Deploy keys')
+
+        self.assertEqual(self.index.id('acme', 'secrets', 'deploy'), secret['id'])
+        self.assertEqual(self.index.loads, 1)
+
+    def test_update(self):
+        team = self.semaphore.teams.all('acme')[0]
+        team_id = self.index.id('acme', 'teams', team['name'])
+        self.semaphore.teams.update(team_id, 'admin', name='platform')
+
+        self.assertEqual(self.index.id('acme', 'teams', 'platform'), team_id)
+        self.assertEqual(self.index.name('acme', 'teams', team_id), 'platform')
+
+    def test_delete(self):
+        secret_id = self.index.id('acme', 'secrets', 'secret-1')
+        self.assertEqual(self.semaphore.secrets.delete(secret_id), 204)
+
+        with self.assertRaises(KeyError):
+            self.index.id('acme', 'secrets', 'secret-1')
+        self.assertEqual(self.index.loads, 1)
+
+    def test_failed_delete(self):
+        secret_id = self.index.id('acme', 'secrets', 'secret-1')
+        self.assertEqual(self.semaphore.secrets.delete('missing'), 404)
+        self.assertEqual(self.index.id('acme', 'secrets', 'secret-1'), secret_id)
+
+    def test_ttl(self):
+        self.index.ttl = 0
+        self.index.id('acme', 'projects', 'project-0')
+        self.index.id('acme', 'projects', 'project-0')
+        self.assertEqual(self.index.loads, 2)
+
+    def test_invalidate(self):
+        self.index.id('acme', 'projects', 'project-0')
+        self.index.id('acme', 'teams', self.semaphore.teams.all('acme')[0]['name'])
+        self.index.invalidate('acme', 'projects')
+        self.index.id('acme', 'projects', 'project-0')
+        self.assertEqual(self.index.loads, 2)
+
+        self.index.invalidate()
+        self.index.id('acme', 'projects', 'project-0')
+        self.assertEqual(self.index.loads, 3)
+
+    def test_standalone(self):
+        index = NameIndex(self.semaphore, ttl=60)
+        self.assertEqual(index.id('acme', 'projects', 'project-1'),
+                         self.project_ids['project-1'])
+        self.assertEqual(self.semaphore.index.loads, 0)
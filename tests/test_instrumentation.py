@@ -0,0 +1,148 @@
+from mock import patch
+
+from semaphore.client import Semaphore
+from semaphore.exceptions import RetryError
+from semaphore.instrumentation import (
+    EndpointMetrics,
+    Histogram,
+    Hooks,
+    RequestEvent,
+    endpoint_template
+)
+from semaphore.transport import InMemoryTransport
+
+from .base import BaseTestCase
+
+
+class TestEndpointTemplate(BaseTestCase):
+    def test_templates(self):
+        cases = {
+            'https://api.semaphoreci.com/v2//teams/1/users/mike':
+                'teams/{team_id}/users/{user_name}',
+            'https://api.semaphoreci.com/v2/orgs/acme/projects':
+                'orgs/{username}/projects',
+            '/v2/projects/1/secrets/2': 'projects/{project_id}/secrets/{secret_id}',
+            'env_vars/42': 'env_vars/{env_var_id}',
+            'https://api.semaphoreci.com/v2/': '',
+            'https://api.semaphoreci.com/v2/orgs?page=2': 'orgs'
+        }
+        for url, template in cases.items():
+            self.assertEqual(endpoint_template(url), template)
+
+
+class TestHistogram(BaseTestCase):
+    def test_observe(self):
+        histogram = Histogram((1, 5, 10))
+        for value in (0.5, 1, 3, 7, 20):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [2, 1, 1, 1])
+        self.assertEqual(histogram.count, 5)
+        self.assertEqual(histogram.sum, 31.5)
+        self.assertEqual(
+            histogram.cumulative(),
+            [(1, 2), (5, 3), (10, 4), (float('inf'), 5)]
+        )
+
+    def test_quantile(self):
+        histogram = Histogram((1, 5, 10))
+        for value in range(10):
+            histogram.observe(0.5)
+        histogram.observe(7)
+        self.assertEqual(histogram.quantile(0.5), 1)
+        self.assertEqual(histogram.quantile(0.99), 10)
+        self.assertEqual(Histogram().quantile(0.5), 0.0)
+
+
+class TestHooks(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.transport = InMemoryTransport()
+        self.semaphore = Semaphore('Api-Token', transport=self.transport)
+
+    def test_inactive_without_listeners(self):
+        hooks = Hooks()
+        self.assertFalse(hooks)
+        listener = hooks.on('after_response', lambda event: None)
+        self.assertTrue(hooks)
+        hooks.off('after_response', listener)
+        self.assertFalse(hooks)
+
+    def test_unknown_event(self):
+        self.assertRaises(ValueError, Hooks().on, 'after_request', print)
+
+    def test_events(self):
+        events = []
+        hooks = self.semaphore.hooks
+        hooks.on('before_request', lambda event: events.append(('before', event)))
+        hooks.on('after_response', lambda event: events.append(('after', event)))
+        self.transport.add('GET', '/v2/teams/1', json={'id': '1'},
+                           headers={'Content-Length': '11'})
+        self.semaphore.teams.by_id('1')
+
+        self.assertEqual([name for name, _ in events], ['before', 'after'])
+        event = events[1][1]
+        self.assertEqual(event.template, 'teams/{team_id}')
+        self.assertEqual(event.status_code, 200)
+        self.assertEqual(event.response_bytes, 11)
+        self.assertGreaterEqual(event.duration, 0)
+
+    def test_on_error(self):
+        errors = []
+        self.semaphore.hooks.on('on_error', errors.append)
+        self.transport.add('GET', '/v2/teams/1', status=429,
+                           headers={'Retry-After': '0'})
+        self.assertRaises(RetryError, self.semaphore.teams.by_id, '1')
+        self.assertIsInstance(errors[0].error, RetryError)
+        self.assertEqual(errors[0].retries, 3)
+
+    @patch('semaphore.client.RequestEvent', wraps=RequestEvent)
+    def test_no_events_without_listeners(self, event):
+        self.transport.add('GET', '/v2/teams/1', json={})
+        self.semaphore.teams.by_id('1')
+        event.assert_not_called()
+
+        self.semaphore.hooks.on('after_response', lambda event: None)
+        self.semaphore.teams.by_id('1')
+        event.assert_called_once()
+
+
+class TestEndpointMetrics(BaseTestCase):
+    def test_metrics_by_template(self):
+        transport = InMemoryTransport()
+        semaphore = Semaphore('Api-Token', transport=transport, metrics=True)
+        transport.add('GET', '/v2/teams/1', status=503, headers={'Retry-After': '0'})
+        transport.add('GET', '/v2/teams/1', json={'id': '1'},
+                      headers={'Content-Length': '11'})
+        semaphore.teams.by_id('1')
+        semaphore.teams.by_id('2')
+
+        stats = semaphore.metrics.snapshot()['GET teams/{team_id}']
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['retries'], 1)
+        self.assertEqual(stats['errors'], 1)
+        self.assertEqual(stats['statuses'], {200: 1, 404: 1})
+        self.assertEqual(stats['response_bytes_sum'], 11)
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(self.semaphore.metrics)
+        self.assertFalse(self.semaphore.hooks)
+
+    def test_attach_and_detach(self):
+        hooks = Hooks()
+        metrics = EndpointMetrics().attach(hooks)
+        self.assertTrue(hooks)
+        metrics.detach(hooks)
+        self.assertFalse(hooks)
+
+    def test_stats_are_copies(self):
+        transport = InMemoryTransport()
+        semaphore = Semaphore('Api-Token', transport=transport, metrics=True)
+        semaphore.teams.by_id('1')
+        stats = semaphore.metrics.stats()
+        semaphore.teams.by_id('1')
+
+        latency = stats[('GET', 'teams/{team_id}')].latency
+        self.assertEqual((latency.count, sum(latency.counts)), (1, 1))
+        self.assertEqual(
+            semaphore.metrics.stats()[('GET', 'teams/{team_id}')].requests, 2
+        )
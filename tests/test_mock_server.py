@@ -0,0 +1,124 @@
+import unittest
+
+from semaphore.cache import ResponseCache
+from semaphore.client import Semaphore
+from semaphore.exceptions import RetryError
+from semaphore.mock_server import MockSemaphoreServer
+from semaphore.transport import Urllib3Transport
+
+
+class MockServerTestCase(unittest.TestCase):
+    """Base class for tests which make real HTTP calls to a mock server"""
+    def setUp(self):
+        self.server = MockSemaphoreServer(per_page=4, api_token='Api-Token')
+        self.server.start()
+        self.org = self.server.seed(projects=10, teams=2, users=3, secrets=2)
+        self.semaphore = Semaphore('Api-Token', base_url=self.server.url)
+
+    def tearDown(self):
+        self.semaphore.close()
+        self.server.stop()
+
+
+class TestMockServer(MockServerTestCase):
+    def test_default_resources(self):
+        self.assertIn('orgs', self.semaphore.default_resources())
+
+    def test_organization(self):
+        self.assertEqual(self.semaphore.organization.by_name('acme')['username'],
+                         'acme')
+        self.assertEqual(len(self.semaphore.organization.users('acme')), 3)
+
+    def test_pagination(self):
+        self.assertEqual(len(self.semaphore.projects.list('acme')), 4)
+        projects = list(self.semaphore.projects.list('acme', iterate=True))
+        self.assertEqual(len(projects), 10)
+        self.assertEqual(len({project['id'] for project in projects}), 10)
+
+    def test_team_lifecycle(self):
+        team = self.semaphore.teams.create(
+            'acme',
+            name='backend',
+            permission='edit',
+            description='Backend team'
+        )
+        self.assertEqual(self.semaphore.teams.by_id(team['id'])['name'], 'backend')
+
+        updated = self.semaphore.teams.update(team['id'], 'admin', name='platform')
+        self.assertEqual(updated['permission'], 'admin')
+
+        self.assertEqual(self.semaphore.users.add(team['id'], 'user-0'), 204)
+        self.assertEqual(len(self.semaphore.users.team_members(team['id'])), 1)
+
+        self.assertEqual(self.semaphore.teams.delete(team['id']), 204)
+        self.assertEqual(self.semaphore.teams.delete(team['id']), 404)
+
+    def test_secrets_and_variables(self):
+        secret = self.semaphore.secrets.create('acme', 'deploy', 'Deploy keys')
+        env_var = self.semaphore.environment.create(
+            secret['id'], 'TOKEN', 'abc', encrypted=False
+        )
+        config_file = self.semaphore.config_files.create(
+            secret['id'], '/home/runner/key', 'key', False
+        )
+        project = self.semaphore.projects.create(
+            'acme', 'api', 'api', 'acme', 'github'
+        )
+        self.semaphore.secrets.attach_to_project(project['id'], secret['id'])
+
+        self.assertEqual(
+            self.semaphore.environment.all(project['id']),
+            [env_var]
+        )
+        self.assertEqual(
+            self.semaphore.config_files.secrets(secret['id']),
+            [config_file]
+        )
+        self.semaphore.environment.update(env_var['id'], content='def')
+        self.assertEqual(
+            self.semaphore.environment.by_id(env_var['id'])['content'],
+            'def'
+        )
+        secret = self.semaphore.secrets.by_id(secret['id'])
+        self.assertEqual(secret['env_vars_count'], 1)
+        self.assertEqual(
+            self.semaphore.secrets.dettach_from_project(project['id'], secret['id']),
+            204
+        )
+        self.assertEqual(self.semaphore.environment.all(project['id']), [])
+
+    def test_unauthorized(self):
+        semaphore = Semaphore('Wrong-Token', base_url=self.server.url)
+        self.assertEqual(semaphore.organization.list(), {'message': 'Unauthorized'})
+
+    def test_injected_errors_are_retried(self):
+        self.server.fail_next(429, count=2, retry_after=0)
+        self.assertEqual(len(self.semaphore.organization.list()), 1)
+
+        self.server.fail_next(503, count=4, retry_after=0)
+        self.assertRaises(RetryError, self.semaphore.organization.list)
+
+    def test_conditional_requests(self):
+        cache = ResponseCache()
+        semaphore = Semaphore('Api-Token', base_url=self.server.url, cache=cache)
+        semaphore.teams.all('acme')
+        semaphore.teams.all('acme')
+        self.assertEqual(cache.revalidations, 1)
+
+    def test_urllib3_transport(self):
+        semaphore = Semaphore(
+            'Api-Token',
+            base_url=self.server.url,
+            transport=Urllib3Transport()
+        )
+        projects = list(semaphore.projects.list('acme', iterate=True))
+        self.assertEqual(len(projects), 10)
+        semaphore.close()
+
+    def test_concurrent_requests_are_counted(self):
+        self.server.requests = 0
+        semaphore = Semaphore('Api-Token', base_url=self.server.url,
+                              pool_maxsize=16, coalesce=False)
+        semaphore.map(semaphore.organization.by_name, ['acme'] * 200)
+        semaphore.close()
+        self.assertEqual(self.server.requests, 200)
@@ -0,0 +1,125 @@
+import pickle
+
+from semaphore.client import Semaphore
+from semaphore.models import (
+    EnvVar,
+    Organization,
+    Project,
+    Record,
+    Secret,
+    Team,
+    User,
+    decode,
+    model_for
+)
+from semaphore.transport import InMemoryTransport
+
+from .base import BaseTestCase
+
+PROJECT = {
+    'id': 'c1b6e0e1',
+    'name': 'api',
+    'url': 'https://api.semaphoreci.com/v2/projects/c1b6e0e1',
+    'html_url': 'https://semaphoreci.com/acme/api',
+    'created_at': '2018-01-01T00:00:00Z',
+    'updated_at': '2018-01-02T00:00:00Z'
+}
+
+
+class TestModels(BaseTestCase):
+    def test_fields(self):
+        project = Project(dict(PROJECT))
+        self.assertEqual(project.name, 'api')
+        self.assertEqual(project['id'], 'c1b6e0e1')
+        self.assertEqual(project.get('missing', 1), 1)
+        self.assertIn('html_url', project)
+        self.assertEqual(project.as_dict(), PROJECT)
+        self.assertEqual(project, PROJECT)
+        self.assertFalse(hasattr(project, '__dict__'))
+        self.assertIsNone(project._extra)
+
+    def test_ids_are_interned(self):
+        first = Project({'id': ''.join(['c1b6', 'e0e1'])})
+        second = Team({'id': ''.join(['c1b6e', '0e1'])})
+        self.assertIs(first.id, second.id)
+
+    def test_missing_and_unknown_fields(self):
+        team = Team({'id': '1', 'members': 3})
+        self.assertIsNone(team.description)
+        self.assertEqual(team.members, 3)
+        self.assertEqual(team['members'], 3)
+        self.assertRaises(AttributeError, getattr, team, 'missing')
+        self.assertRaises(KeyError, team.__getitem__, 'missing')
+
+    def test_missing_fields_behave_like_dict_keys(self):
+        data = {'id': '1', 'name': 'TOKEN', 'encrypted': True, 'shared': None}
+        env_var = EnvVar(data)
+        for key in ('content', 'shared', 'id', 'missing'):
+            self.assertEqual(key in env_var, key in data)
+            self.assertEqual(env_var.get(key, 'default'), data.get(key, 'default'))
+        self.assertRaises(KeyError, env_var.__getitem__, 'content')
+        self.assertIsNone(env_var.content)
+        self.assertEqual(env_var.as_dict(), data)
+        self.assertEqual(pickle.loads(pickle.dumps(env_var)).as_dict(), data)
+
+    def test_nested_fields_are_wrapped_on_access(self):
+        project = Project({'id': '1', 'owner': {'username': 'acme', 'plan': {}},
+                           'branches': [{'name': 'master'}]})
+        self.assertIsInstance(project._extra['owner'], dict)
+        self.assertIsInstance(project.owner, Record)
+        self.assertEqual(project.owner.username, 'acme')
+        self.assertEqual(project.branches[0].name, 'master')
+        self.assertEqual(project['owner'], {'username': 'acme', 'plan': {}})
+
+    def test_pickle(self):
+        project = Project(dict(PROJECT, extra=1))
+        self.assertEqual(pickle.loads(pickle.dumps(project)), project)
+
+    def test_model_for(self):
+        cases = {
+            'orgs': Organization,
+            'orgs/acme': Organization,
+            'orgs/acme/projects': Project,
+            'teams/1/users': User,
+            'projects/1/secrets/2': Secret,
+            'https://api.semaphoreci.com/v2/secrets/1/env_vars?page=2': EnvVar,
+            '': None
+        }
+        for resource, model in cases.items():
+            self.assertIs(model_for(resource), model)
+
+    def test_decode(self):
+        projects = decode('orgs/acme/projects', [PROJECT, PROJECT])
+        self.assertEqual([type(p) for p in projects], [Project, Project])
+        self.assertEqual(decode(None, {'orgs': 'url'}), {'orgs': 'url'})
+
+
+class TestClientModels(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.transport = InMemoryTransport()
+        self.transport.add('GET', '/v2/orgs/acme/projects', json=[PROJECT])
+        self.transport.add('GET', '/v2/projects/1/secrets', json=[{'id': 's'}],
+                           headers={'Link': '</v2/projects/1/secrets?page=2>; '
+                                            'rel="next"'})
+        self.transport.add('GET', '/v2/projects/1/secrets?page=2',
+                           json=[{'id': 't'}])
+        self.transport.add('POST', '/v2/orgs/acme/teams', json={'id': '1'})
+
+    def test_models_are_opt_in(self):
+        semaphore = Semaphore('Api-Token', transport=self.transport)
+        self.assertIsInstance(semaphore.projects.list('acme')[0], dict)
+
+    def test_models(self):
+        semaphore = Semaphore('Api-Token', transport=self.transport, models=True)
+        project = semaphore.projects.list('acme')[0]
+        self.assertIsInstance(project, Project)
+        self.assertEqual(project.name, 'api')
+
+        team = semaphore.teams.create('acme', name='team', permission='read',
+                                      description=None)
+        self.assertIsInstance(team, Team)
+
+        secrets = list(semaphore.secrets.project('1', iterate=True))
+        self.assertEqual([secret.id for secret in secrets], ['s', 't'])
+        self.assertIsInstance(secrets[1], Secret)
@@ -0,0 +1,106 @@
+import threading
+from urllib.request import urlopen
+
+from semaphore.cache import ResponseCache
+from semaphore.client import Semaphore
+from semaphore.prometheus import CONTENT_TYPE, MetricsServer, _labels, render
+from semaphore.transport import InMemoryTransport
+
+from .base import BaseTestCase
+
+
+class TestPrometheus(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.transport = InMemoryTransport()
+        self.transport.add('GET', '/v2/teams/1', json={'id': '1'},
+                           headers={'ETag': '"v1"', 'Content-Length': '11'})
+        self.transport.add('GET', '/v2/teams/1', status=304)
+        self.semaphore = Semaphore(
+            'Api-Token',
+            transport=self.transport,
+            metrics=True,
+            cache=ResponseCache(),
+            adaptive_concurrency=True
+        )
+
+    def test_request_metrics(self):
+        self.semaphore.teams.by_id('1')
+        self.semaphore.teams.by_id('1')
+        self.semaphore.teams.by_id('2')
+        text = render(self.semaphore)
+
+        labels = 'method="GET",endpoint="teams/{team_id}"'
+        self.assertIn(
+            f'semaphore_client_requests_total{{{labels},status="200"}} 1', text
+        )
+        self.assertIn(
+            f'semaphore_client_requests_total{{{labels},status="304"}} 1', text
+        )
+        self.assertIn(
+            f'semaphore_client_requests_total{{{labels},status="404"}} 1', text
+        )
+        self.assertIn(f'semaphore_client_errors_total{{{labels}}} 1', text)
+        self.assertIn(
+            f'semaphore_client_request_duration_seconds_bucket'
+            f'{{{labels},le="+Inf"}} 3',
+            text
+        )
+        self.assertIn('# TYPE semaphore_client_request_duration_seconds histogram',
+                      text)
+        self.assertIn('semaphore_client_requests_in_flight 0', text)
+
+    def test_cache_and_limiter_metrics(self):
+        self.semaphore.teams.by_id('1')
+        self.semaphore.teams.by_id('1')
+        text = render(self.semaphore)
+
+        self.assertIn('semaphore_client_cache_misses_total 1', text)
+        self.assertIn('semaphore_client_cache_revalidations_total 1', text)
+        self.assertIn('semaphore_client_cache_hit_ratio 0.5', text)
+        self.assertIn('semaphore_client_concurrency_limit 4', text)
+
+    def test_disabled_features_are_omitted(self):
+        semaphore = Semaphore('Api-Token', transport=self.transport,
+                              adaptive_concurrency=False)
+        self.assertEqual(render(semaphore), '')
+
+    def test_render_during_requests(self):
+        semaphore = Semaphore('Api-Token', transport=InMemoryTransport(),
+                              metrics=True, coalesce=False)
+        done = threading.Event()
+
+        def make_requests():
+            index = 0
+            while not done.is_set():
+                index += 1
+                semaphore.teams.by_id(str(index))
+                semaphore.projects.list(f'org-{index}')
+
+        threads = [threading.Thread(target=make_requests) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        try:
+            for _ in range(200):
+                lines = render(semaphore).splitlines()
+                infinite = [line for line in lines
+                            if 'request_duration_seconds_bucket' in line
+                            and 'le="+Inf"' in line]
+                counts = [line for line in lines
+                          if 'request_duration_seconds_count' in line]
+                self.assertEqual([line.rsplit(' ', 1)[1] for line in infinite],
+                                 [line.rsplit(' ', 1)[1] for line in counts])
+        finally:
+            done.set()
+            for thread in threads:
+                thread.join()
+
+    def test_label_escaping(self):
+        self.assertEqual(_labels(endpoint='a"b\\c\n'), '{endpoint="a\\"b\\\\c\\n"}')
+
+    def test_http_server(self):
+        self.semaphore.teams.by_id('1')
+        with MetricsServer(self.semaphore, port=0) as server:
+            response = urlopen(server.url)
+            self.assertEqual(response.headers['Content-Type'], CONTENT_TYPE)
+            self.assertIn(b'semaphore_client_requests_total', response.read())
@@ -0,0 +1,100 @@
+import time
+from email.utils import formatdate
+
+from mock import MagicMock, patch
+
+from semaphore.client import Semaphore
+from semaphore.exceptions import RetryError
+from semaphore.ratelimit import RateLimiter, RetryPolicy
+
+from .base import BaseTestCase
+
+
+class TestRateLimiter(BaseTestCase):
+    def test_burst_is_not_delayed(self):
+        limiter = RateLimiter(rate=100, burst=5)
+        self.assertEqual([limiter._reserve() for _ in range(5)], [0] * 5)
+
+    def test_waits_when_bucket_is_empty(self):
+        limiter = RateLimiter(rate=10, burst=1)
+        limiter._reserve()
+        self.assertAlmostEqual(limiter._reserve(), 0.1, places=2)
+        self.assertAlmostEqual(limiter._reserve(), 0.2, places=2)
+
+    def test_acquire_keeps_rate(self):
+        limiter = RateLimiter(rate=200, burst=1)
+        started = time.monotonic()
+        for _ in range(11):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.045)
+
+    def test_rate_must_be_positive(self):
+        self.assertRaises(ValueError, RateLimiter, 0)
+
+
+class TestRetryPolicy(BaseTestCase):
+    def test_should_retry(self):
+        policy = RetryPolicy()
+        self.assertTrue(policy.should_retry(429))
+        self.assertTrue(policy.should_retry(503))
+        self.assertFalse(policy.should_retry(500))
+
+    def test_backoff_is_jittered_and_bounded(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=4)
+        for attempt in range(6):
+            delay = policy.delay(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(4, 2 ** attempt))
+
+    def test_retry_after_seconds(self):
+        self.assertEqual(RetryPolicy().delay(0, '2'), 2)
+
+    def test_retry_after_date(self):
+        value = formatdate(time.time() + 10, usegmt=True)
+        self.assertAlmostEqual(RetryPolicy().delay(0, value), 10, delta=1.5)
+
+    def test_retry_after_is_bounded(self):
+        self.assertEqual(RetryPolicy(max_backoff=5).delay(0, '120'), 5)
+
+    def test_invalid_retry_after_falls_back_to_backoff(self):
+        self.assertLessEqual(RetryPolicy(backoff_factor=1).delay(0, 'soon'), 1)
+
+
+class TestThrottledRequests(BaseTestCase):
+    def throttled(self, retry_after='0'):
+        return MagicMock(status_code=429, headers={'Retry-After': retry_after})
+
+    @patch('requests.Session.request')
+    def test_retries_throttled_request(self, request):
+        request.side_effect = [self.throttled(), self.throttled(), self.mock_data]
+        self.semaphore.teams.by_id('id')
+        self.assertEqual(request.call_count, 3)
+
+    @patch('requests.Session.request')
+    def test_raises_after_all_retries(self, request):
+        request.return_value = self.throttled()
+        semaphore = Semaphore('Api-Token', max_retries=2)
+        with self.assertRaises(RetryError) as error:
+            semaphore.teams.by_id('id')
+        self.assertEqual(error.exception.status_code, 429)
+        self.assertEqual(request.call_count, 3)
+
+    @patch('requests.Session.request')
+    def test_retries_disabled(self, request):
+        request.return_value = self.throttled()
+        semaphore = Semaphore('Api-Token', max_retries=0)
+        semaphore.teams.by_id('id')
+        self.assertEqual(request.call_count, 1)
+
+    @patch('semaphore.client.time.sleep')
+    @patch('requests.Session.request')
+    def test_honours_retry_after(self, request, sleep):
+        request.side_effect = [self.throttled('3'), self.mock_data]
+        self.semaphore.teams.by_id('id')
+        sleep.assert_called_once_with(3)
+
+    def test_resources_share_rate_limiter(self):
+        semaphore = Semaphore('Api-Token', rate_limit=5)
+        self.assertIsInstance(semaphore.teams._rate_limiter, RateLimiter)
+        self.assertIs(semaphore.teams._rate_limiter, semaphore.secrets._rate_limiter)
+        self.assertIsNone(self.semaphore.teams._rate_limiter)
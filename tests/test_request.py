@@ -1,3 +1,12 @@
+import os
+import subprocess
+import sys
+
+from mock import MagicMock, patch
+
+from semaphore.client import TeamResource
+from semaphore.transport import RequestsTransport
+
 from .base import BaseTestCase
 
 
@@ -25,3 +34,110 @@ class TestBaseRequest(BaseTestCase):
                 request_client Fixture of Request instance
         """
         self.assertRaises(AssertionError, self.base_request._make_url, '1')
+
+
+class TestSharedSession(BaseTestCase):
+    def test_resources_share_transport(self):
+        transport = self.semaphore._transport
+        resources = (
+            self.semaphore.organization,
+            self.semaphore.teams,
+            self.semaphore.users,
+            self.semaphore.projects,
+            self.semaphore.secrets,
+            self.semaphore.environment,
+            self.semaphore.config_files
+        )
+        for resource in resources:
+            self.assertIs(resource._transport, transport)
+
+    def test_resources_are_created_lazily(self):
+        self.assertNotIn('teams', self.semaphore.__dict__)
+        teams = self.semaphore.teams
+        self.assertIsInstance(teams, TeamResource)
+        self.assertIs(self.semaphore.teams, teams)
+        self.assertIs(self.semaphore.__dict__['teams'], teams)
+
+    def test_session_is_created_lazily(self):
+        transport = RequestsTransport()
+        self.assertIsNone(transport._session)
+        transport.close()
+        self.assertIs(transport.session, transport.session)
+
+    def test_construction_does_not_import_requests(self):
+        code = (
+            'import sys\n'
+            'from semaphore.client import Semaphore\n'
+            'Semaphore("token").teams\n'
+            'print("requests" in sys.modules)'
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.check_output([sys.executable, '-c', code], cwd=root)
+        self.assertEqual(output.strip(), b'False')
+
+    def test_pool_size(self):
+        semaphore = self.semaphore.__class__('Api-Token', pool_maxsize=32)
+        session = semaphore._transport.session
+        adapter = session.get_adapter('https://api.semaphoreci.com')
+        self.assertEqual(adapter._pool_maxsize, 32)
+
+    @patch('requests.Session.request')
+    def test_request_goes_through_session(self, request):
+        request.return_value = self.mock_data
+        self.semaphore.teams.by_id('id')
+        request.assert_called_once_with(
+            'GET',
+            'https://api.semaphoreci.com/v2//teams/id',
+            headers={'Authorization': 'Token Api-Token'}
+        )
+
+    @patch('requests.Session.close')
+    def test_close(self, close):
+        self.assertIsNotNone(self.semaphore._transport.session)
+        with self.semaphore:
+            pass
+        close.assert_called_once_with()
+
+
+class TestPagination(BaseTestCase):
+    def pages(self, *pages):
+        responses = []
+        for number, page in enumerate(pages, start=1):
+            links = {}
+            if number < len(pages):
+                url = f'https://api.semaphoreci.com/v2/page/{number + 1}'
+                links['next'] = {'url': url}
+            responses.append(MagicMock(links=links, **{'json.return_value': page}))
+        return responses
+
+    @patch('requests.Session.request')
+    def test_iterate_follows_next_links(self, request):
+        request.side_effect = self.pages([1, 2], [3, 4], [5])
+        users = self.semaphore.organization.users('mikezz', iterate=True)
+        self.assertEqual(list(users), [1, 2, 3, 4, 5])
+        self.assertEqual(
+            request.call_args_list[1][0],
+            ('GET', 'https://api.semaphoreci.com/v2/page/2')
+        )
+
+    @patch('requests.Session.request')
+    def test_iterate_is_lazy(self, request):
+        request.side_effect = self.pages([1, 2], [3])
+        projects = self.semaphore.projects.list('mikezz', iterate=True)
+        request.assert_not_called()
+        self.assertEqual(next(projects), 1)
+        projects.close()
+
+    @patch('requests.Session.request')
+    def test_single_page(self, request):
+        request.side_effect = self.pages([{'id': 1}])
+        self.assertEqual(
+            list(self.semaphore.secrets.all('mikezz', iterate=True)),
+            [{'id': 1}]
+        )
+        self.assertEqual(request.call_count, 1)
+
+    @patch('requests.Session.request')
+    def test_without_iterate_returns_first_page(self, request):
+        request.side_effect = self.pages([1, 2], [3])
+        self.assertEqual(self.semaphore.teams.all('mikezz'), [1, 2])
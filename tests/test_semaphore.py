@@ -5,11 +5,11 @@ from .base import BaseTestCase
 
 class TestBaseSemaphore(BaseTestCase):
 
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_default_resources(self, request):
         self.return_assert(request, self.semaphore.default_resources())
 
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_transform_resources_to_list(self, request):
         self.return_assert(
             request,
@@ -18,32 +18,32 @@ class TestBaseSemaphore(BaseTestCase):
 
 
 class TestOrganizationResource(BaseTestCase):
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_organization_list(self, request):
         self.return_assert(request, self.semaphore.organization.list())
 
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_organization_by_name(self, request):
         self.return_assert(
             request,
             self.semaphore.organization.by_name('test-org')
         )
 
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_organization_urls(self, request):
         self.return_assert(
             request,
             self.semaphore.organization.urls('mikezz')
         )
 
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_organization_secret_urls(self, request):
         self.return_assert(
             request,
             self.semaphore.organization.urls('mikezz')
         )
 
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_organization_users(self, request):
         self.return_assert(
             request,
@@ -52,32 +52,32 @@ class TestOrganizationResource(BaseTestCase):
 
 
 class TestTeamResource(BaseTestCase):
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_team_list(self, request):
         self.return_assert(request, self.semaphore.teams.all('mikezz'))
 
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_users_by_project(self, request):
         self.return_assert(
             request,
             self.semaphore.teams.by_project('mikezz')
         )
 
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_team_secrets(self, request):
         self.return_assert(
             request,
             self.semaphore.teams.secrets('secret id')
         )
 
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_get_team_by_id(self, request):
         self.return_assert(
             request,
             self.semaphore.teams.by_id('id')
         )
 
-    @patch('semaphore.client.r.post')
+    @patch('requests.Session.request')
     def test_create_team(self, requests):
         data = {
             'name': 'test name',
@@ -89,7 +89,7 @@ class TestTeamResource(BaseTestCase):
             self.semaphore.teams.create('id', **data)
         )
 
-    @patch('semaphore.client.r.delete')
+    @patch('requests.Session.request')
     def test_delete_team(self, request):
         return self.return_assert(
             request,
@@ -98,35 +98,35 @@ class TestTeamResource(BaseTestCase):
 
 
 class TestUsersResource(BaseTestCase):
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_list_of_users(self, request):
         self.return_assert(
             request,
             self.semaphore.users.list('mikezz')
         )
 
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_members_of_team(self, request):
         self.return_assert(
             request,
             self.semaphore.users.team_members('mikezz')
         )
 
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_members_of_project(self, request):
         self.return_assert(
             request,
             self.semaphore.users.project_members('mikezz')
         )
 
-    @patch('semaphore.client.r.post')
+    @patch('requests.Session.request')
     def test_add_user_to_team(self, request):
         self.return_assert(
             request,
             self.semaphore.users.add('project id', 'user id')
         )
 
-    @patch('semaphore.client.r.delete')
+    @patch('requests.Session.request')
     def test_remove_user_from_team(self, request):
         self.return_assert(
             request,
@@ -142,42 +142,42 @@ class TestProjectsResource(BaseTestCase):
         'repo_provider': 'github'
     }
 
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_list_of_projects(self, request):
         self.return_assert(
             request,
             self.semaphore.projects.list('mikezz')
         )
 
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_added_projects(self, request):
         self.return_assert(
             request,
             self.semaphore.projects.added_projects('id')
         )
 
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_project_secrets(self, request):
         self.return_assert(
             request,
             self.semaphore.projects.project_secrets('id')
         )
 
-    @patch('semaphore.client.r.post')
+    @patch('requests.Session.request')
     def test_create_project(self, request):
         self.return_assert(
             request,
             self.semaphore.projects.create('mikezz', **self.TEST_DATA)
         )
 
-    @patch('semaphore.client.r.post')
+    @patch('requests.Session.request')
     def test_add_project_for_team(self, request):
         self.return_assert(
             request,
             self.semaphore.projects.add_team('project', 'team')
         )
 
-    @patch('semaphore.client.r.delete')
+    @patch('requests.Session.request')
     def test_delete_project_from_team(self, request):
         self.return_assert(
             request,
@@ -186,70 +186,70 @@ class TestProjectsResource(BaseTestCase):
 
 
 class TestSecretsResource(BaseTestCase):
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_all_secrets(self, request):
         self.return_assert(
             request,
             self.semaphore.secrets.all('mikezz')
         )
 
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_secrets_team(self, request):
         self.return_assert(
             request,
             self.semaphore.secrets.team('team id')
         )
 
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_secrets_project(self, request):
         self.return_assert(
             request,
             self.semaphore.secrets.project('project id')
         )
 
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_get_secret_by_id(self, request):
         self.return_assert(
             request,
             self.semaphore.secrets.by_id('project id')
         )
 
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_create_secret(self, request):
         self.return_assert(
             request,
             self.semaphore.secrets.create('org name', 'secret name')
         )
 
-    @patch('semaphore.client.r.patch')
+    @patch('requests.Session.request')
     def test_update_secret(self, request):
         self.return_assert(
             request,
             self.semaphore.secrets.update('id of secret', 'update secret name')
         )
 
-    @patch('semaphore.client.r.patch')
+    @patch('requests.Session.request')
     def test_delete_secret(self, request):
         self.return_assert(
             request,
             self.semaphore.secrets.delete('secret id')
         )
 
-    @patch('semaphore.client.r.patch')
+    @patch('requests.Session.request')
     def test_attach_secret_to_project(self, request):
         self.return_assert(
             request,
             self.semaphore.secrets.attach_to_project('project id', 'secret id')
         )
 
-    @patch('semaphore.client.r.delete')
+    @patch('requests.Session.request')
     def test_delete_from_team(self, request):
         self.return_assert(
             request,
             self.semaphore.secrets.delete_from_team('team id', 'secret id')
         )
 
-    @patch('semaphore.client.r.delete')
+    @patch('requests.Session.request')
     def test_dettatach_secret(self, request):
         self.return_assert(
             request,
@@ -258,21 +258,21 @@ class TestSecretsResource(BaseTestCase):
 
 
 class TestEnvironmentResource(BaseTestCase):
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_all_environments(self, request):
         self.return_assert(
             request,
             self.semaphore.environment.all('project id')
         )
 
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_secrets_environment(self, request):
         self.return_assert(
             request,
             self.semaphore.environment.secrets('secret id')
         )
 
-    @patch('semaphore.client.r.post')
+    @patch('requests.Session.request')
     def test_create_environment(self, request):
         self.return_assert(
             request,
@@ -283,7 +283,7 @@ class TestEnvironmentResource(BaseTestCase):
             )
         )
 
-    @patch('semaphore.client.r.patch')
+    @patch('requests.Session.request')
     def test_update_environment(self, request):
         self.return_assert(
             request,
@@ -294,7 +294,7 @@ class TestEnvironmentResource(BaseTestCase):
             )
         )
 
-    @patch('semaphore.client.r.delete')
+    @patch('requests.Session.request')
     def test_delete_environment(self, request):
         self.return_assert(
             request,
@@ -303,28 +303,28 @@ class TestEnvironmentResource(BaseTestCase):
 
 
 class TestConfigFileResource(BaseTestCase):
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_all_files(self, request):
         self.return_assert(
             request,
             self.semaphore.config_files.all('project id')
         )
 
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_secret_files(self, request):
         self.return_assert(
             request,
             self.semaphore.config_files.secrets('secret id')
         )
 
-    @patch('semaphore.client.r.get')
+    @patch('requests.Session.request')
     def test_by_id(self, request):
         self.return_assert(
             request,
             self.semaphore.config_files.by_id('config id')
         )
 
-    @patch('semaphore.client.r.post')
+    @patch('requests.Session.request')
     def test_create_file(self, request):
         self.return_assert(
             request,
@@ -336,7 +336,7 @@ class TestConfigFileResource(BaseTestCase):
             )
         )
 
-    @patch('semaphore.client.r.patch')
+    @patch('requests.Session.request')
     def test_update_file(self, request):
         self.return_assert(
             request,
@@ -347,7 +347,7 @@ class TestConfigFileResource(BaseTestCase):
             )
         )
 
-    @patch('semaphore.client.r.patch')
+    @patch('requests.Session.request')
     def test_delete_file(self, request):
         self.return_assert(
             request,
@@ -0,0 +1,118 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from mock import patch
+
+from semaphore.client import Semaphore
+from semaphore.singleflight import SingleFlight
+
+from .base import BaseTestCase
+
+
+class TestSingleFlight(BaseTestCase):
+    def test_concurrent_calls_are_coalesced(self):
+        group = SingleFlight()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return {'id': 1}
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(group.do, 'key', fetch) for _ in range(8)]
+            results = [future.result() for future in futures]
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result == {'id': 1} for result in results))
+        self.assertEqual(group.in_flight, 0)
+
+    def test_shared_result_is_copied(self):
+        group = SingleFlight()
+        started = threading.Event()
+
+        def fetch():
+            started.set()
+            time.sleep(0.05)
+            return {'id': 1}
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(group.do, 'key', fetch)
+            started.wait()
+            follower = executor.submit(group.do, 'key', fetch)
+            leader.result()['id'] = 2
+            self.assertEqual(follower.result(), {'id': 1})
+        self.assertIsNot(leader.result(), follower.result())
+
+    def test_shared_result_without_copy(self):
+        group = SingleFlight(copy=None)
+        started = threading.Event()
+
+        def fetch():
+            started.set()
+            time.sleep(0.05)
+            return {'id': 1}
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(group.do, 'key', fetch)
+            started.wait()
+            follower = executor.submit(group.do, 'key', fetch)
+            self.assertIs(leader.result(), follower.result())
+
+    def test_single_caller_result_is_not_copied(self):
+        result = {'id': 1}
+        self.assertIs(SingleFlight().do('key', lambda: result), result)
+
+    def test_different_keys_are_not_coalesced(self):
+        group = SingleFlight()
+        self.assertEqual(group.do('a', lambda: 'a'), 'a')
+        self.assertEqual(group.do('b', lambda: 'b'), 'b')
+
+    def test_error_is_shared(self):
+        group = SingleFlight()
+        started = threading.Event()
+
+        def fail():
+            started.set()
+            time.sleep(0.05)
+            raise ValueError('boom')
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(group.do, 'key', fail)
+            started.wait()
+            follower = executor.submit(group.do, 'key', fail)
+            self.assertRaises(ValueError, leader.result)
+            self.assertRaises(ValueError, follower.result)
+        self.assertEqual(group.in_flight, 0)
+
+
+class TestCoalescedRequests(BaseTestCase):
+    @patch('requests.Session.request')
+    def test_identical_gets_share_request(self, request):
+        def slow_response(*args, **kwargs):
+            time.sleep(0.05)
+            return self.mock_data
+
+        request.side_effect = slow_response
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [
+                executor.submit(self.semaphore.organization.by_name, 'acme')
+                for _ in range(5)
+            ]
+            [future.result() for future in futures]
+        self.assertEqual(request.call_count, 1)
+
+    @patch('requests.Session.request')
+    def test_disabled(self, request):
+        semaphore = Semaphore('Api-Token', coalesce=False)
+        self.assertIsNone(semaphore.teams._singleflight)
+        request.return_value = self.mock_data
+        semaphore.teams.by_id('id')
+        request.assert_called_once()
+
+    def test_resources_share_group(self):
+        self.assertIs(
+            self.semaphore.teams._singleflight,
+            self.semaphore.projects._singleflight
+        )
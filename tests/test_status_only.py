@@ -0,0 +1,133 @@
+from mock import MagicMock
+
+from semaphore.client import Semaphore
+from semaphore.exceptions import StatusError
+from semaphore.mock_server import MockSemaphoreServer
+from semaphore.transport import (
+    InMemoryTransport,
+    Response,
+    Urllib3Transport,
+    release
+)
+
+from .base import BaseTestCase
+
+
+class TestRelease(BaseTestCase):
+    def streamed(self, remaining):
+        raw = MagicMock(length_remaining=remaining)
+        response = Response(200, {}, None, raw=raw)
+        response.close = MagicMock()
+        return response, raw
+
+    def test_short_body_is_drained(self):
+        response, raw = self.streamed(12)
+        release(response)
+        raw.drain_conn.assert_called_once_with()
+        raw.release_conn.assert_called_once_with()
+        response.close.assert_not_called()
+
+    def test_short_body_is_read_without_drain_conn(self):
+        response, raw = self.streamed(12)
+        del raw.drain_conn
+        release(response)
+        raw.read.assert_called_once_with()
+        raw.release_conn.assert_called_once_with()
+        response.close.assert_not_called()
+
+    def test_long_body_is_closed(self):
+        response, raw = self.streamed(10 ** 6)
+        release(response)
+        raw.drain_conn.assert_not_called()
+        raw.close.assert_called_once_with()
+        response.close.assert_called_once_with()
+
+    def test_unknown_length_is_closed(self):
+        response, raw = self.streamed(None)
+        release(response)
+        raw.drain_conn.assert_not_called()
+        response.close.assert_called_once_with()
+
+
+class TestStatusOnly(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.transport = InMemoryTransport()
+        self.semaphore = Semaphore('Api-Token', transport=self.transport)
+
+    def test_body_is_not_downloaded(self):
+        self.transport.add('DELETE', '/v2/teams/1', status=204)
+        self.assertEqual(self.semaphore.teams.delete('1'), 204)
+        method, url, kwargs = self.transport.calls[0]
+        self.assertTrue(kwargs['stream'])
+
+    def test_exists(self):
+        self.transport.add('HEAD', '/v2/teams/1', status=200)
+        self.assertTrue(self.semaphore.teams.exists('1'))
+        self.assertFalse(self.semaphore.teams.exists('2'))
+        self.assertEqual(
+            [call[0] for call in self.transport.calls],
+            ['HEAD', 'HEAD']
+        )
+
+    def test_exists_of_get_route(self):
+        self.transport.add('GET', '/v2/teams/1', json={'id': '1'})
+        self.assertTrue(self.semaphore.teams.exists('1'))
+        response = self.transport.request('HEAD', 'http://host/v2/teams/1')
+        self.assertEqual((response.status_code, response.content), (200, b''))
+
+    def test_exists_of_every_resource(self):
+        for path in ('orgs/acme', 'secrets/1', 'env_vars/1', 'config_files/1'):
+            self.transport.add('HEAD', f'/v2/{path}', status=200)
+        self.assertTrue(self.semaphore.organization.exists('acme'))
+        self.assertTrue(self.semaphore.secrets.exists('1'))
+        self.assertTrue(self.semaphore.environment.exists('1'))
+        self.assertTrue(self.semaphore.config_files.exists('1'))
+
+    def test_exists_falls_back_to_get(self):
+        self.transport.add('HEAD', '/v2/secrets/1', status=405)
+        self.transport.add('GET', '/v2/secrets/1', json={'id': '1'})
+        self.assertTrue(self.semaphore.secrets.exists('1'))
+        self.assertTrue(self.transport.calls[1][2]['stream'])
+
+    def test_exists_raises_on_errors(self):
+        self.transport.add('HEAD', '/v2/teams/1', status=401)
+        with self.assertRaises(StatusError) as context:
+            self.semaphore.teams.exists('1')
+        self.assertEqual(context.exception.status_code, 401)
+
+
+class TestStatusOnlyUrllib3(BaseTestCase):
+    """Bodies which aren't read, over real sockets"""
+    def setUp(self):
+        super().setUp()
+        self.server = MockSemaphoreServer(per_page=3000)
+        self.server.start()
+        self.org = self.server.seed(projects=3000, teams=1, users=1, secrets=1)
+        self.transport = Urllib3Transport(maxsize=1)
+        self.semaphore = Semaphore('Api-Token', base_url=self.server.url,
+                                   transport=self.transport)
+
+    def tearDown(self):
+        self.semaphore.close()
+        self.server.stop()
+
+    def pooled_sockets(self) -> list:
+        pool = self.transport.pool.connection_from_url(self.server.url).pool
+        return [connection.sock for connection in list(pool.queue)
+                if connection is not None]
+
+    def test_long_body_closes_connection(self):
+        team = self.semaphore.teams.all(self.org)[0]
+        projects = self.semaphore.projects
+        status = projects._make_request('GET', f'orgs/{self.org}/projects',
+                                        only_status=True)
+
+        self.assertEqual(status, 200)
+        self.assertEqual(self.pooled_sockets(), [None])
+        self.assertEqual(self.semaphore.teams.by_id(team['id'])['id'], team['id'])
+
+    def test_short_body_keeps_connection(self):
+        team = self.semaphore.teams.all(self.org)[0]
+        self.assertTrue(self.semaphore.teams.exists(team['id']))
+        self.assertIsNotNone(self.pooled_sockets()[0])
@@ -0,0 +1,177 @@
+import os
+import tempfile
+import unittest
+
+from semaphore.client import Semaphore
+from semaphore.crawler import Crawler
+from semaphore.models import Project
+from semaphore.store import InventoryStore, fingerprint
+
+from .test_mock_server import MockServerTestCase
+
+
+class TestInventoryStore(unittest.TestCase):
+    def setUp(self):
+        self.store = InventoryStore(':memory:')
+        self.project = {'id': 'p1', 'name': 'api'}
+        self.teams = [{'id': 't1', 'name': 'backend'}, {'id': 't2', 'name': 'ops'}]
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_get_and_put(self):
+        self.assertIsNone(self.store.get('acme', 'project_teams', 'p1', self.project))
+        self.store.put('acme', 'project_teams', 'p1', self.teams, self.project)
+        self.assertEqual(
+            self.store.get('acme', 'project_teams', 'p1', self.project), self.teams
+        )
+
+    def test_changed_parent(self):
+        self.store.put('acme', 'project_teams', 'p1', self.teams, self.project)
+        changed = dict(self.project, name='gateway')
+        self.assertIsNone(self.store.get('acme', 'project_teams', 'p1', changed))
+
+    def test_stale_result(self):
+        self.store.put('acme', 'org_teams', 'acme', self.teams)
+        self.store.max_age = 0
+        self.assertIsNone(self.store.get('acme', 'org_teams', 'acme'))
+
+    def test_put_replaces_members(self):
+        self.store.put('acme', 'org_teams', 'acme', self.teams)
+        self.store.put('acme', 'org_teams', 'acme', self.teams[:1])
+        self.assertEqual(self.store.get('acme', 'org_teams', 'acme'), self.teams[:1])
+
+    def test_unlisted_objects_are_removed(self):
+        secret = {'id': 's1', 'name': 'keys'}
+        self.store.put('acme', 'org_projects', 'acme', [self.project])
+        self.store.put('acme', 'org_secrets', 'acme', [secret])
+        self.store.put('acme', 'project_secrets', 'p1', [secret], self.project)
+        self.store.put('acme', 'secret_env_vars', 's1', [{'id': 'e1'}], secret)
+
+        # still listed by the project
+        self.store.put('acme', 'org_secrets', 'acme', [])
+        self.assertIsNotNone(self.store.get('acme', 'secret_env_vars', 's1', secret))
+
+        self.store.put('acme', 'org_projects', 'acme', [])
+        self.assertIsNone(self.store.get('acme', 'project_secrets', 'p1',
+                                         self.project))
+        self.assertIsNone(self.store.get('acme', 'secret_env_vars', 's1', secret))
+        self.assertEqual(self.store._connection.execute(
+            'SELECT COUNT(*) FROM objects'
+        ).fetchone()[0], 0)
+
+    def test_contents_are_not_stored(self):
+        env_vars = [{'id': 'e1', 'name': 'TOKEN', 'content': 'secret'}]
+        self.store.put('acme', 'secret_env_vars', 's1', env_vars, {'id': 's1'})
+        stored = self.store.get('acme', 'secret_env_vars', 's1', {'id': 's1'})
+        self.assertEqual(stored, [{'id': 'e1', 'name': 'TOKEN'}])
+
+    def test_inventory(self):
+        self.store.put('acme', 'org', 'acme', [{'id': 'o1', 'username': 'acme'}])
+        self.store.put('acme', 'org_projects', 'acme', [self.project])
+        self.store.put('acme', 'project_teams', 'p1', self.teams, self.project)
+        self.store.max_age = 0
+
+        inventory = self.store.inventory('acme')
+        self.assertEqual(inventory.get('orgs', 'acme')['id'], 'o1')
+        self.assertEqual(len(inventory.related('projects', 'p1', 'teams')), 2)
+        self.assertEqual(inventory.related('teams', 't2', 'projects'), [self.project])
+
+        projects = self.store.inventory('acme', models=True).nodes['projects']
+        self.assertIsInstance(projects['p1'], Project)
+
+    def test_orgs_and_clear(self):
+        self.store.put('acme', 'org_teams', 'acme', self.teams)
+        self.store.put('other', 'org_teams', 'other', self.teams)
+        self.assertEqual(self.store.orgs(), ['acme', 'other'])
+        self.assertIsNotNone(self.store.fetched_at('acme'))
+
+        self.store.clear('acme')
+        self.assertEqual(self.store.orgs(), ['other'])
+        self.assertIsNone(self.store.fetched_at('acme'))
+        self.store.clear()
+        self.assertEqual(self.store.orgs(), [])
+
+    def test_fingerprint(self):
+        self.assertEqual(fingerprint({'a': 1, 'b': 2}), fingerprint({'b': 2, 'a': 1}))
+        self.assertNotEqual(fingerprint({'a': 1}), fingerprint({'a': 2}))
+        self.assertEqual(fingerprint(Project(self.project)),
+                         fingerprint(Project(self.project).as_dict()))
+
+
+class TestStoredCrawl(MockServerTestCase):
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.mkdtemp()
+        self.path = os.path.join(directory, 'inventory.db')
+        self.store = InventoryStore(self.path)
+
+    def tearDown(self):
+        self.store.close()
+        os.remove(self.path)
+        os.rmdir(os.path.dirname(self.path))
+        super().tearDown()
+
+    def test_warm_crawl_makes_no_requests(self):
+        cold = Crawler(self.semaphore, store=self.store).crawl(self.org)
+        warm = Crawler(self.semaphore, store=self.store).crawl(self.org)
+
+        self.assertEqual(cold.stored, 0)
+        self.assertEqual(warm.requests, 0)
+        self.assertEqual(warm.stored, cold.requests)
+        for kind, nodes in cold.nodes.items():
+            self.assertEqual(set(warm.nodes[kind]), set(nodes))
+
+    def test_persisted_between_runs(self):
+        Crawler(self.semaphore, store=self.store).crawl(self.org)
+        self.store.close()
+
+        with InventoryStore(self.path) as store:
+            inventory = store.inventory(self.org)
+            self.assertEqual(len(inventory.nodes['projects']), 10)
+            self.assertEqual(Crawler(self.semaphore, store=store)
+                             .crawl(self.org).requests, 0)
+        self.store = InventoryStore(self.path)
+
+    def test_changed_objects_are_refreshed(self):
+        Crawler(self.semaphore, store=self.store).crawl(self.org)
+        state = self.server.state
+        secret_id = sorted(state.secrets)[0]
+        state.add_env_var(secret_id, 'NEW', 'value')
+
+        # lists of the organization are stale, the changed secret
+        # gets its contents refetched, other secrets are reused
+        self.store._connection.execute(
+            "UPDATE tasks SET fetched_at = 0 WHERE task LIKE 'org%'"
+        )
+        inventory = Crawler(self.semaphore, store=self.store).crawl(self.org)
+
+        self.assertEqual(inventory.requests, 5 + 2)
+        names = {env_var['name'] for env_var in
+                 inventory.related('secrets', secret_id, 'env_vars')}
+        self.assertIn('NEW', names)
+
+    def test_deleted_objects_are_removed(self):
+        Crawler(self.semaphore, store=self.store).crawl(self.org)
+        state = self.server.state
+        secret_id = sorted(state.secrets)[0]
+        state.delete(state.secrets, secret_id)
+
+        self.store.max_age = 0
+        live = Crawler(self.semaphore, store=self.store).crawl(self.org)
+        stored = self.store.inventory(self.org)
+
+        self.assertNotIn(secret_id, stored.nodes['secrets'])
+        self.assertEqual(stored.related('secrets', secret_id, 'env_vars'), [])
+        for kind, nodes in live.nodes.items():
+            self.assertEqual(set(stored.nodes[kind]), set(nodes))
+
+    def test_models(self):
+        semaphore = Semaphore('Api-Token', base_url=self.server.url, models=True)
+        Crawler(semaphore, store=self.store).crawl(self.org)
+        inventory = Crawler(semaphore, store=self.store).crawl(self.org)
+        semaphore.close()
+
+        self.assertEqual(inventory.requests, 0)
+        project = next(iter(inventory.nodes['projects'].values()))
+        self.assertIsInstance(project, Project)
@@ -0,0 +1,124 @@
+import json
+
+from mock import MagicMock
+
+from semaphore.client import Semaphore
+from semaphore.mock_server import MockSemaphoreServer
+from semaphore.streaming import ArrayDecoder, iter_array
+from semaphore.transport import InMemoryTransport, Response, Urllib3Transport
+
+from .base import BaseTestCase
+
+
+def chunked(document, size: int) -> list:
+    body = json.dumps(document, ensure_ascii=False, indent=1).encode()
+    return [body[start:start + size] for start in range(0, len(body), size)]
+
+
+class TestArrayDecoder(BaseTestCase):
+    def test_any_chunk_boundaries(self):
+        document = [1, 2.5, -3e-2, True, None, 'a,]"b', {'x': [1, {'y': 'é'}]},
+                    [], 123456]
+        for size in (1, 2, 3, 5, 8, 1024):
+            self.assertEqual(list(iter_array(chunked(document, size))), document)
+
+    def test_elements_are_yielded_early(self):
+        decoder = ArrayDecoder()
+        self.assertEqual(decoder.feed(b'[{"id": 1}, {"id"'), [{'id': 1}])
+        self.assertEqual(decoder.feed(b': 2}, 3'), [{'id': 2}])
+        self.assertEqual(decoder.feed(b']'), [3])
+        self.assertEqual(decoder.close(), [])
+
+    def test_buffer_holds_only_unparsed_text(self):
+        decoder = ArrayDecoder()
+        decoder.feed(b'[' + b'{"id": 1},' * 1000 + b'{"id"')
+        self.assertEqual(decoder._text, '{"id"')
+
+    def test_empty_array(self):
+        self.assertEqual(list(iter_array([b' [ ', b'] '])), [])
+
+    def test_object_body(self):
+        self.assertEqual(list(iter_array(chunked({'id': 1}, 3))), [{'id': 1}])
+
+    def test_invalid_body(self):
+        for body in (b'[1, 2', b'[1 2]', b'[{"a": }]', b''):
+            with self.assertRaises(ValueError):
+                list(iter_array([body]))
+
+
+class TestStreamedResponses(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.transport = InMemoryTransport()
+        self.transport.add(
+            'GET', '/v2/orgs/acme/projects',
+            json=[{'id': '1', 'name': 'api'}, {'id': '2', 'name': 'web'}],
+            headers={'Link': '</v2/orgs/acme/projects?page=2>; rel="next"'}
+        )
+        self.transport.add('GET', '/v2/orgs/acme/projects?page=2',
+                           json=[{'id': '3', 'name': 'cli'}])
+        self.semaphore = Semaphore('Api-Token', transport=self.transport)
+
+    def test_stream(self):
+        projects = self.semaphore.projects.list('acme', stream=True)
+        self.assertEqual([project['id'] for project in projects], ['1', '2', '3'])
+        self.assertTrue(all(call[2]['stream'] for call in self.transport.calls))
+
+    def test_stream_with_fields_and_models(self):
+        semaphore = Semaphore('Api-Token', transport=self.transport, models=True)
+        projects = list(semaphore.projects.list('acme', stream=True,
+                                                fields=('id',)))
+        self.assertEqual([project.id for project in projects], ['1', '2', '3'])
+        self.assertIsNone(projects[0].name)
+
+    def test_response_is_closed_when_iteration_stops(self):
+        response = Response(200, {}, b'[1, 2, 3]')
+        response.close = MagicMock()
+        self.semaphore._transport.request = MagicMock(return_value=response)
+        items = self.semaphore.projects.list('acme', stream=True)
+        self.assertEqual(next(items), 1)
+        items.close()
+        response.close.assert_called_once_with()
+
+    def test_raw_response_is_read_in_chunks(self):
+        raw = MagicMock()
+        raw.stream.return_value = iter([b'[1,', b'2]'])
+        response = Response(200, {}, None, raw=raw)
+        self.assertEqual(list(response.iter_content(2)), [b'[1,', b'2]'])
+        raw.stream.assert_called_once_with(2, decode_content=True)
+        response.close()
+        raw.release_conn.assert_called_once_with()
+
+
+class TestStreamedUrllib3Responses(BaseTestCase):
+    """Streams over real sockets, with a single pooled connection"""
+    def setUp(self):
+        super().setUp()
+        self.server = MockSemaphoreServer(per_page=3000)
+        self.server.start()
+        self.org = self.server.seed(projects=3000, teams=1, users=1, secrets=1)
+        self.transport = Urllib3Transport(maxsize=1)
+        self.semaphore = Semaphore('Api-Token', base_url=self.server.url,
+                                   transport=self.transport)
+
+    def tearDown(self):
+        self.semaphore.close()
+        self.server.stop()
+
+    def pooled_sockets(self) -> list:
+        pool = self.transport.pool.connection_from_url(self.server.url).pool
+        return [connection.sock for connection in list(pool.queue)
+                if connection is not None]
+
+    def test_stopped_stream_closes_connection(self):
+        team = self.semaphore.teams.all(self.org)[0]
+        for _ in self.semaphore.projects.list(self.org, stream=True):
+            break
+
+        self.assertEqual(self.pooled_sockets(), [None])
+        self.assertEqual(self.semaphore.teams.by_id(team['id'])['id'], team['id'])
+
+    def test_finished_stream_keeps_connection(self):
+        projects = list(self.semaphore.projects.list(self.org, stream=True))
+        self.assertEqual(len(projects), 3000)
+        self.assertIsNotNone(self.pooled_sockets()[0])
@@ -0,0 +1,358 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+from collections import Counter
+
+from mock import patch
+
+from semaphore.client import Semaphore
+from semaphore.exceptions import SyncError
+from semaphore.sync import (
+    MANIFEST,
+    Manifest,
+    hash_file,
+    local_files,
+    plan_config_files,
+    plan_env_vars
+)
+
+from .test_mock_server import MockServerTestCase
+
+
+def _env_var(env_var_id: str, name: str, content: str=None, encrypted: bool=False):
+    return {'id': env_var_id, 'name': name, 'content': content,
+            'encrypted': encrypted}
+
+
+class TestPlanEnvVars(unittest.TestCase):
+    def setUp(self):
+        self.current = [
+            _env_var('1', 'TOKEN', 'abc'),
+            _env_var('2', 'DEBUG', '0'),
+            _env_var('3', 'OLD', 'x'),
+            _env_var('4', 'KEY', encrypted=True)
+        ]
+
+    def actions(self, items):
+        return {item.name: item.action for item in items}
+
+    def test_minimal_diff(self):
+        items = plan_env_vars(self.current, {'TOKEN': 'abc', 'DEBUG': 1, 'NEW': 'y'},
+                              update_encrypted=False)
+        self.assertEqual(self.actions(items), {
+            'TOKEN': 'unchanged',
+            'DEBUG': 'update',
+            'NEW': 'create',
+            'OLD': 'delete',
+            'KEY': 'delete'
+        })
+        update = next(item for item in items if item.name == 'DEBUG')
+        self.assertEqual((update.id, update.content), ('2', '1'))
+
+    def test_keep_undesired(self):
+        items = plan_env_vars(self.current, {'TOKEN': 'abc'}, delete=False)
+        self.assertEqual(self.actions(items), {'TOKEN': 'unchanged'})
+
+    def test_encrypted(self):
+        self.assertEqual(
+            self.actions(plan_env_vars(self.current, {'KEY': 'v'}, delete=False)),
+            {'KEY': 'update'}
+        )
+        self.assertEqual(
+            self.actions(plan_env_vars(self.current, {'KEY': 'v'}, delete=False,
+                                       update_encrypted=False)),
+            {'KEY': 'unchanged'}
+        )
+
+    def test_encrypted_pushed(self):
+        pushed = {'4': {'name': 'KEY', 'sha256': hashlib.sha256(b'v').hexdigest()}}
+        self.assertEqual(
+            self.actions(plan_env_vars(self.current, {'KEY': 'v'}, delete=False,
+                                       pushed=pushed)),
+            {'KEY': 'unchanged'}
+        )
+        self.assertEqual(
+            self.actions(plan_env_vars(self.current, {'KEY': 'w'}, delete=False,
+                                       update_encrypted=False, pushed=pushed)),
+            {'KEY': 'update'}
+        )
+
+    def test_duplicates(self):
+        current = [_env_var('1', 'TOKEN', 'abc'), _env_var('2', 'TOKEN', 'abc')]
+        items = plan_env_vars(current, {'TOKEN': 'abc'})
+        self.assertEqual([(item.action, item.id) for item in items],
+                         [('delete', '2'), ('unchanged', '1')])
+
+
+class SyncTestCase(MockServerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.requests = Counter()
+        self.semaphore.hooks.on(
+            'after_response', lambda event: self.requests.update([event.method])
+        )
+        self.secret_id = sorted(self.server.state.secrets)[0]
+        # the default manifest of environment variables is in the home directory
+        self.home = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.home)
+        home = patch.dict(os.environ, {'HOME': self.home})
+        home.start()
+        self.addCleanup(home.stop)
+
+
+class TestSyncEnvVars(SyncTestCase):
+
+    def env_vars(self) -> dict:
+        return {env_var['name']: env_var['content'] for env_var in
+                self.semaphore.environment.secrets(self.secret_id)}
+
+    def test_sync(self):
+        desired = {'VAR_0': 'value-0', 'VAR_1': 'changed', 'NEW': 'created'}
+        report = self.semaphore.sync_env_vars(self.secret_id, desired,
+                                              encrypted=False)
+
+        self.assertTrue(report.ok)
+        self.assertEqual(report.counts(), {'create': 1, 'update': 1, 'delete': 0,
+                                           'unchanged': 1})
+        self.assertEqual(self.requests, {'GET': 1, 'POST': 1, 'PATCH': 1})
+        self.assertEqual(self.env_vars(), desired)
+        created = next(item for item in report if item.name == 'NEW')
+        self.assertIsNotNone(created.id)
+
+    def test_delete(self):
+        report = self.semaphore.sync_env_vars(self.secret_id, {'VAR_0': 'value-0'})
+
+        self.assertEqual([item.name for item in report.changed], ['VAR_1'])
+        self.assertEqual(self.env_vars(), {'VAR_0': 'value-0'})
+
+    def test_no_changes_is_one_request(self):
+        desired = self.env_vars()
+        self.requests.clear()
+
+        report = self.semaphore.sync_env_vars(self.secret_id, desired)
+
+        self.assertEqual(report.changed, [])
+        self.assertEqual(self.requests, {'GET': 1})
+
+    def test_encrypted_vars_are_pushed_once(self):
+        desired = {'TOKEN': 'abc', 'KEY': 'x'}
+        self.server.state.add_env_var(self.secret_id, 'KEY', 'old', encrypted=True)
+        self.semaphore.sync_env_vars(self.secret_id, desired)
+        self.requests.clear()
+
+        report = self.semaphore.sync_env_vars(self.secret_id, desired)
+        self.assertEqual(report.changed, [])
+        self.assertEqual(self.requests, {'GET': 1})
+
+        report = self.semaphore.sync_env_vars(self.secret_id,
+                                              dict(desired, KEY='y'))
+        self.assertEqual([(item.name, item.action) for item in report.changed],
+                         [('KEY', 'update')])
+        self.assertEqual(self.requests, {'GET': 2, 'PATCH': 1})
+
+    def test_default_manifest_is_kept_between_clients(self):
+        desired = {'KEY': 'x'}
+        self.semaphore.sync_env_vars(self.secret_id, desired)
+        self.assertTrue(os.path.exists(
+            os.path.join(self.home, '.semaphore', 'env-vars.json')
+        ))
+
+        semaphore = Semaphore('Api-Token', base_url=self.server.url)
+        self.addCleanup(semaphore.close)
+        requests = Counter()
+        semaphore.hooks.on('after_response',
+                           lambda event: requests.update([event.method]))
+        report = semaphore.sync_env_vars(self.secret_id, desired)
+
+        self.assertEqual(report.changed, [])
+        self.assertEqual(requests, {'GET': 1})
+
+    def test_manifest_file(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        manifest = os.path.join(directory, 'env_vars.json')
+        self.semaphore.sync_env_vars(self.secret_id, {'KEY': 'x'},
+                                     manifest=manifest)
+        self.assertEqual(
+            list(Manifest(manifest, field='name').files(self.secret_id).values()),
+            [{'name': 'KEY', 'sha256': hashlib.sha256(b'x').hexdigest()}]
+        )
+        self.requests.clear()
+
+        report = self.semaphore.sync_env_vars(self.secret_id, {'KEY': 'x'},
+                                              manifest=manifest)
+        self.assertEqual(report.changed, [])
+        self.assertEqual(self.requests, {'GET': 1})
+
+    def test_failed_changes_are_reported(self):
+        environment = self.semaphore.environment
+        error = ConnectionError('Connection reset')
+
+        def delete(env_var):
+            raise error
+
+        environment.update = lambda *args: {'message': 'Not Found'}
+        environment.delete = delete
+        report = self.semaphore.sync_env_vars(self.secret_id, {'VAR_0': 'new'})
+
+        self.assertFalse(report.ok)
+        failed = {item.action: item.error for item in report.failed}
+        self.assertIsInstance(failed['update'], SyncError)
+        self.assertIn('Not Found', str(failed['update']))
+        self.assertIs(failed['delete'], error)
+
+    def test_missing_secret(self):
+        with self.assertRaises(SyncError):
+            self.semaphore.sync_env_vars('missing', {'TOKEN': 'abc'})
+
+
+class TestPlanConfigFiles(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.directory, 'nginx'))
+        for name, content in (('app.yml', 'a'), ('nginx/site.conf', 'b')):
+            with open(os.path.join(self.directory, name), 'w') as file:
+                file.write(content)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_hash_file(self):
+        path = os.path.join(self.directory, 'app.yml')
+        self.assertEqual(hash_file(path, chunk_size=1),
+                         hashlib.sha256(b'a').hexdigest())
+
+    def test_local_files(self):
+        manifest = os.path.join(self.directory, MANIFEST)
+        open(manifest, 'w').close()
+        files = local_files(self.directory, '/home/runner', exclude=(manifest,))
+        self.assertEqual(sorted(files), ['/home/runner/app.yml',
+                                         '/home/runner/nginx/site.conf'])
+
+    def test_plan(self):
+        local = local_files(self.directory, '/etc')
+        hashes = {path: hash_file(source) for path, source in local.items()}
+        uploaded = {
+            '1': {'path': '/etc/app.yml', 'sha256': hashes['/etc/app.yml']},
+            '2': {'path': '/etc/old.conf', 'sha256': 'x'}
+        }
+        items = plan_config_files(local, hashes, uploaded, delete=True)
+        self.assertEqual([(item.name, item.action, item.id) for item in items], [
+            ('/etc/app.yml', 'unchanged', '1'),
+            ('/etc/nginx/site.conf', 'create', None),
+            ('/etc/old.conf', 'delete', '2')
+        ])
+
+    def test_manifest(self):
+        path = os.path.join(self.directory, MANIFEST)
+        manifest = Manifest(path)
+        self.assertNotIn('s1', manifest)
+        manifest.set('s1', 'c1', '/etc/app.yml', 'abc')
+        manifest.save()
+
+        manifest = Manifest(path)
+        self.assertEqual(manifest.files('s1'),
+                         {'c1': {'path': '/etc/app.yml', 'sha256': 'abc'}})
+        manifest.remove('s1', 'c1')
+        self.assertEqual(manifest.files('s1'), {})
+        manifest.forget('s1')
+        self.assertNotIn('s1', manifest)
+
+
+class TestSyncConfigFiles(SyncTestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.write('file-0', 'content-0')
+        self.write('app/settings.yml', 'debug: false')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+        super().tearDown()
+
+    def write(self, name: str, content: str):
+        path = os.path.join(self.directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as file:
+            file.write(content)
+
+    def sync(self, **kwargs):
+        return self.semaphore.sync_config_files(
+            self.secret_id, self.directory, '/home/runner', **kwargs
+        )
+
+    def remote_files(self) -> dict:
+        return {config_file['path']: config_file['content'] for config_file in
+                self.semaphore.config_files.secrets(self.secret_id)}
+
+    def test_first_sync_adopts_existing_files(self):
+        report = self.sync(encrypted=False)
+
+        self.assertTrue(report.ok)
+        self.assertEqual(report.counts(), {'create': 1, 'update': 0, 'delete': 0,
+                                           'unchanged': 1})
+        self.assertEqual(self.requests, {'GET': 1, 'POST': 1})
+        self.assertEqual(self.remote_files()['/home/runner/app/settings.yml'],
+                         'debug: false')
+        self.assertTrue(os.path.exists(os.path.join(self.directory, MANIFEST)))
+
+    def test_unchanged_directory_makes_no_request(self):
+        self.sync()
+        self.requests.clear()
+
+        report = self.sync()
+
+        self.assertEqual(report.changed, [])
+        self.assertEqual(self.requests, {})
+
+    def test_only_changed_files_are_uploaded(self):
+        self.sync(encrypted=False)
+        self.write('app/settings.yml', 'debug: true')
+        self.write('app/new.yml', 'new')
+        self.requests.clear()
+
+        report = self.sync(encrypted=False)
+
+        self.assertEqual({item.name: item.action for item in report.changed}, {
+            '/home/runner/app/settings.yml': 'update',
+            '/home/runner/app/new.yml': 'create'
+        })
+        self.assertEqual(self.requests, {'POST': 1, 'PATCH': 1})
+        remote = self.remote_files()
+        self.assertEqual(remote['/home/runner/app/settings.yml'], 'debug: true')
+        self.assertEqual(remote['/home/runner/app/new.yml'], 'new')
+
+    def test_delete(self):
+        self.sync()
+        os.remove(os.path.join(self.directory, 'file-0'))
+
+        report = self.sync(delete=True)
+
+        self.assertEqual([(item.name, item.action) for item in report.changed],
+                         [('/home/runner/file-0', 'delete')])
+        self.assertNotIn('/home/runner/file-0', self.remote_files())
+
+    def test_stale_manifest_is_refreshed(self):
+        self.sync(encrypted=False)
+        self.write('file-0', 'changed')
+        self.server.state.config_files.clear()
+
+        report = self.sync(encrypted=False)
+        self.assertEqual(len(report.failed), 1)
+
+        report = self.sync(encrypted=False)
+        self.assertTrue(report.ok)
+        self.assertEqual(self.remote_files(), {
+            '/home/runner/file-0': 'changed',
+            '/home/runner/app/settings.yml': 'debug: false'
+        })
+
+    def test_separate_manifest(self):
+        manifest = os.path.join(self.directory, 'app', 'uploaded.json')
+        self.sync(manifest=manifest)
+        self.assertTrue(os.path.exists(manifest))
+        names = {item.name for item in self.sync(manifest=manifest)}
+        self.assertIn('/home/runner/app/settings.yml', names)
+        self.assertNotIn('/home/runner/app/uploaded.json', names)
@@ -0,0 +1,94 @@
+import io
+import json
+
+from semaphore.client import Semaphore
+from semaphore.tracing import Tracer, current_span
+from semaphore.transport import InMemoryTransport
+
+from .base import BaseTestCase
+
+
+class TestTracer(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.tracer = Tracer()
+        self.transport = InMemoryTransport()
+        self.transport.add('GET', '/v2/teams/1', json={'id': '1'})
+        self.transport.add('GET', '/v2/teams/2', json={'id': '2'})
+        self.semaphore = Semaphore('Api-Token', transport=self.transport,
+                                   tracer=self.tracer)
+
+    def spans_by_name(self):
+        return {span.name: span for span in self.tracer.spans}
+
+    def test_nested_spans(self):
+        with self.tracer.span('sync', org='acme') as outer:
+            self.assertIs(current_span(), outer)
+            with self.tracer.span('phase') as inner:
+                self.assertIs(current_span(), inner)
+        self.assertIsNone(current_span())
+
+        self.assertEqual(inner.parent_id, outer.span_id)
+        self.assertEqual(inner.trace_id, outer.trace_id)
+        self.assertIsNone(outer.parent_id)
+        self.assertEqual(outer.attributes, {'org': 'acme'})
+        self.assertGreaterEqual(outer.duration, inner.duration)
+
+    def test_error_is_recorded(self):
+        with self.assertRaises(KeyError):
+            with self.tracer.span('failing'):
+                raise KeyError('id')
+        self.assertEqual(self.tracer.spans[0].error, "KeyError('id')")
+
+    def test_request_is_child_span(self):
+        with self.tracer.span('sync') as parent:
+            self.semaphore.teams.by_id('1')
+
+        request = self.spans_by_name()['GET teams/{team_id}']
+        self.assertEqual(request.parent_id, parent.span_id)
+        self.assertEqual(request.attributes['http.status_code'], 200)
+        self.assertEqual(request.attributes['retries'], 0)
+        self.assertTrue(request.attributes['http.url'].endswith('/teams/1'))
+
+    def test_batch_keeps_parent(self):
+        with self.tracer.span('batch') as parent:
+            self.semaphore.map(self.semaphore.teams.by_id, ['1', '2'])
+
+        requests = [span for span in self.tracer.spans if span is not parent]
+        self.assertEqual(len(requests), 2)
+        for span in requests:
+            self.assertEqual(span.parent_id, parent.span_id)
+
+    def test_request_without_parent(self):
+        self.semaphore.teams.by_id('1')
+        span = self.tracer.spans[0]
+        self.assertIsNone(span.parent_id)
+
+    def test_export_json_lines(self):
+        with self.tracer.span('sync'):
+            self.semaphore.teams.by_id('1')
+        output = io.StringIO()
+        self.tracer.export_json_lines(output)
+
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([line['name'] for line in lines],
+                         ['GET teams/{team_id}', 'sync'])
+
+    def test_chrome_trace(self):
+        with self.tracer.span('sync'):
+            self.semaphore.teams.by_id('1')
+        events = self.tracer.chrome_trace()['traceEvents']
+
+        self.assertEqual([event['ph'] for event in events], ['X', 'X'])
+        self.assertEqual(events[0]['cat'], 'http')
+        self.assertEqual(events[1]['cat'], 'user')
+        self.assertLessEqual(events[1]['ts'], events[0]['ts'])
+
+    def test_max_spans(self):
+        tracer = Tracer(max_spans=2)
+        for name in ('a', 'b', 'c'):
+            with tracer.span(name):
+                pass
+        self.assertEqual([span.name for span in tracer.spans], ['b', 'c'])
+        tracer.clear()
+        self.assertEqual(tracer.spans, [])
@@ -0,0 +1,139 @@
+import json
+
+from mock import MagicMock, patch
+from requests.exceptions import ConnectTimeout
+from urllib3.exceptions import ReadTimeoutError
+
+from semaphore.cache import ResponseCache
+from semaphore.client import Semaphore
+from semaphore.transport import (
+    Headers,
+    InMemoryTransport,
+    RequestsTransport,
+    Response,
+    Urllib3Transport,
+    parse_links
+)
+
+from .base import BaseTestCase
+
+
+class TestResponse(BaseTestCase):
+    def test_headers_are_case_insensitive(self):
+        headers = Headers({'ETag': '"v1"'})
+        self.assertEqual(headers.get('etag'), '"v1"')
+        self.assertEqual(headers['ETAG'], '"v1"')
+        self.assertIn('Etag', headers)
+
+    def test_parse_links(self):
+        links = parse_links(
+            '<https://api/v2/orgs?page=2>; rel="next", '
+            '<https://api/v2/orgs?page=9>; rel="last"'
+        )
+        self.assertEqual(links['next']['url'], 'https://api/v2/orgs?page=2')
+        self.assertEqual(links['last']['url'], 'https://api/v2/orgs?page=9')
+        self.assertEqual(parse_links(None), {})
+
+    def test_json(self):
+        response = Response(200, {'Link': '<http://next>; rel="next"'}, b'[1]')
+        self.assertEqual(response.json(), [1])
+        self.assertEqual(response.links['next']['url'], 'http://next')
+
+
+class TestInMemoryTransport(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.transport = InMemoryTransport()
+        self.semaphore = Semaphore('Api-Token', transport=self.transport)
+
+    def test_serves_canned_response(self):
+        self.transport.add('GET', '/v2/teams/id', json={'id': 'id'})
+        self.assertEqual(self.semaphore.teams.by_id('id'), {'id': 'id'})
+        method, url, _ = self.transport.calls[0]
+        self.assertEqual(method, 'GET')
+        self.assertEqual(url, 'https://api.semaphoreci.com/v2//teams/id')
+
+    def test_unknown_route(self):
+        self.assertEqual(
+            self.semaphore.teams.by_id('id'),
+            {'message': 'Not Found'}
+        )
+        self.assertEqual(self.semaphore.teams.delete('id'), 404)
+
+    def test_responses_are_served_in_order(self):
+        self.transport.add('GET', '/v2/teams/id', status=429,
+                           headers={'Retry-After': '0'})
+        self.transport.add('GET', '/v2/teams/id', json={'id': 'id'})
+        self.assertEqual(self.semaphore.teams.by_id('id'), {'id': 'id'})
+        self.assertEqual(self.semaphore.teams.by_id('id'), {'id': 'id'})
+        self.assertEqual(len(self.transport.calls), 3)
+
+    def test_pagination(self):
+        self.transport.add(
+            'GET', '/v2/orgs/acme/projects', json=[1, 2],
+            headers={'Link': '</v2/orgs/acme/projects?page=2>; rel="next"'}
+        )
+        self.transport.add('GET', '/v2/orgs/acme/projects?page=2', json=[3])
+        projects = self.semaphore.projects.list('acme', iterate=True)
+        self.assertEqual(list(projects), [1, 2, 3])
+
+    def test_conditional_cache(self):
+        semaphore = Semaphore(
+            'Api-Token',
+            transport=self.transport,
+            cache=ResponseCache()
+        )
+        self.transport.add('GET', '/v2/teams/id', json={'id': 'id'},
+                           headers={'ETag': '"v1"'})
+        self.transport.add('GET', '/v2/teams/id', status=304)
+        semaphore.teams.by_id('id')
+        self.assertEqual(semaphore.teams.by_id('id'), {'id': 'id'})
+
+
+class TestRequestsTransport(BaseTestCase):
+    def test_is_timeout(self):
+        transport = RequestsTransport()
+        self.assertTrue(transport.is_timeout(ConnectTimeout()))
+        self.assertFalse(transport.is_timeout(ValueError()))
+
+    @patch('requests.Session.request')
+    def test_request(self, request):
+        RequestsTransport().request('GET', 'http://url', headers={}, timeout=1)
+        request.assert_called_once_with('GET', 'http://url', headers={}, timeout=1)
+
+
+class TestUrllib3Transport(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.transport = Urllib3Transport()
+        self.transport.pool = MagicMock()
+        self.transport.pool.request.return_value = MagicMock(
+            status=201,
+            headers={'Content-Type': 'application/json'},
+            data=b'{"id": "id"}'
+        )
+
+    def test_json_body(self):
+        response = self.transport.request(
+            'POST',
+            'http://url',
+            headers={'Authorization': 'Token x'},
+            json={'name': 'team'}
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {'id': 'id'})
+        _, kwargs = self.transport.pool.request.call_args
+        self.assertEqual(json.loads(kwargs['body']), {'name': 'team'})
+        self.assertEqual(kwargs['headers']['Content-Type'], 'application/json')
+        self.assertEqual(kwargs['headers']['Authorization'], 'Token x')
+
+    def test_params(self):
+        self.transport.request('GET', 'http://url', params={'page': 2})
+        args, _ = self.transport.pool.request.call_args
+        self.assertEqual(args, ('GET', 'http://url?page=2'))
+
+    def test_is_timeout(self):
+        self.assertTrue(
+            self.transport.is_timeout(ReadTimeoutError(None, 'url', 'timeout'))
+        )
+        self.assertTrue(self.transport.is_timeout(TimeoutError()))
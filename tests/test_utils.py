@@ -0,0 +1,46 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from semaphore.utils import ThreadContextVar, thread_copy_context
+
+from .base import BaseTestCase
+
+
+class TestThreadContext(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.variable = ThreadContextVar('test', default='default')
+
+    def test_set_and_reset(self):
+        token = self.variable.set('outer')
+        inner = self.variable.set('inner')
+        self.assertEqual(self.variable.get(), 'inner')
+        self.variable.reset(inner)
+        self.assertEqual(self.variable.get(), 'outer')
+        self.variable.reset(token)
+        self.assertEqual(self.variable.get(), 'default')
+
+    def test_values_are_per_thread(self):
+        self.variable.set('main')
+        values = []
+        thread = threading.Thread(target=lambda: values.append(self.variable.get()))
+        thread.start()
+        thread.join()
+        self.assertEqual(values, ['default'])
+
+    def test_run_passes_values_to_other_threads(self):
+        token = self.variable.set('main')
+        context = thread_copy_context()
+        self.variable.reset(token)
+
+        def change():
+            value = self.variable.get()
+            self.variable.set('changed')
+            return value
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            self.assertEqual(executor.submit(context.copy().run, change).result(),
+                             'main')
+            self.assertEqual(executor.submit(self.variable.get).result(), 'default')
+        self.assertEqual(context.run(self.variable.get), 'main')
+        self.assertEqual(self.variable.get(), 'default')